@@ -1,62 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import StreamingResponse
-from typing import List
-from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response
+from typing import List, Optional
+from datetime import date, datetime
+import asyncio
+import hashlib
 import io
+import threading
 import qrcode
-from supabase import Client
-from app.core.database import get_supabase
+from PIL import Image
+from pydantic import TypeAdapter
+from app.core.cache import TTLCache
+from app.core.responses import PydanticJSONResponse
 from app.schemas import (
     ClassCreate, ClassUpdate, ClassResponse,
-    TeachingSessionCreate, TeachingSessionUpdate, TeachingSessionResponse,
+    TeachingSessionCreate, TeachingSessionUpdate, TeachingSessionResponse, CreatedSession,
     AttendanceCreate, AttendanceUpdate, AttendanceResponse, AttendanceDetailResponse,
-    ClassStudentCreate, ClassStudentResponse, ClassStudentDetailResponse,
+    ClassStudentCreate, ClassStudentBulkCreate, ClassStudentResponse, ClassStudentDetailResponse,
     StudentClassDetailResponse, MultipleSessionsAttendanceRequest,
-    BaseResponse, PaginatedResponse
+    BaseResponse, CursorPaginatedResponse
 )
 from app.services import (
     ClassService, TeachingSessionService, AttendanceService,
     ClassStudentService
 )
+from app.services.dependencies import (
+    get_class_service, get_teaching_session_service, get_attendance_service,
+    get_class_student_service
+)
 
 router = APIRouter(prefix="/classes", tags=["Classes"])
 
+# List validators built once at import instead of validating item by item per request
+_sessions_adapter = TypeAdapter(List[TeachingSessionResponse])
+_attendance_details_adapter = TypeAdapter(List[AttendanceDetailResponse])
+_class_students_adapter = TypeAdapter(List[ClassStudentDetailResponse])
+_student_classes_adapter = TypeAdapter(List[StudentClassDetailResponse])
+
+# Rendered QR code PNGs keyed by (session, payload, size), each kept until its QR code expires
+_qr_png_cache = TTLCache(maxsize=256, ttl=30 * 60)
+
+# One reusable QRCode per render thread; QRCode is not safe to share between threads
+_qr_local = threading.local()
+
 
 # Class endpoints
 @router.post("", response_model=BaseResponse)
 async def create_class(
     class_data: ClassCreate,
-    supabase: Client = Depends(get_supabase)
+    class_service: ClassService = Depends(get_class_service)
 ):
     """Create a new class."""
-    try:
-        class_service = ClassService(supabase)
-        class_obj = await class_service.create(class_data.model_dump())
-        
-        if not class_obj:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create class"
-            )
-        
-        return BaseResponse(
-            message="Class created successfully",
-            data={
-                "id": class_obj.id,
-                "name": class_obj.name,
-                "code": class_obj.code
-            }
+    class_obj = await class_service.create(class_data.model_dump())
+    
+    if not class_obj:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create class"
         )
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        print(f"Create class error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    return BaseResponse(
+        message="Class created successfully",
+        data={
+            "id": class_obj.id,
+            "name": class_obj.name,
+            "code": class_obj.code
+        }
+    )
 
 
-@router.get("", response_model=PaginatedResponse)
+@router.get("", response_model=CursorPaginatedResponse[dict])
 async def get_classes(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     # Existing filters
     teacher_id: int = Query(None),
@@ -70,102 +84,77 @@ async def get_classes(
     academic_year_id: int = Query(None),
     study_phase_id: int = Query(None),
     active_only: bool = Query(True),
-    supabase: Client = Depends(get_supabase)
+    class_service: ClassService = Depends(get_class_service)
 ):
-    """Get all classes with pagination, joined data, student count, and comprehensive filtering."""
-    try:
-        class_service = ClassService(supabase)
-        
-        # Build filters dictionary with all possible filters
-        filters = {}
-        if teacher_id:
-            filters["teacher_id"] = teacher_id
-        if subject_id:
-            filters["subject_id"] = subject_id
-        if semester_id:
-            filters["semester_id"] = semester_id
-        if faculty_id:
-            filters["faculty_id"] = faculty_id
-        if department_id:
-            filters["department_id"] = department_id
-        if major_id:
-            filters["major_id"] = major_id
-        if cohort_id:
-            filters["cohort_id"] = cohort_id
-        if academic_year_id:
-            filters["academic_year_id"] = academic_year_id
-        if study_phase_id:
-            filters["study_phase_id"] = study_phase_id
-        
-        # Use the enhanced method with joins and student count
-        result = await class_service.get_classes_with_details(page, limit, filters)
-        
-        return PaginatedResponse(
-            items=result["items"],
-            total=result["total"],
-            page=result["page"],
-            limit=result["limit"],
-            total_pages=result["total_pages"]
-        )
-    except Exception as e:
-        print(f"Get classes error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    """Get classes with cursor pagination, joined data, student count, and comprehensive filtering."""
+    # Build filters dictionary with all possible filters
+    filters = {}
+    if teacher_id:
+        filters["teacher_id"] = teacher_id
+    if subject_id:
+        filters["subject_id"] = subject_id
+    if semester_id:
+        filters["semester_id"] = semester_id
+    if faculty_id:
+        filters["faculty_id"] = faculty_id
+    if department_id:
+        filters["department_id"] = department_id
+    if major_id:
+        filters["major_id"] = major_id
+    if cohort_id:
+        filters["cohort_id"] = cohort_id
+    if academic_year_id:
+        filters["academic_year_id"] = academic_year_id
+    if study_phase_id:
+        filters["study_phase_id"] = study_phase_id
+    
+    # Use the enhanced method with joins and student count
+    result = await class_service.get_classes_with_details(cursor, limit, filters)
+    
+    return CursorPaginatedResponse(
+        items=result["items"],
+        limit=result["limit"],
+        next_cursor=result["next_cursor"]
+    )
 
 
 @router.get("/{class_id}", response_model=ClassResponse)
 async def get_class(
     class_id: int,
-    supabase: Client = Depends(get_supabase)
+    class_service: ClassService = Depends(get_class_service)
 ):
     """Get class by ID."""
-    try:
-        class_service = ClassService(supabase)
-        class_obj = await class_service.get_by_id(class_id)
-        
-        if not class_obj:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Class not found")
-        
-        return ClassResponse(**class_obj.model_dump())
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Get class error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    class_obj = await class_service.get_by_id(class_id)
+    
+    if not class_obj:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Class not found")
+    
+    return ClassResponse(**class_obj.model_dump())
 
 
 @router.put("/{class_id}", response_model=BaseResponse)
 async def update_class(
     class_id: int,
     class_data: ClassUpdate,
-    supabase: Client = Depends(get_supabase)
+    class_service: ClassService = Depends(get_class_service)
 ):
     """Update a class."""
-    try:
-        class_service = ClassService(supabase)
-        
-        # Convert to dict and exclude None values
-        update_data = {k: v for k, v in class_data.model_dump().items() if v is not None}
-        
-        if not update_data:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No data provided for update")
-        
-        updated_class = await class_service.update(class_id, update_data)
-        
-        if not updated_class:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Class not found")
-        
-        return BaseResponse(
-            success=True,
-            message="Class updated successfully",
-            data=ClassResponse(**updated_class.model_dump()).model_dump()
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Update class error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    # Convert to dict and exclude None values
+    update_data = {k: v for k, v in class_data.model_dump().items() if v is not None}
+    
+    if not update_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No data provided for update")
+    
+    updated_class = await class_service.update(class_id, update_data)
+    
+    if not updated_class:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Class not found")
+    
+    return BaseResponse(
+        success=True,
+        message="Class updated successfully",
+        data=ClassResponse(**updated_class.model_dump()).model_dump()
+    )
 
 
 # Teaching Session endpoints
@@ -173,245 +162,216 @@ async def update_class(
 async def create_teaching_session(
     class_id: int,
     session_data: TeachingSessionCreate,
-    supabase: Client = Depends(get_supabase)
+    session_service: TeachingSessionService = Depends(get_teaching_session_service)
 ):
     """Create a new teaching session for a class."""
-    try:
-        session_service = TeachingSessionService(supabase)
-        
-        # Ensure class_id matches
-        session_dict = session_data.model_dump()
-        session_dict["class_id"] = class_id
-        
-        session = await session_service.create(session_dict)
-        
-        if not session:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create teaching session"
-            )
-        
-        return BaseResponse(
-            message="Teaching session created successfully",
-            data={
-                "id": session.id,
-                "session_date": session.session_date.isoformat(),
-                "start_time": session.start_time.isoformat(),
-                "end_time": session.end_time.isoformat()
-            }
+    # Ensure class_id matches
+    session_dict = session_data.model_dump()
+    session_dict["class_id"] = class_id
+    
+    session = await session_service.create(session_dict)
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create teaching session"
         )
-    except Exception as e:
-        print(f"Create teaching session error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    return BaseResponse(
+        message="Teaching session created successfully",
+        data=CreatedSession(session.id, session.session_date, session.start_time, session.end_time)
+    )
 
 
 @router.get("/{class_id}/sessions", response_model=List[TeachingSessionResponse])
 async def get_class_sessions(
     class_id: int,
-    supabase: Client = Depends(get_supabase)
+    session_service: TeachingSessionService = Depends(get_teaching_session_service)
 ):
     """Get all teaching sessions for a class."""
-    try:
-        session_service = TeachingSessionService(supabase)
-        sessions = await session_service.get_by_class(class_id)
-        
-        return [TeachingSessionResponse(**session.model_dump()) for session in sessions]
-    except Exception as e:
-        print(f"Get class sessions error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    sessions = await session_service.get_by_class(class_id)
+    
+    # Validate the whole list once and serialize it directly, skipping the response_model pass
+    return PydanticJSONResponse(_sessions_adapter.validate_python(sessions, from_attributes=True))
 
 
 @router.get("/sessions/{session_id}", response_model=TeachingSessionResponse)
 async def get_session(
     session_id: int,
-    supabase: Client = Depends(get_supabase)
+    session_service: TeachingSessionService = Depends(get_teaching_session_service)
 ):
     """Get a teaching session by ID."""
-    try:
-        session_service = TeachingSessionService(supabase)
-        session = await session_service.get_by_id(session_id)
-        
-        if not session:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Teaching session not found"
-            )
-        
-        return TeachingSessionResponse(**session.model_dump())
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Get session error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    session = await session_service.get_by_id(session_id)
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teaching session not found"
+        )
+    
+    return TeachingSessionResponse(**session.model_dump())
 
 
 @router.put("/sessions/{session_id}", response_model=BaseResponse)
 async def update_session(
     session_id: int,
     session_data: TeachingSessionUpdate,
-    supabase: Client = Depends(get_supabase)
+    session_service: TeachingSessionService = Depends(get_teaching_session_service)
 ):
     """Update a teaching session by ID."""
-    try:
-        session_service = TeachingSessionService(supabase)
-        
-        # Check if session exists
-        existing_session = await session_service.get_by_id(session_id)
-        if not existing_session:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Teaching session not found"
-            )
-        
-        # Update session
-        updated_session = await session_service.update(session_id, session_data.model_dump())
-        
-        if not updated_session:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to update teaching session"
-            )
-        
-        return BaseResponse(
-            message="Teaching session updated successfully",
-            data={
-                "id": updated_session.id,
-                "session_date": updated_session.session_date.isoformat(),
-                "start_time": updated_session.start_time.isoformat(),
-                "end_time": updated_session.end_time.isoformat()
-            }
+    # Check if session exists
+    existing_session = await session_service.get_by_id(session_id)
+    if not existing_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teaching session not found"
+        )
+    
+    # Update session
+    updated_session = await session_service.update(session_id, session_data.model_dump())
+    
+    if not updated_session:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update teaching session"
         )
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Update session error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    return BaseResponse(
+        message="Teaching session updated successfully",
+        data={
+            "id": updated_session.id,
+            "session_date": updated_session.session_date.isoformat(),
+            "start_time": updated_session.start_time.isoformat(),
+            "end_time": updated_session.end_time.isoformat()
+        }
+    )
 
 
 @router.delete("/sessions/{session_id}", response_model=BaseResponse)
 async def delete_session(
     session_id: int,
-    supabase: Client = Depends(get_supabase)
+    session_service: TeachingSessionService = Depends(get_teaching_session_service)
 ):
     """Delete a teaching session by ID."""
-    try:
-        session_service = TeachingSessionService(supabase)
-        
-        # Check if session exists
-        existing_session = await session_service.get_by_id(session_id)
-        if not existing_session:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Teaching session not found"
-            )
-        
-        # Delete session
-        success = await session_service.delete(session_id)
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to delete teaching session"
-            )
-        
-        return BaseResponse(message="Teaching session deleted successfully")
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Delete session error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    # Check if session exists
+    existing_session = await session_service.get_by_id(session_id)
+    if not existing_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teaching session not found"
+        )
+    
+    # Delete session
+    success = await session_service.delete(session_id)
+    
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to delete teaching session"
+        )
+    
+    return BaseResponse(message="Teaching session deleted successfully")
 
 
 @router.post("/sessions/{session_id}/qr-code", response_model=BaseResponse)
 async def generate_session_qr_code(
     session_id: int,
     expiry_minutes: int = Query(30, ge=5, le=120),
-    supabase: Client = Depends(get_supabase)
+    session_service: TeachingSessionService = Depends(get_teaching_session_service)
 ):
     """Generate QR code for a teaching session."""
-    try:
-        session_service = TeachingSessionService(supabase)
-        qr_code = await session_service.generate_qr_code(session_id, expiry_minutes)
-        
-        if not qr_code:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Teaching session not found"
-            )
-        
-        return BaseResponse(
-            message="QR code generated successfully",
-            data={"qr_code": qr_code}
+    qr_code = await session_service.generate_qr_code(session_id, expiry_minutes)
+    
+    if not qr_code:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teaching session not found"
+        )
+    
+    return BaseResponse(
+        message="QR code generated successfully",
+        data={"qr_code": qr_code}
+    )
+
+
+def _render_qr_png(qr_data: str, size: int) -> bytes:
+    """Render a QR code as a size x size PNG."""
+    qr = getattr(_qr_local, "qr", None)
+    if qr is None:
+        qr = _qr_local.qr = qrcode.QRCode(
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            border=4,
         )
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Generate QR code error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    # version=None lets make() pick the smallest version that holds the payload;
+    # reset it too, or fit would start from the previous render's version
+    qr.clear()
+    qr.version = None
+    qr.add_data(qr_data)
+    qr.make(fit=True)
+    
+    # Draw at the largest whole box size that fits, so the final scale-up is small or skipped;
+    # nearest-neighbour keeps module edges sharp and is far cheaper than bicubic resampling
+    qr.box_size = max(1, size // (qr.modules_count + 2 * qr.border))
+    qr_image = qr.make_image(fill_color="black", back_color="white")
+    if qr_image.pixel_size != size:
+        qr_image = qr_image.resize((size, size), Image.Resampling.NEAREST)
+    
+    img_buffer = io.BytesIO()
+    qr_image.save(img_buffer, format="PNG")
+    return img_buffer.getvalue()
 
 
 @router.get("/sessions/{session_id}/qr-code")
 async def get_session_qr_code_image(
+    request: Request,
     session_id: int,
     size: int = Query(200, ge=100, le=500, description="QR code size in pixels"),
-    supabase: Client = Depends(get_supabase)
+    session_service: TeachingSessionService = Depends(get_teaching_session_service)
 ):
-    """Get QR code image for a teaching session."""
-    try:
-        session_service = TeachingSessionService(supabase)
-        
-        # Get the session to verify it exists
-        session = await session_service.get_by_id(session_id)
-        if not session:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Teaching session not found"
-            )
-        
-        # Use the existing QR code if available, or generate a new one
-        qr_data = session.qr_code
-        if not qr_data:
-            # Generate new QR code if none exists
-            qr_data = await session_service.generate_qr_code(session_id, 30)
-            if not qr_data:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to generate QR code"
-                )
-        
-        # Create QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
+    """Get QR code image for a teaching session, cached until the QR code expires."""
+    # Read the session and give it a QR code if it has none, concurrently: the conditional
+    # update only writes when qr_code is null, so at most one of the two is authoritative
+    session, created = await asyncio.gather(
+        session_service.get_by_id(session_id),
+        session_service.ensure_qr_code(session_id, 30)
+    )
+    session = created or session
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teaching session not found"
         )
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        
-        # Create QR code image
-        qr_image = qr.make_image(fill_color="black", back_color="white")
-        
-        # Resize the image to the requested size
-        qr_image = qr_image.resize((size, size))
-        
-        # Save image to bytes buffer
-        img_buffer = io.BytesIO()
-        qr_image.save(img_buffer, format="PNG")
-        img_buffer.seek(0)
-        
-        # Return image as streaming response
-        return StreamingResponse(
-            io.BytesIO(img_buffer.getvalue()),
-            media_type="image/png",
-            headers={"Content-Disposition": f"inline; filename=session_{session_id}_qr.png"}
+    
+    qr_data = session.qr_code
+    expired_at = session.qr_expired_at
+    if not qr_data:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate QR code"
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Get QR code image error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    max_age = max(0, int((expired_at - datetime.utcnow()).total_seconds())) if expired_at else 0
+    etag = '"' + hashlib.sha256(f"{qr_data}:{size}".encode()).hexdigest()[:32] + '"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}",
+        "Content-Disposition": f"inline; filename=session_{session_id}_qr.png"
+    }
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    cache_key = (session_id, qr_data, size)
+    png = _qr_png_cache.get(cache_key)
+    if png is None:
+        # QR building and PNG encoding are CPU-bound; keep them off the event loop
+        png = await asyncio.to_thread(_render_qr_png, qr_data, size)
+        
+        if max_age:
+            _qr_png_cache.set(cache_key, png, ttl=max_age)
+    
+    return Response(content=png, media_type="image/png", headers=headers)
 
 
 # Attendance endpoints
@@ -419,32 +379,49 @@ async def get_session_qr_code_image(
 async def mark_attendance(
     session_id: int,
     attendance_data: AttendanceCreate,
-    supabase: Client = Depends(get_supabase)
+    attendance_service: AttendanceService = Depends(get_attendance_service)
 ):
     """Mark attendance for a session (manual)."""
-    try:
-        attendance_service = AttendanceService(supabase)
-        
-        # Ensure session_id matches
-        attendance_dict = attendance_data.model_dump()
-        attendance_dict["session_id"] = session_id
-        
-        attendance = await attendance_service.mark_attendance_manual(
-            session_id,
-            attendance_data.student_id,
-            attendance_data.status
+    # Ensure session_id matches
+    attendance_dict = attendance_data.model_dump()
+    attendance_dict["session_id"] = session_id
+    
+    attendance = await attendance_service.mark_attendance_manual(
+        session_id,
+        attendance_data.student_id,
+        attendance_data.status
+    )
+    
+    if not attendance:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to mark attendance"
         )
-        
-        if not attendance:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to mark attendance"
-            )
-        
-        return BaseResponse(message="Attendance marked successfully")
-    except Exception as e:
-        print(f"Mark attendance error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    return BaseResponse(message="Attendance marked successfully")
+
+
+@router.post("/sessions/{session_id}/attendance/bulk", response_model=BaseResponse)
+async def mark_attendance_bulk(
+    session_id: int,
+    attendance_data: List[AttendanceCreate],
+    attendance_service: AttendanceService = Depends(get_attendance_service)
+):
+    """Mark attendance for many students in a session (manual) with batched writes."""
+    # The path decides the session, as for single records; a later entry for a student wins
+    statuses = {record.student_id: record.status for record in attendance_data}
+    attendances = await attendance_service.mark_attendance_manual_bulk(session_id, statuses)
+    
+    if statuses and not attendances:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to mark attendance"
+        )
+    
+    return BaseResponse(
+        message="Attendance marked successfully",
+        data={"marked": len(attendances)}
+    )
 
 
 @router.post("/sessions/{session_id}/attendance/qr", response_model=BaseResponse)
@@ -452,85 +429,66 @@ async def mark_attendance_by_qr(
     session_id: int,
     student_id: int,
     qr_code: str,
-    supabase: Client = Depends(get_supabase)
+    attendance_service: AttendanceService = Depends(get_attendance_service)
 ):
     """Mark attendance using QR code."""
-    try:
-        attendance_service = AttendanceService(supabase)
-        attendance = await attendance_service.mark_attendance_by_qr(
-            session_id, student_id, qr_code
+    attendance = await attendance_service.mark_attendance_by_qr(
+        session_id, student_id, qr_code
+    )
+    
+    if not attendance:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to mark attendance with QR code"
         )
-        
-        if not attendance:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to mark attendance with QR code"
-            )
-        
-        return BaseResponse(message="Attendance marked successfully using QR code")
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        print(f"Mark attendance by QR error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    return BaseResponse(message="Attendance marked successfully using QR code")
 
 
 @router.get("/sessions/{session_id}/attendance", response_model=List[AttendanceDetailResponse])
 async def get_session_attendance(
     session_id: int,
-    supabase: Client = Depends(get_supabase)
+    attendance_service: AttendanceService = Depends(get_attendance_service)
 ):
     """Get all attendance records for a session with detailed information."""
-    try:
-        attendance_service = AttendanceService(supabase)
-        
-        # Get detailed attendance information
-        attendance_details = await attendance_service.get_session_attendance_with_details(session_id)
-        
-        return [AttendanceDetailResponse(**attendance) for attendance in attendance_details]
-    except Exception as e:
-        print(f"Get session attendance error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    # Get detailed attendance information
+    attendance_details = await attendance_service.get_session_attendance_with_details(session_id)
+    
+    return PydanticJSONResponse(_attendance_details_adapter.validate_python(attendance_details))
 
 
 @router.post("/sessions/student/{student_id}/attendance")
 async def get_multiple_sessions_student_attendance(
     student_id: int,
     request: MultipleSessionsAttendanceRequest,
-    supabase: Client = Depends(get_supabase)
+    session_service: TeachingSessionService = Depends(get_teaching_session_service),
+    attendance_service: AttendanceService = Depends(get_attendance_service)
 ):
     """Get multiple sessions details and specific student's attendance with all FK joins."""
-    try:
-        session_service = TeachingSessionService(supabase)
-        attendance_service = AttendanceService(supabase)
-        
-        result = []
+    result = []
+    
+    for session_id in request.session_ids:
+        # Get session details
+        session = await session_service.get_by_id(session_id)
+        if not session:
+            # Skip sessions that don't exist, or you can choose to raise an error
+            continue
         
-        for session_id in request.session_ids:
-            # Get session details
-            session = await session_service.get_by_id(session_id)
-            if not session:
-                # Skip sessions that don't exist, or you can choose to raise an error
-                continue
-            
-            # Get detailed attendance for the specific student in this session
-            attendance_details = await attendance_service.get_session_student_attendance_with_details(
-                session_id, student_id
-            )
-            
-            result.append({
-                "session": session.model_dump(),
-                "student_attendance": attendance_details
-            })
+        # Get detailed attendance for the specific student in this session
+        attendance_details = await attendance_service.get_session_student_attendance_with_details(
+            session_id, student_id
+        )
         
-        return {
-            "student_id": student_id,
-            "sessions_data": result,
-            "total_sessions": len(result)
-        }
-    except Exception as e:
-        print(f"Get multiple sessions student attendance error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+        result.append({
+            "session": session.model_dump(),
+            "student_attendance": attendance_details
+        })
+    
+    return {
+        "student_id": student_id,
+        "sessions_data": result,
+        "total_sessions": len(result)
+    }
 
 
 @router.get("/{class_id}/attendance/statistics")
@@ -538,20 +496,15 @@ async def get_attendance_statistics(
     class_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
-    supabase: Client = Depends(get_supabase)
+    attendance_service: AttendanceService = Depends(get_attendance_service)
 ):
     """Get attendance statistics for a class within a date range."""
-    try:
-        attendance_service = AttendanceService(supabase)
-        stats = await attendance_service.get_attendance_statistics(class_id, start_date, end_date)
-        
-        return BaseResponse(
-            message="Attendance statistics retrieved successfully",
-            data=stats
-        )
-    except Exception as e:
-        print(f"Get attendance statistics error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    stats = await attendance_service.get_attendance_statistics(class_id, start_date, end_date)
+    
+    return BaseResponse(
+        message="Attendance statistics retrieved successfully",
+        data=stats
+    )
 
 
 # Class Student enrollment endpoints
@@ -559,87 +512,84 @@ async def get_attendance_statistics(
 async def enroll_student(
     class_id: int,
     enrollment_data: ClassStudentCreate,
-    supabase: Client = Depends(get_supabase)
+    class_student_service: ClassStudentService = Depends(get_class_student_service)
 ):
     """Enroll a student in a class."""
-    try:
-        class_student_service = ClassStudentService(supabase)
-        enrollment = await class_student_service.enroll_student(class_id, enrollment_data.student_id)
-        
-        if not enrollment:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to enroll student"
-            )
-        
-        return BaseResponse(message="Student enrolled successfully")
-    except Exception as e:
-        print(f"Enroll student error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    enrollment = await class_student_service.enroll_student(class_id, enrollment_data.student_id)
+    
+    if not enrollment:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to enroll student"
+        )
+    
+    return BaseResponse(message="Student enrolled successfully")
+
+
+@router.post("/{class_id}/students/bulk", response_model=BaseResponse)
+async def enroll_students_bulk(
+    class_id: int,
+    enrollment_data: ClassStudentBulkCreate,
+    class_student_service: ClassStudentService = Depends(get_class_student_service)
+):
+    """Enroll many students in a class with batched writes."""
+    enrollments = await class_student_service.enroll_students(class_id, enrollment_data.student_ids)
+    
+    if not enrollments:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to enroll students"
+        )
+    
+    return BaseResponse(
+        message="Students enrolled successfully",
+        data={"enrolled": len(enrollments)}
+    )
 
 
 @router.get("/{class_id}/students", response_model=List[ClassStudentDetailResponse])
 async def get_class_students(
     class_id: int,
     active_only: bool = Query(True),
-    supabase: Client = Depends(get_supabase)
+    class_student_service: ClassStudentService = Depends(get_class_student_service)
 ):
     """Get all students enrolled in a class with detailed information."""
-    try:
-        class_student_service = ClassStudentService(supabase)
-        
-        # Get detailed student information
-        enrollments_with_details = await class_student_service.get_class_students_with_details(
-            class_id, active_only
-        )
-        
-        return [ClassStudentDetailResponse(**enrollment) for enrollment in enrollments_with_details]
-    except Exception as e:
-        print(f"Get class students error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    # Get detailed student information
+    enrollments_with_details = await class_student_service.get_class_students_with_details(
+        class_id, active_only
+    )
+    
+    return PydanticJSONResponse(_class_students_adapter.validate_python(enrollments_with_details))
 
 
 @router.delete("/{class_id}/students/{student_id}", response_model=BaseResponse)
 async def unenroll_student(
     class_id: int,
     student_id: int,
-    supabase: Client = Depends(get_supabase)
+    class_student_service: ClassStudentService = Depends(get_class_student_service)
 ):
     """Unenroll a student from a class."""
-    try:
-        class_student_service = ClassStudentService(supabase)
-        success = await class_student_service.unenroll_student(class_id, student_id)
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Student enrollment not found"
-            )
-        
-        return BaseResponse(message="Student unenrolled successfully")
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Unenroll student error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    success = await class_student_service.unenroll_student(class_id, student_id)
+    
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student enrollment not found"
+        )
+    
+    return BaseResponse(message="Student unenrolled successfully")
 
 
 @router.get("/student/{student_id}", response_model=List[StudentClassDetailResponse])
 async def get_student_classes(
     student_id: int,
     active_only: bool = Query(True),
-    supabase: Client = Depends(get_supabase)
+    class_student_service: ClassStudentService = Depends(get_class_student_service)
 ):
     """Get all classes for a specific student with detailed information."""
-    try:
-        class_student_service = ClassStudentService(supabase)
-        
-        # Get detailed class information for the student
-        classes_with_details = await class_student_service.get_student_classes_with_details(
-            student_id, active_only
-        )
-        
-        return [StudentClassDetailResponse(**class_data) for class_data in classes_with_details]
-    except Exception as e:
-        print(f"Get student classes error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    # Get detailed class information for the student
+    classes_with_details = await class_student_service.get_student_classes_with_details(
+        student_id, active_only
+    )
+    
+    return PydanticJSONResponse(_student_classes_adapter.validate_python(classes_with_details))
@@ -1,139 +1,219 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from fastapi.responses import StreamingResponse
-from typing import List
+import logging
+import os
+import tempfile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import Response, StreamingResponse
+from typing import Awaitable, Callable, List, Optional, Tuple
 from io import BytesIO
-from supabase import Client
-from app.core.database import get_supabase
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.ids import new_ulid
+from app.core.responses import PydanticJSONResponse, stream_json_array
+from app.models import Student, Teacher
 from app.schemas import (
     StudentCreate, StudentUpdate, StudentResponse,
     TeacherCreate, TeacherUpdate, TeacherResponse,
-    BaseResponse, PaginatedResponse, BulkImportResult
+    BaseResponse, CursorPaginatedResponse, BulkImportResult, BulkImportJob
 )
 from app.services import StudentService, TeacherService
+from app.services.dependencies import get_student_service, get_teacher_service, get_excel_service
 from app.services.excel import ExcelService
-from app.repositories.users import UserRepository
-from app.repositories.academic import AcademicRepository
-from app.repositories.classes import ClassRepository
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/users", tags=["Users"])
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Uploads are copied to disk this many bytes at a time
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Background bulk import jobs by (user type, job id), kept for an hour so the result can be collected
+_import_jobs = TTLCache(maxsize=256, ttl=60 * 60)
+
+# Parametrized page models, built once at import instead of per request
+StudentPage = CursorPaginatedResponse[Student]
+TeacherPage = CursorPaginatedResponse[Teacher]
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated fields query parameter into column names."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
+
 
 # Student endpoints
 @router.post("/students", response_model=BaseResponse)
 async def create_student(
     student_data: StudentCreate,
-    supabase: Client = Depends(get_supabase)
+    student_service: StudentService = Depends(get_student_service)
 ):
     """Create a new student with authentication."""
-    try:
-        student_service = StudentService(supabase)
-        student = await student_service.create_student_with_auth(student_data)
-        
-        if not student:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create student"
-            )
-        
-        return BaseResponse(
-            message="Student created successfully",
-            data={
-                "id": student.id,
-                "student_code": student.student_code,
-                "full_name": student.full_name
-            }
+    student = await student_service.create_student_with_auth(student_data)
+    
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create student"
         )
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        print(f"Create student error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    return BaseResponse(
+        message="Student created successfully",
+        data={
+            "id": student.id,
+            "student_code": student.student_code,
+            "full_name": student.full_name
+        }
+    )
 
 
-@router.get("/students", response_model=PaginatedResponse)
+@router.get("/students", response_model=CursorPaginatedResponse[StudentResponse])
 async def get_students(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     faculty_id: int = Query(None),
     major_id: int = Query(None),
     cohort_id: int = Query(None),
     class_name: str = Query(None),
     search: str = Query(None),
-    supabase: Client = Depends(get_supabase)
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,full_name"),
+    student_service: StudentService = Depends(get_student_service)
 ):
-    """Get all students with pagination and optional filters."""
-    try:
-        student_service = StudentService(supabase)
-        
-        # Handle search
-        if search:
-            students = await student_service.search_by_name(search)
-            return PaginatedResponse(
-                items=[student.model_dump() for student in students],
-                total=len(students),
-                page=1,
-                limit=len(students),
-                total_pages=1
-            )
-        
-        # Handle filters
-        if faculty_id:
-            students = await student_service.get_by_faculty(faculty_id)
-            return PaginatedResponse(
-                items=[student.model_dump() for student in students],
-                total=len(students),
-                page=1,
-                limit=len(students),
-                total_pages=1
-            )
-        elif major_id:
-            students = await student_service.get_by_major(major_id)
-            return PaginatedResponse(
-                items=[student.model_dump() for student in students],
-                total=len(students),
-                page=1,
-                limit=len(students),
-                total_pages=1
-            )
-        elif cohort_id:
-            students = await student_service.get_by_cohort(cohort_id)
-            return PaginatedResponse(
-                items=[student.model_dump() for student in students],
-                total=len(students),
-                page=1,
-                limit=len(students),
-                total_pages=1
-            )
-        elif class_name:
-            students = await student_service.get_by_class_name(class_name)
-            return PaginatedResponse(
-                items=[student.model_dump() for student in students],
-                total=len(students),
-                page=1,
-                limit=len(students),
-                total_pages=1
-            )
-        else:
-            result = await student_service.get_all(page, limit)
-            return PaginatedResponse(
-                items=[student.model_dump() for student in result["items"]],
-                total=result["total"],
-                page=result["page"],
-                limit=result["limit"],
-                total_pages=result["total_pages"]
-            )
-    except Exception as e:
-        print(f"Get students error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    """Get students with cursor pagination, optional filters and an optional column projection."""
+    filters = {
+        field: value for field, value in (
+            ("faculty_id", faculty_id),
+            ("major_id", major_id),
+            ("cohort_id", cohort_id),
+            ("class_name", class_name)
+        ) if value
+    }
+    field_list = _parse_fields(fields)
+    # Search, filters and projection all go into one query
+    if search:
+        result = await student_service.search_by_name(search, cursor, limit, filters or None, field_list)
+    else:
+        result = await student_service.get_page(cursor, limit, filters or None, field_list)
+    # Projected rows are partial, so they go out as plain dicts
+    page = (CursorPaginatedResponse if field_list else StudentPage)(
+        items=result["items"],
+        limit=result["limit"],
+        next_cursor=result["next_cursor"]
+    )
+    
+    # Serialize the models once, skipping the response_model dict round-trip
+    return PydanticJSONResponse(page)
+
+
+@router.get("/students/export", response_model=List[StudentResponse])
+async def export_students(
+    faculty_id: int = Query(None),
+    major_id: int = Query(None),
+    cohort_id: int = Query(None),
+    class_name: str = Query(None),
+    student_service: StudentService = Depends(get_student_service)
+):
+    """Stream all matching students as a JSON array."""
+    filters = {
+        field: value for field, value in (
+            ("faculty_id", faculty_id),
+            ("major_id", major_id),
+            ("cohort_id", cohort_id),
+            ("class_name", class_name)
+        ) if value
+    }
+    
+    return StreamingResponse(
+        stream_json_array(student_service.iter_all(filters or None)),
+        media_type="application/json"
+    )
 
 
 # Excel bulk import endpoints
-async def get_excel_service(supabase: Client = Depends(get_supabase)) -> ExcelService:
-    """Get Excel service with repositories."""
-    user_repo = UserRepository(supabase)
-    academic_repo = AcademicRepository(supabase)
-    class_repo = ClassRepository(supabase)
-    return ExcelService(user_repo, academic_repo, class_repo)
+async def _run_import_job(
+    job_key: Tuple[str, str],
+    process: Callable[[str], Awaitable[Tuple[BulkImportResult, Optional[BytesIO]]]],
+    path: str
+) -> None:
+    """Run an Excel import after the upload request has returned, record its outcome and remove the upload."""
+    try:
+        result, excel_buffer = await process(path)
+        _import_jobs.set(job_key, {
+            "status": "completed",
+            "result": result,
+            "file": excel_buffer.getvalue() if excel_buffer else None
+        })
+    except HTTPException as e:
+        _import_jobs.set(job_key, {"status": "failed", "error": e.detail})
+    except Exception:
+        logger.exception("Bulk import job %s failed", job_key[1])
+        _import_jobs.set(job_key, {"status": "failed", "error": "Internal server error"})
+    finally:
+        os.unlink(path)
+
+
+async def _start_import_job(
+    user_type: str,
+    file: UploadFile,
+    process: Callable[[str], Awaitable[Tuple[BulkImportResult, Optional[BytesIO]]]],
+    background_tasks: BackgroundTasks
+) -> PydanticJSONResponse:
+    """Validate an uploaded workbook and queue its import, answering 202 with the job id."""
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(
+            status_code=400,
+            detail="File must be an Excel file (.xlsx or .xls)"
+        )
+    
+    if file.size is not None and file.size > settings.max_upload_size:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File is too large")
+    
+    # The upload is closed once the response is sent, so spool it to disk chunk by chunk
+    # instead of reading it into memory; the job reads the workbook from there
+    upload_copy = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+    try:
+        with upload_copy:
+            size = 0
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.max_upload_size:
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File is too large")
+                upload_copy.write(chunk)
+    except BaseException:
+        os.unlink(upload_copy.name)
+        raise
+    
+    job_id = new_ulid()
+    _import_jobs.set((user_type, job_id), {"status": "pending"})
+    background_tasks.add_task(_run_import_job, (user_type, job_id), process, upload_copy.name)
+    
+    return PydanticJSONResponse(
+        BulkImportJob(job_id=job_id, status="pending"),
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+def _import_job_response(user_type: str, job_id: str, filename: str):
+    """Answer a bulk import poll: job status until done, then the password workbook or the result."""
+    job = _import_jobs.get((user_type, job_id))
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    
+    if job["status"] == "completed":
+        if job["file"]:
+            # Return Excel file with passwords
+            return Response(
+                content=job["file"],
+                media_type=XLSX_MEDIA_TYPE,
+                headers={"Content-Disposition": f"attachment; filename={filename}"}
+            )
+        # Return JSON result if no successful imports
+        return job["result"]
+    
+    return PydanticJSONResponse(
+        BulkImportJob(job_id=job_id, status=job["status"], error=job.get("error")),
+        status_code=status.HTTP_202_ACCEPTED if job["status"] == "pending" else status.HTTP_200_OK
+    )
 
 
 @router.get("/students/sample-excel")
@@ -141,20 +221,19 @@ async def download_student_sample_excel(
     excel_service: ExcelService = Depends(get_excel_service)
 ):
     """Download sample Excel file for student bulk import with Vietnamese headers."""
-    try:
-        excel_buffer = excel_service.generate_student_sample_excel()
-        
-        return StreamingResponse(
-            BytesIO(excel_buffer.read()),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": "attachment; filename=mau_danh_sach_sinh_vien.xlsx"}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating sample file: {str(e)}")
+    excel_buffer = excel_service.generate_student_sample_excel()
+    
+    # The workbook is small and already in memory; send its bytes without another copy or an iterator
+    return Response(
+        content=excel_buffer.getvalue(),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": "attachment; filename=mau_danh_sach_sinh_vien.xlsx"}
+    )
 
 
-@router.post("/students/bulk-import")
+@router.post("/students/bulk-import", status_code=status.HTTP_202_ACCEPTED, response_model=BulkImportJob)
 async def bulk_import_students(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Excel file with student data"),
     excel_service: ExcelService = Depends(get_excel_service)
 ):
@@ -176,209 +255,157 @@ async def bulk_import_students(
     - Quê quán: Hometown
     
     Password: 6-character random password generated for each student
-    Returns Excel file with imported data including generated passwords
+    The import runs in the background: this returns 202 with a job id, and
+    GET /students/bulk-import/{job_id} returns the Excel file with imported data
+    including generated passwords once it is done.
     """
-    try:
-        if not file.filename.endswith(('.xlsx', '.xls')):
-            raise HTTPException(
-                status_code=400,
-                detail="File must be an Excel file (.xlsx or .xls)"
-            )
-        
-        result, excel_buffer = await excel_service.process_student_excel(file)
-        
-        if excel_buffer:
-            # Return Excel file with passwords
-            return StreamingResponse(
-                BytesIO(excel_buffer.read()),
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={"Content-Disposition": "attachment; filename=danh_sach_sinh_vien_voi_mat_khau.xlsx"}
-            )
-        else:
-            # Return JSON result if no successful imports
-            return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing Excel file: {str(e)}")
+    return await _start_import_job("student", file, excel_service.process_student_excel, background_tasks)
+
+
+@router.get("/students/bulk-import/{job_id}")
+async def get_student_bulk_import(job_id: str):
+    """Get the status of a student bulk import, or its result once it has completed."""
+    return _import_job_response("student", job_id, "danh_sach_sinh_vien_voi_mat_khau.xlsx")
 
 
 @router.get("/students/{student_id}", response_model=StudentResponse)
 async def get_student(
     student_id: int,
-    supabase: Client = Depends(get_supabase)
+    student_service: StudentService = Depends(get_student_service)
 ):
     """Get student by ID."""
-    try:
-        student_service = StudentService(supabase)
-        student = await student_service.get_by_id(student_id)
-        
-        if not student:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-        
-        return StudentResponse(**student.model_dump())
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Get student error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    student = await student_service.get_by_id(student_id)
+    
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    
+    # Student has exactly StudentResponse's fields, so serialize it directly instead of copying it
+    return PydanticJSONResponse(student)
 
 
 @router.get("/students/code/{student_code}", response_model=StudentResponse)
 async def get_student_by_code(
     student_code: str,
-    supabase: Client = Depends(get_supabase)
+    student_service: StudentService = Depends(get_student_service)
 ):
     """Get student by student code."""
-    try:
-        student_service = StudentService(supabase)
-        student = await student_service.get_by_student_code(student_code)
-        
-        if not student:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-        
-        return StudentResponse(**student.model_dump())
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Get student by code error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    student = await student_service.get_by_student_code(student_code)
+    
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    
+    return PydanticJSONResponse(student)
 
 
 @router.put("/students/{student_id}", response_model=BaseResponse)
 async def update_student(
     student_id: int,
     student_data: StudentUpdate,
-    supabase: Client = Depends(get_supabase)
+    student_service: StudentService = Depends(get_student_service)
 ):
     """Update student by ID."""
-    try:
-        student_service = StudentService(supabase)
-        student = await student_service.update(student_id, student_data.model_dump(exclude_none=True))
-        
-        if not student:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-        
-        return BaseResponse(
-            message="Student updated successfully",
-            data=StudentResponse(**student.model_dump()).model_dump()
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Update student error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    student = await student_service.update(student_id, student_data.model_dump(exclude_none=True))
+    
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    
+    return BaseResponse(
+        message="Student updated successfully",
+        data=student
+    )
 
 
 @router.delete("/students/{student_id}", response_model=BaseResponse)
 async def delete_student(
     student_id: int,
-    supabase: Client = Depends(get_supabase)
+    student_service: StudentService = Depends(get_student_service)
 ):
     """Delete student by ID."""
-    try:
-        student_service = StudentService(supabase)
-        success = await student_service.delete(student_id)
-        
-        if not success:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-        
-        return BaseResponse(message="Student deleted successfully")
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Delete student error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    success = await student_service.delete(student_id)
+    
+    if not success:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    
+    return BaseResponse(message="Student deleted successfully")
 
 
 # Teacher endpoints
 @router.post("/teachers", response_model=BaseResponse)
 async def create_teacher(
     teacher_data: TeacherCreate,
-    supabase: Client = Depends(get_supabase)
+    teacher_service: TeacherService = Depends(get_teacher_service)
 ):
     """Create a new teacher with authentication."""
-    try:
-        teacher_service = TeacherService(supabase)
-        teacher = await teacher_service.create_teacher_with_auth(teacher_data)
-        
-        if not teacher:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create teacher"
-            )
-        
-        return BaseResponse(
-            message="Teacher created successfully",
-            data={
-                "id": teacher.id,
-                "teacher_code": teacher.teacher_code,
-                "full_name": teacher.full_name
-            }
+    teacher = await teacher_service.create_teacher_with_auth(teacher_data)
+    
+    if not teacher:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create teacher"
         )
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        print(f"Create teacher error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    return BaseResponse(
+        message="Teacher created successfully",
+        data={
+            "id": teacher.id,
+            "teacher_code": teacher.teacher_code,
+            "full_name": teacher.full_name
+        }
+    )
 
 
-@router.get("/teachers", response_model=PaginatedResponse)
+@router.get("/teachers", response_model=CursorPaginatedResponse[TeacherResponse])
 async def get_teachers(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     faculty_id: int = Query(None),
     department_id: int = Query(None),
     search: str = Query(None),
-    supabase: Client = Depends(get_supabase)
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,full_name"),
+    teacher_service: TeacherService = Depends(get_teacher_service)
 ):
-    """Get all teachers with pagination and optional filters."""
-    try:
-        teacher_service = TeacherService(supabase)
-        
-        # Handle search
-        if search:
-            teachers = await teacher_service.search_by_name(search)
-            return PaginatedResponse(
-                items=[teacher.model_dump() for teacher in teachers],
-                total=len(teachers),
-                page=1,
-                limit=len(teachers),
-                total_pages=1
-            )
-        
-        # Handle filters
-        if faculty_id:
-            teachers = await teacher_service.get_by_faculty(faculty_id)
-            return PaginatedResponse(
-                items=[teacher.model_dump() for teacher in teachers],
-                total=len(teachers),
-                page=1,
-                limit=len(teachers),
-                total_pages=1
-            )
-        elif department_id:
-            teachers = await teacher_service.get_by_department(department_id)
-            return PaginatedResponse(
-                items=[teacher.model_dump() for teacher in teachers],
-                total=len(teachers),
-                page=1,
-                limit=len(teachers),
-                total_pages=1
-            )
-        else:
-            result = await teacher_service.get_all(page, limit)
-            return PaginatedResponse(
-                items=[teacher.model_dump() for teacher in result["items"]],
-                total=result["total"],
-                page=result["page"],
-                limit=result["limit"],
-                total_pages=result["total_pages"]
-            )
-    except Exception as e:
-        print(f"Get teachers error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    """Get teachers with cursor pagination, optional filters and an optional column projection."""
+    filters = {
+        field: value for field, value in (
+            ("faculty_id", faculty_id),
+            ("department_id", department_id)
+        ) if value
+    }
+    field_list = _parse_fields(fields)
+    # Search, filters and projection all go into one query
+    if search:
+        result = await teacher_service.search_by_name(search, cursor, limit, filters or None, field_list)
+    else:
+        result = await teacher_service.get_page(cursor, limit, filters or None, field_list)
+    # Projected rows are partial, so they go out as plain dicts
+    page = (CursorPaginatedResponse if field_list else TeacherPage)(
+        items=result["items"],
+        limit=result["limit"],
+        next_cursor=result["next_cursor"]
+    )
+    
+    # Serialize the models once, skipping the response_model dict round-trip
+    return PydanticJSONResponse(page)
+
+
+@router.get("/teachers/export", response_model=List[TeacherResponse])
+async def export_teachers(
+    faculty_id: int = Query(None),
+    department_id: int = Query(None),
+    teacher_service: TeacherService = Depends(get_teacher_service)
+):
+    """Stream all matching teachers as a JSON array."""
+    filters = {
+        field: value for field, value in (
+            ("faculty_id", faculty_id),
+            ("department_id", department_id)
+        ) if value
+    }
+    
+    return StreamingResponse(
+        stream_json_array(teacher_service.iter_all(filters or None)),
+        media_type="application/json"
+    )
 
 
 @router.get("/teachers/sample-excel")
@@ -386,20 +413,18 @@ async def download_teacher_sample_excel(
     excel_service: ExcelService = Depends(get_excel_service)
 ):
     """Download sample Excel file for teacher bulk import with Vietnamese headers."""
-    try:
-        excel_buffer = excel_service.generate_teacher_sample_excel()
-        
-        return StreamingResponse(
-            BytesIO(excel_buffer.read()),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": "attachment; filename=mau_danh_sach_giang_vien.xlsx"}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating sample file: {str(e)}")
+    excel_buffer = excel_service.generate_teacher_sample_excel()
+    
+    return Response(
+        content=excel_buffer.getvalue(),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": "attachment; filename=mau_danh_sach_giang_vien.xlsx"}
+    )
 
 
-@router.post("/teachers/bulk-import")
+@router.post("/teachers/bulk-import", status_code=status.HTTP_202_ACCEPTED, response_model=BulkImportJob)
 async def bulk_import_teachers(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Excel file with teacher data"),
     excel_service: ExcelService = Depends(get_excel_service)
 ):
@@ -418,122 +443,74 @@ async def bulk_import_teachers(
     - Bộ môn: Department name (must exist in system if provided)
     
     Password: 6-character random password generated for each teacher
-    Returns Excel file with imported data including generated passwords
+    The import runs in the background: this returns 202 with a job id, and
+    GET /teachers/bulk-import/{job_id} returns the Excel file with imported data
+    including generated passwords once it is done.
     """
-    try:
-        if not file.filename.endswith(('.xlsx', '.xls')):
-            raise HTTPException(
-                status_code=400,
-                detail="File must be an Excel file (.xlsx or .xls)"
-            )
-        
-        result, excel_buffer = await excel_service.process_teacher_excel(file)
-        
-        if excel_buffer:
-            # Return Excel file with passwords
-            return StreamingResponse(
-                BytesIO(excel_buffer.read()),
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={"Content-Disposition": "attachment; filename=danh_sach_giang_vien_voi_mat_khau.xlsx"}
-            )
-        else:
-            # Return JSON result if no successful imports
-            return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing Excel file: {str(e)}")
+    return await _start_import_job("teacher", file, excel_service.process_teacher_excel, background_tasks)
+
+
+@router.get("/teachers/bulk-import/{job_id}")
+async def get_teacher_bulk_import(job_id: str):
+    """Get the status of a teacher bulk import, or its result once it has completed."""
+    return _import_job_response("teacher", job_id, "danh_sach_giang_vien_voi_mat_khau.xlsx")
 
 
 @router.get("/teachers/{teacher_id}", response_model=TeacherResponse)
 async def get_teacher(
     teacher_id: int,
-    supabase: Client = Depends(get_supabase)
+    teacher_service: TeacherService = Depends(get_teacher_service)
 ):
     """Get teacher by ID."""
-    try:
-        teacher_service = TeacherService(supabase)
-        teacher = await teacher_service.get_by_id(teacher_id)
-        
-        if not teacher:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
-        
-        return TeacherResponse(**teacher.model_dump())
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Get teacher error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    teacher = await teacher_service.get_by_id(teacher_id)
+    
+    if not teacher:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
+    
+    return PydanticJSONResponse(teacher)
 
 
 @router.get("/teachers/code/{teacher_code}", response_model=TeacherResponse)
 async def get_teacher_by_code(
     teacher_code: str,
-    supabase: Client = Depends(get_supabase)
+    teacher_service: TeacherService = Depends(get_teacher_service)
 ):
     """Get teacher by teacher code."""
-    try:
-        teacher_service = TeacherService(supabase)
-        teacher = await teacher_service.get_by_teacher_code(teacher_code)
-        
-        if not teacher:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
-        
-        return TeacherResponse(**teacher.model_dump())
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Get teacher by code error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    teacher = await teacher_service.get_by_teacher_code(teacher_code)
+    
+    if not teacher:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
+    
+    return PydanticJSONResponse(teacher)
 
 
 @router.put("/teachers/{teacher_id}", response_model=BaseResponse)
 async def update_teacher(
     teacher_id: int,
     teacher_data: TeacherUpdate,
-    supabase: Client = Depends(get_supabase)
+    teacher_service: TeacherService = Depends(get_teacher_service)
 ):
     """Update teacher by ID."""
-    try:
-        teacher_service = TeacherService(supabase)
-        teacher = await teacher_service.update(teacher_id, teacher_data.model_dump(exclude_unset=True))
-        
-        if not teacher:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
-        
-        return BaseResponse(
-            message="Teacher updated successfully",
-            data=TeacherResponse(**teacher.model_dump()).model_dump()
-        )
-    except HTTPException:
-        raise
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        print(f"Update teacher error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    teacher = await teacher_service.update(teacher_id, teacher_data.model_dump(exclude_unset=True))
+    
+    if not teacher:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
+    
+    return BaseResponse(
+        message="Teacher updated successfully",
+        data=teacher
+    )
 
 
 @router.delete("/teachers/{teacher_id}", response_model=BaseResponse)
 async def delete_teacher(
     teacher_id: int,
-    supabase: Client = Depends(get_supabase)
+    teacher_service: TeacherService = Depends(get_teacher_service)
 ):
     """Delete teacher by ID."""
-    try:
-        teacher_service = TeacherService(supabase)
-        success = await teacher_service.delete(teacher_id)
-        
-        if not success:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
-        
-        return BaseResponse(message="Teacher deleted successfully")
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Delete teacher error: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
-
-
-# Excel bulk import endpoints
+    success = await teacher_service.delete(teacher_id)
+    
+    if not success:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
+    
+    return BaseResponse(message="Teacher deleted successfully")
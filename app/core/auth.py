@@ -1,21 +1,49 @@
+from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime, timedelta
 from typing import Optional, Any, Dict
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from supabase import Client
+import hashlib
+import logging
+import time
+import jwt
+from jwt import ExpiredSignatureError, PyJWTError
+from supabase import AuthApiError
 from app.core.config import settings
-from app.core.database import get_supabase_admin
+from app.core.cache import TTLCache
+from app.core.database import get_supabase_admin, supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class TokenUser:
+    """User identity read from a locally verified Supabase access token."""
+    id: str
+    email: Optional[str] = None
+    user_metadata: Dict[str, Any] = field(default_factory=dict)
+    app_metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class AuthService:
     """Authentication service for handling JWT tokens and user authentication."""
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         self.secret_key = settings.secret_key
         self.algorithm = settings.algorithm
+        self._algorithms = [self.algorithm]
         self.access_token_expire_minutes = settings.access_token_expire_minutes
+        self.supabase_jwt_secret = settings.supabase_jwt_secret
+        # Short-lived cache of token -> Supabase user to skip repeat auth round-trips
+        self._user_cache = TTLCache(maxsize=10_000, ttl=30)
+        # Decoded payloads of tokens this service issued, so each is verified once
+        self._payload_cache = TTLCache(maxsize=10_000, ttl=60)
         
+    @cached_property
+    def pwd_context(self):
+        """Password hashing context, built on first use; token-only workers never load bcrypt."""
+        from passlib.context import CryptContext
+        return CryptContext(schemes=["bcrypt"], deprecated="auto")
+    
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
         return self.pwd_context.verify(plain_password, hashed_password)
@@ -36,19 +64,39 @@ class AuthService:
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
     
+    @staticmethod
+    def _token_key(token: str) -> bytes:
+        """Hash a token for use as a cache key, so raw tokens are not kept in memory."""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    @staticmethod
+    def _cache_ttl(cache: TTLCache, claims: Dict[str, Any]) -> float:
+        """Cache a verified token for the cache's TTL, but never past the token's expiry."""
+        exp = claims.get("exp")
+        if exp is None:
+            return cache.ttl
+        return max(0.0, min(cache.ttl, exp - time.time()))
+    
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify and decode JWT token."""
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        cache_key = self._token_key(token)
+        payload = self._payload_cache.get(cache_key)
+        if payload is not None:
             return payload
-        except JWTError:
+        
+        try:
+            payload = jwt.decode(token, self.secret_key, algorithms=self._algorithms)
+        except PyJWTError:
             return None
+        
+        self._payload_cache.set(cache_key, payload, ttl=self._cache_ttl(self._payload_cache, payload))
+        return payload
     
     async def authenticate_user_with_supabase(self, email: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate user with Supabase Auth."""
         try:
-            supabase = get_supabase_admin()
-            response = supabase.auth.sign_in_with_password({
+            supabase = supabase_client.create_session_client()
+            response = await supabase.auth.sign_in_with_password({
                 "email": email,
                 "password": password
             })
@@ -59,8 +107,12 @@ class AuthService:
                     "session": response.session
                 }
             return None
+        except AuthApiError as e:
+            # Wrong credentials are routine; keep them out of the default log output
+            logger.debug("Authentication rejected: %s", e)
+            return None
         except Exception as e:
-            print(f"Authentication error: {e}")
+            logger.warning("Authentication failed: %s", e)
             return None
     
     async def create_user_with_supabase(self, email: str, password: str, user_metadata: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
@@ -69,12 +121,16 @@ class AuthService:
             supabase = get_supabase_admin()
             
             # Use the auth.admin API with service role key
-            response = supabase.auth.admin.create_user({
+            attributes = {
                 "email": email,
                 "password": password,
                 "user_metadata": user_metadata or {},
                 "email_confirm": True  # Auto-confirm email in development
-            })
+            }
+            if user_metadata and user_metadata.get("user_type"):
+                # Users can edit user_metadata themselves; app_metadata is only writable with the service role
+                attributes["app_metadata"] = {"user_type": user_metadata["user_type"]}
+            response = await supabase.auth.admin.create_user(attributes)
             
             if response.user:
                 return {
@@ -83,10 +139,10 @@ class AuthService:
                 }
             return None
         except Exception as e:
-            print(f"Create user error: {e}")
+            logger.warning("Admin create user failed, falling back to sign up: %s", e)
             # Fallback: try regular sign up if admin creation fails
             try:
-                response = supabase.auth.sign_up({
+                response = await supabase_client.create_session_client().auth.sign_up({
                     "email": email,
                     "password": password,
                     "options": {
@@ -99,19 +155,65 @@ class AuthService:
                         "user": response.user,
                         "session": response.session
                     }
-            except Exception as fallback_error:
-                print(f"Fallback sign up error: {fallback_error}")
+            except Exception:
+                logger.exception("Fallback sign up error")
             
             return None
     
+    async def delete_user_with_supabase(self, user_id: str) -> bool:
+        """Delete a Supabase Auth user, e.g. when its profile could not be created."""
+        try:
+            supabase = get_supabase_admin()
+            await supabase.auth.admin.delete_user(user_id)
+            return True
+        except Exception:
+            logger.exception("Delete user error")
+            return False
+    
     async def get_current_user_from_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Get current user from JWT token."""
+        cache_key = self._token_key(token)
+        user = self._user_cache.get(cache_key)
+        if user is not None:
+            return user
+        
+        if self.supabase_jwt_secret:
+            try:
+                claims = jwt.decode(token, self.supabase_jwt_secret, algorithms=["HS256"], audience="authenticated")
+                user = TokenUser(
+                    id=claims["sub"],
+                    email=claims.get("email"),
+                    user_metadata=claims.get("user_metadata") or {},
+                    app_metadata=claims.get("app_metadata") or {}
+                )
+                self._user_cache.set(cache_key, user, ttl=self._cache_ttl(self._user_cache, claims))
+                return user
+            except (ExpiredSignatureError, KeyError):
+                return None
+            except PyJWTError:
+                # Not an HS256 project token (e.g. asymmetric signing keys); ask Supabase instead
+                pass
+        
         try:
             supabase = get_supabase_admin()
-            response = supabase.auth.get_user(token)
-            return response.user if response.user else None
+            response = await supabase.auth.get_user(token)
+            if not response.user:
+                return None
+            
+            # Supabase has just vouched for the token, so its unverified exp is only used to bound the cache
+            try:
+                claims = jwt.decode(token, options={"verify_signature": False})
+            except PyJWTError:
+                claims = {}
+            ttl = self._cache_ttl(self._user_cache, claims)
+            if ttl >= 1:
+                self._user_cache.set(cache_key, response.user, ttl=ttl)
+            return response.user
+        except AuthApiError as e:
+            logger.debug("Token rejected: %s", e)
+            return None
         except Exception as e:
-            print(f"Error getting user: {e}")
+            logger.warning("Token lookup failed: %s", e)
             return None
 
 
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -16,6 +16,11 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
     supabase_service_key: str
+    supabase_max_connections: int = 100
+    supabase_max_keepalive_connections: int = 50
+    supabase_timeout: float = 120.0
+    # Project JWT secret; when set, access tokens are verified locally instead of via Supabase Auth
+    supabase_jwt_secret: Optional[str] = None
     
     # Database
     database_url: str
@@ -25,6 +30,9 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     
+    # Uploads; larger request bodies are rejected with 413
+    max_upload_size: int = 20 * 1024 * 1024
+    
     # Hatchet
     hatchet_client_token: str
     
@@ -1,4 +1,5 @@
-from supabase import create_client, Client
+import httpx
+from supabase import AsyncClient, AsyncClientOptions
 from app.core.config import settings
 
 
@@ -7,6 +8,8 @@ class SupabaseClient:
     
     _instance = None
     _client = None
+    _service_client = None
+    _http_client = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -14,33 +17,66 @@ class SupabaseClient:
         return cls._instance
     
     def __init__(self):
+        if self._http_client is None:
+            # One keep-alive pool shared by every Supabase client in the process
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.supabase_max_connections,
+                    max_keepalive_connections=settings.supabase_max_keepalive_connections
+                ),
+                timeout=settings.supabase_timeout,
+                follow_redirects=True,
+                http2=True
+            )
         if self._client is None:
-            self._client = create_client(
+            self._client = AsyncClient(
                 settings.supabase_url,
-                settings.supabase_key
+                settings.supabase_key,
+                self._client_options()
             )
     
+    def _client_options(self, **options) -> AsyncClientOptions:
+        """Build client options that reuse the shared HTTP pool."""
+        return AsyncClientOptions(httpx_client=self._http_client, **options)
+    
     @property
-    def client(self) -> Client:
+    def client(self) -> AsyncClient:
         return self._client
     
-    def get_service_client(self) -> Client:
+    def get_service_client(self) -> AsyncClient:
         """Get Supabase client with service key for admin operations."""
-        return create_client(
+        if self._service_client is None:
+            self._service_client = AsyncClient(
+                settings.supabase_url,
+                settings.supabase_service_key,
+                self._client_options()
+            )
+        return self._service_client
+    
+    def create_session_client(self) -> AsyncClient:
+        """Create a throwaway client for calls that sign a user in."""
+        # Signing in rebinds the client's Authorization header to the user's token,
+        # so sign-in, sign-up and OTP verification must never run on a shared client
+        return AsyncClient(
             settings.supabase_url,
-            settings.supabase_service_key
+            settings.supabase_key,
+            self._client_options(persist_session=False, auto_refresh_token=False)
         )
+    
+    async def close(self) -> None:
+        """Close the shared HTTP connection pool."""
+        await self._http_client.aclose()
 
 
 # Global instance
 supabase_client = SupabaseClient()
 
 
-def get_supabase() -> Client:
+def get_supabase() -> AsyncClient:
     """Dependency to get Supabase client."""
     return supabase_client.client
 
 
-def get_supabase_admin() -> Client:
+def get_supabase_admin() -> AsyncClient:
     """Dependency to get Supabase admin client."""
     return supabase_client.get_service_client()
@@ -0,0 +1,19 @@
+"""
+Identifier generation
+"""
+import os
+import time
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def new_ulid() -> str:
+    """Generate a 26-character, lexicographically sortable ULID."""
+    # 48-bit millisecond timestamp followed by 80 random bits
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    
+    chars = []
+    for _ in range(26):
+        value, index = divmod(value, 32)
+        chars.append(_CROCKFORD_BASE32[index])
+    return "".join(reversed(chars))
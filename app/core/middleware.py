@@ -0,0 +1,84 @@
+"""
+ASGI middleware
+"""
+from typing import Iterable
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class SelectiveGZipMiddleware:
+    """GZip responses except under the given path prefixes."""
+    
+    def __init__(self, app: ASGIApp, exclude_prefixes: Iterable[str] = (), **gzip_options):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, **gzip_options)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip_app(scope, receive, send)
+
+
+class BodyTooLarge(HTTPException):
+    """Raised from receive() once a request body grows past the size limit."""
+    
+    def __init__(self):
+        super().__init__(status_code=413, detail="Request body too large")
+
+
+class MaxBodySizeMiddleware:
+    """Reject requests whose body exceeds max_size with 413.
+    
+    A declared Content-Length over the limit is refused before the body is read.
+    Bodies without one (chunked uploads) are counted as they arrive, and reading
+    past the limit raises BodyTooLarge, which FastAPI turns into a 413.
+    """
+    
+    def __init__(self, app: ASGIApp, max_size: int):
+        self.app = app
+        self.max_size = max_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_size:
+            await self._reject(scope, receive, send)
+            return
+        
+        received = 0
+        response_started = False
+        
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    raise BodyTooLarge()
+            return message
+        
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except BodyTooLarge:
+            # Only reached when the body was read outside FastAPI's exception handling
+            if response_started:
+                raise
+            await self._reject(scope, receive, send)
+    
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse({"detail": "Request body too large"}, status_code=413)
+        await response(scope, receive, send)
@@ -0,0 +1,28 @@
+"""
+Response classes
+"""
+from typing import Any, AsyncIterator
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+# Serializes models, dataclasses, dates and plain containers straight to JSON bytes
+_json_adapter = TypeAdapter(Any)
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core instead of the stdlib json module."""
+    
+    def render(self, content: Any) -> bytes:
+        return _json_adapter.dump_json(content)
+
+
+async def stream_json_array(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Encode items into a JSON array one element at a time."""
+    yield b"["
+    first = True
+    async for item in items:
+        if not first:
+            yield b","
+        yield _json_adapter.dump_json(item)
+        first = False
+    yield b"]"
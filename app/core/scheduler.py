@@ -20,12 +20,12 @@ class SessionScheduler:
     ) -> Optional[str]:
         """Placeholder for session closure scheduling."""
         try:
-            scheduled_time = datetime.strptime(f"{session_date} {end_time}", "%Y-%m-%d %H:%M:%S")
+            scheduled_time = datetime.fromisoformat(f"{session_date}T{end_time}")
             
             logger.info(f"Would schedule closure for session {session_id} at {scheduled_time}")
             
             # Return a mock task ID for now
-            close_session_workflow.schedule(run_at=scheduled_time, input=CloseSessionInput(
+            await close_session_workflow.aio_schedule(run_at=scheduled_time, input=CloseSessionInput(
                 session_id=session_id,
                 scheduled_close_time=scheduled_time.isoformat()
             ))
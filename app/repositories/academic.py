@@ -1,43 +1,49 @@
+import logging
 from typing import Optional, List, Dict, Any
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Faculty, Department, Major, Subject, AcademicYear, Cohort, Semester, StudyPhase
 from app.repositories.base import BaseRepository
 
+logger = logging.getLogger(__name__)
+
+# Rows requested per page when mapping names to IDs for bulk imports
+NAME_LOOKUP_PAGE_SIZE = 1000
+
 
 class FacultyRepository(BaseRepository[Faculty]):
     """Repository for Faculty operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "faculties", Faculty)
     
     async def get_by_code(self, code: str) -> Optional[Faculty]:
         """Get faculty by code."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("code", code).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("code", code).execute()
             
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting faculty by code: {e}")
+        except Exception:
+            logger.exception("Error getting faculty by code")
             return None
     
     async def get_by_name(self, name: str) -> Optional[Faculty]:
         """Get faculty by name."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("name", name).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("name", name).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting faculty by name: {e}")
+        except Exception:
+            logger.exception("Error getting faculty by name")
             return None
 
 
 class DepartmentRepository(BaseRepository[Department]):
     """Repository for Department operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "departments", Department)
     
     async def get_by_faculty(self, faculty_id: int) -> List[Department]:
@@ -47,19 +53,19 @@ class DepartmentRepository(BaseRepository[Department]):
     async def get_by_code(self, code: str) -> Optional[Department]:
         """Get department by code."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("code", code).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("code", code).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting department by code: {e}")
+        except Exception:
+            logger.exception("Error getting department by code")
             return None
 
 
 class MajorRepository(BaseRepository[Major]):
     """Repository for Major operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "majors", Major)
     
     async def get_by_faculty(self, faculty_id: int) -> List[Major]:
@@ -69,19 +75,19 @@ class MajorRepository(BaseRepository[Major]):
     async def get_by_code(self, code: str) -> Optional[Major]:
         """Get major by code."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("code", code).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("code", code).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting major by code: {e}")
+        except Exception:
+            logger.exception("Error getting major by code")
             return None
 
 
 class SubjectRepository(BaseRepository[Subject]):
     """Repository for Subject operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "subjects", Subject)
     
     async def get_by_department(self, department_id: int) -> List[Subject]:
@@ -92,7 +98,7 @@ class SubjectRepository(BaseRepository[Subject]):
         """Get subjects by faculty ID through department relationship."""
         try:
             # First get all departments for this faculty
-            dept_response = (self.supabase.table("departments")
+            dept_response = await (self.supabase.table("departments")
                             .select("id")
                             .eq("faculty_id", faculty_id)
                             .execute())
@@ -104,32 +110,32 @@ class SubjectRepository(BaseRepository[Subject]):
             department_ids = [dept["id"] for dept in dept_response.data]
             
             # Get all subjects for these departments
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .in_("department_id", department_ids)
                        .execute())
             
             return [self.model_class(**item) for item in response.data]
-        except Exception as e:
-            print(f"Error getting subjects by faculty: {e}")
+        except Exception:
+            logger.exception("Error getting subjects by faculty")
             return []
     
     async def get_by_code(self, code: str) -> Optional[Subject]:
         """Get subject by code."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("code", code).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("code", code).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting subject by code: {e}")
+        except Exception:
+            logger.exception("Error getting subject by code")
             return None
 
 
 class AcademicYearRepository(BaseRepository[AcademicYear]):
     """Repository for Academic Year operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "academic_years", AcademicYear)
     
     async def get_current_academic_year(self) -> Optional[AcademicYear]:
@@ -138,7 +144,7 @@ class AcademicYearRepository(BaseRepository[AcademicYear]):
             from datetime import date
             today = date.today()
             
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .lte("start_date", today.isoformat())
                        .gte("end_date", today.isoformat())
@@ -147,36 +153,36 @@ class AcademicYearRepository(BaseRepository[AcademicYear]):
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting current academic year: {e}")
+        except Exception:
+            logger.exception("Error getting current academic year")
             return None
 
 
 class CohortRepository(BaseRepository[Cohort]):
     """Repository for Cohort operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "cohorts", Cohort)
     
     async def get_by_year_range(self, start_year: int, end_year: int) -> List[Cohort]:
         """Get cohorts by year range."""
         try:
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .gte("start_year", start_year)
                        .lte("end_year", end_year)
                        .execute())
             
             return [self.model_class(**item) for item in response.data] if response.data else []
-        except Exception as e:
-            print(f"Error getting cohorts by year range: {e}")
+        except Exception:
+            logger.exception("Error getting cohorts by year range")
             return []
 
 
 class SemesterRepository(BaseRepository[Semester]):
     """Repository for Semester operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "semesters", Semester)
     
     async def get_by_academic_year(self, academic_year_id: int) -> List[Semester]:
@@ -189,7 +195,7 @@ class SemesterRepository(BaseRepository[Semester]):
             from datetime import date
             today = date.today()
             
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .lte("start_date", today.isoformat())
                        .gte("end_date", today.isoformat())
@@ -198,15 +204,30 @@ class SemesterRepository(BaseRepository[Semester]):
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting current semester: {e}")
+        except Exception:
+            logger.exception("Error getting current semester")
             return None
+    
+    async def get_by_ids(self, semester_ids: List[int], include_study_phases: bool = False) -> List[Dict[str, Any]]:
+        """Get semesters by IDs, optionally embedding their study phases in the same query."""
+        try:
+            columns = "*, study_phases(*)" if include_study_phases else "*"
+            response = await (self.supabase.table(self.table_name)
+                       .select(columns)
+                       .in_("id", semester_ids)
+                       .order("id")
+                       .execute())
+            
+            return response.data or []
+        except Exception:
+            logger.exception("Error getting semesters by IDs")
+            return []
 
 
 class StudyPhaseRepository(BaseRepository[StudyPhase]):
     """Repository for StudyPhase operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "study_phases", StudyPhase)
     
     async def get_by_semester(self, semester_id: int) -> List[StudyPhase]:
@@ -219,7 +240,7 @@ class StudyPhaseRepository(BaseRepository[StudyPhase]):
             from datetime import date
             today = date.today()
             
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .lte("start_date", today.isoformat())
                        .gte("end_date", today.isoformat())
@@ -228,15 +249,15 @@ class StudyPhaseRepository(BaseRepository[StudyPhase]):
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting current study phase: {e}")
+        except Exception:
+            logger.exception("Error getting current study phase")
             return None
 
 
 class AcademicRepository:
     """Aggregate repository for all academic operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
         self.faculty_repo = FacultyRepository(supabase)
         self.department_repo = DepartmentRepository(supabase)
@@ -286,4 +307,45 @@ class AcademicRepository:
                 return cohort
         return None
     
+    # Name lookups for bulk imports
+    async def _ids_by_name(self, repository: BaseRepository) -> Dict[str, int]:
+        """Map every record name in a repository's table to its ID, reading only those two columns.
+        
+        Pages are requested until one comes back empty, so a server-side row cap
+        (PostgREST max-rows) can shorten a page but never cut the mapping short.
+        """
+        try:
+            ids = {}
+            offset = 0
+            while True:
+                response = await (self.supabase.table(repository.table_name)
+                                  .select("id,name")
+                                  .order("id")
+                                  .range(offset, offset + NAME_LOOKUP_PAGE_SIZE - 1)
+                                  .execute())
+                rows = response.data or []
+                if not rows:
+                    return ids
+                ids.update((row["name"], row["id"]) for row in rows)
+                offset += len(rows)
+        except Exception:
+            logger.exception("Error getting %s IDs by name", repository.table_name)
+            return {}
+    
+    async def get_faculty_ids_by_name(self) -> Dict[str, int]:
+        """Get all faculty IDs keyed by faculty name."""
+        return await self._ids_by_name(self.faculty_repo)
+    
+    async def get_department_ids_by_name(self) -> Dict[str, int]:
+        """Get all department IDs keyed by department name."""
+        return await self._ids_by_name(self.department_repo)
+    
+    async def get_major_ids_by_name(self) -> Dict[str, int]:
+        """Get all major IDs keyed by major name."""
+        return await self._ids_by_name(self.major_repo)
+    
+    async def get_cohort_ids_by_name(self) -> Dict[str, int]:
+        """Get all cohort IDs keyed by cohort name."""
+        return await self._ids_by_name(self.cohort_repo)
+    
     # Other methods can be added as needed
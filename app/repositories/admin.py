@@ -1,22 +1,30 @@
+import logging
 from typing import Optional
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Admin
 from app.repositories.base import BaseRepository
 
+logger = logging.getLogger(__name__)
+
 
 class AdminRepository(BaseRepository[Admin]):
     """Repository for Admin operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "admins", Admin)
     
     async def get_by_auth_id(self, auth_id: str) -> Optional[Admin]:
         """Get admin by auth ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("auth_id", auth_id).execute()
-            if response.data:
-                return self.model_class(**response.data[0])
+            response = await (self.supabase.table(self.table_name)
+                       .select("*")
+                       .eq("auth_id", auth_id)
+                       .maybe_single()
+                       .execute())
+            # maybe_single() yields no response at all when nothing matches
+            if response and response.data:
+                return self.model_class(**response.data)
             return None
-        except Exception as e:
-            print(f"Error getting admin by auth ID: {e}")
+        except Exception:
+            logger.exception("Error getting admin by auth ID")
             return None
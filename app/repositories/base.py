@@ -1,15 +1,44 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, TypeVar, Generic, Type
-from supabase import Client
+from typing import Dict, List, Optional, Any, TypeVar, Generic, Type, Tuple, AsyncIterator
+import base64
+from datetime import datetime
+import json
+from supabase import AsyncClient
 from pydantic import BaseModel
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T', bound=BaseModel)
 
+# Exact table row counts, which cost a full scan, reused across requests for a short while
+_count_cache = TTLCache(maxsize=256, ttl=30)
+
+
+def encode_cursor(created_at: str, record_id: int) -> str:
+    """Encode a keyset position as an opaque cursor."""
+    payload = json.dumps({"created_at": created_at, "id": record_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode an opaque cursor into its (created_at, id) keyset position.
+    
+    created_at is parsed and re-serialized, so only a well-formed timestamp
+    ever reaches the PostgREST filter string.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["created_at"]).isoformat(), int(payload["id"])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+
 
 class BaseRepository(ABC, Generic[T]):
     """Base repository class with common CRUD operations."""
     
-    def __init__(self, supabase: Client, table_name: str, model_class: Type[T]):
+    def __init__(self, supabase: AsyncClient, table_name: str, model_class: Type[T]):
         self.supabase = supabase
         self.table_name = table_name
         self.model_class = model_class
@@ -19,23 +48,33 @@ class BaseRepository(ABC, Generic[T]):
         try:
             # Convert date/datetime objects to ISO format strings
             serialized_data = self._serialize_data(data)
-            print(f"Creating record in {self.table_name} with serialized data: {serialized_data}")
+            logger.debug("Creating record in %s with serialized data: %s", self.table_name, serialized_data)
             
-            response = self.supabase.table(self.table_name).insert(serialized_data).execute()
-            print(f"Supabase response: {response}")
+            response = await self.supabase.table(self.table_name).insert(serialized_data).execute()
+            logger.debug("Supabase response: %s", response)
             
             if response.data:
-                print(f"Successfully created record: {response.data[0]}")
+                logger.debug("Successfully created record: %s", response.data[0])
                 return self.model_class(**response.data[0])
             else:
-                print(f"No data returned from insert operation")
+                logger.warning("No data returned from insert operation")
                 return None
-        except Exception as e:
-            print(f"Error creating {self.table_name}: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error creating %s", self.table_name)
             return None
     
+    async def create_many(self, rows: List[Dict[str, Any]]) -> List[T]:
+        """Create several records with a single insert."""
+        if not rows:
+            return []
+        try:
+            serialized_rows = [self._serialize_data(row) for row in rows]
+            response = await self.supabase.table(self.table_name).insert(serialized_rows).execute()
+            return [self.model_class(**item) for item in response.data] if response.data else []
+        except Exception:
+            logger.exception("Error bulk creating %s", self.table_name)
+            return []
+    
     def _serialize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Serialize data to be JSON compatible."""
         from datetime import date, datetime, time
@@ -56,38 +95,134 @@ class BaseRepository(ABC, Generic[T]):
     async def get_by_id(self, record_id: int) -> Optional[T]:
         """Get a record by ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("id", record_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("id", record_id).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting {self.table_name} by ID: {e}")
+        except Exception:
+            logger.exception("Error getting %s by ID", self.table_name)
             return None
     
-    async def get_all(self, page: int = 1, limit: int = 10) -> Dict[str, Any]:
-        """Get all records with pagination."""
+    async def get_updated_at(self, record_id: int) -> Optional[datetime]:
+        """Get only a record's last update time, for cheap freshness checks."""
+        try:
+            response = await self.supabase.table(self.table_name).select("updated_at").eq("id", record_id).execute()
+            if response.data and response.data[0].get("updated_at"):
+                return datetime.fromisoformat(response.data[0]["updated_at"])
+            return None
+        except Exception:
+            logger.exception("Error getting %s update time", self.table_name)
+            return None
+    
+    async def get_all(self, page: int = 1, limit: int = 10, include_total: bool = False) -> Dict[str, Any]:
+        """Get all records with pagination.
+        
+        The exact row count is only computed when include_total is set, and
+        is then cached briefly per table.
+        """
         try:
             offset = (page - 1) * limit
+            total = _count_cache.get(self.table_name) if include_total else None
             
-            # Get total count
-            count_response = self.supabase.table(self.table_name).select("*", count="exact").execute()
-            total = count_response.count if count_response.count else 0
-            
-            # Get paginated data
-            response = self.supabase.table(self.table_name).select("*").range(offset, offset + limit - 1).execute()
+            # Fetch one extra row to know whether another page exists; count in the same request if needed
+            count = "exact" if include_total and total is None else None
+            response = await (self.supabase.table(self.table_name)
+                              .select("*", count=count)
+                              .range(offset, offset + limit)
+                              .execute())
+            rows = response.data or []
             
-            items = [self.model_class(**item) for item in response.data] if response.data else []
+            if count:
+                total = response.count or 0
+                _count_cache.set(self.table_name, total)
             
             return {
-                "items": items,
+                "items": [self.model_class(**item) for item in rows[:limit]],
                 "total": total,
                 "page": page,
                 "limit": limit,
-                "total_pages": (total + limit - 1) // limit
+                "total_pages": (total + limit - 1) // limit if total is not None else None,
+                "has_more": len(rows) > limit
             }
-        except Exception as e:
-            print(f"Error getting all {self.table_name}: {e}")
-            return {"items": [], "total": 0, "page": page, "limit": limit, "total_pages": 0}
+        except Exception:
+            logger.exception("Error getting all %s", self.table_name)
+            return {"items": [], "total": 0 if include_total else None, "page": page, "limit": limit,
+                    "total_pages": 0 if include_total else None, "has_more": False}
+    
+    def _columns(self, fields: Optional[List[str]]) -> str:
+        """Build a PostgREST select list from model field names, keeping the keyset columns."""
+        if not fields:
+            return "*"
+        unknown = set(fields) - self.model_class.model_fields.keys()
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return ",".join(dict.fromkeys([*fields, "id", "created_at"]))
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 10,
+                       filters: Optional[Dict[str, Any]] = None,
+                       fields: Optional[List[str]] = None,
+                       search: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Get records newest first using keyset pagination on (created_at, id).
+        
+        When fields is given only those columns are fetched and items are plain dicts.
+        search maps columns to substrings matched case-insensitively. Query
+        errors propagate, so a failure is never mistaken for the end of the data.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        columns = self._columns(fields)
+        query = (self.supabase.table(self.table_name)
+                 .select(columns)
+                 .order("created_at", desc=True)
+                 .order("id", desc=True))
+        
+        for field, value in (filters or {}).items():
+            query = query.eq(field, value)
+        
+        for field, value in (search or {}).items():
+            query = query.ilike(field, f"%{value}%")
+        
+        if position:
+            created_at, last_id = position
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{last_id})'
+            )
+        
+        # Fetch one extra row to know whether another page exists
+        response = await query.limit(limit + 1).execute()
+        rows = response.data or []
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        
+        return {
+            "items": rows if fields else [self.model_class(**item) for item in rows],
+            "limit": limit,
+            "next_cursor": next_cursor
+        }
+    
+    async def iter_all(self, filters: Optional[Dict[str, Any]] = None,
+                       batch_size: int = 1000) -> AsyncIterator[T]:
+        """Iterate over all matching records, fetching one keyset page at a time.
+        
+        Pages are requested until one comes back empty rather than trusting
+        next_cursor alone: a server-side row cap (PostgREST max-rows) can drop
+        the extra row get_page uses to detect another page.
+        """
+        cursor = None
+        while True:
+            result = await self.get_page(cursor, batch_size, filters)
+            items = result["items"]
+            if not items:
+                break
+        
+            for item in items:
+                yield item
+        
+            last = items[-1]
+            cursor = result["next_cursor"] or encode_cursor(last.created_at.isoformat(), last.id)
     
     async def update(self, record_id: int, data: Dict[str, Any]) -> Optional[T]:
         """Update a record by ID."""
@@ -98,37 +233,37 @@ class BaseRepository(ABC, Generic[T]):
                 return await self.get_by_id(record_id)
             
             serialized_data = self._serialize_data(update_data)
-            response = self.supabase.table(self.table_name).update(serialized_data).eq("id", record_id).execute()
+            response = await self.supabase.table(self.table_name).update(serialized_data).eq("id", record_id).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error updating {self.table_name}: {e}")
+        except Exception:
+            logger.exception("Error updating %s", self.table_name)
             return None
     
     async def delete(self, record_id: int) -> bool:
         """Delete a record by ID."""
         try:
-            response = self.supabase.table(self.table_name).delete().eq("id", record_id).execute()
+            response = await self.supabase.table(self.table_name).delete().eq("id", record_id).execute()
             return response.data is not None
-        except Exception as e:
-            print(f"Error deleting {self.table_name}: {e}")
+        except Exception:
+            logger.exception("Error deleting %s", self.table_name)
             return False
     
     async def find_by_field(self, field: str, value: Any) -> List[T]:
         """Find records by a specific field value."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq(field, value).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq(field, value).execute()
             return [self.model_class(**item) for item in response.data] if response.data else []
-        except Exception as e:
-            print(f"Error finding {self.table_name} by {field}: {e}")
+        except Exception:
+            logger.exception("Error finding %s by %s", self.table_name, field)
             return []
     
     async def exists(self, record_id: int) -> bool:
         """Check if a record exists by ID."""
         try:
-            response = self.supabase.table(self.table_name).select("id").eq("id", record_id).execute()
+            response = await self.supabase.table(self.table_name).select("id").eq("id", record_id).execute()
             return len(response.data) > 0 if response.data else False
-        except Exception as e:
-            print(f"Error checking if {self.table_name} exists: {e}")
+        except Exception:
+            logger.exception("Error checking if %s exists", self.table_name)
             return False
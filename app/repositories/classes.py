@@ -1,36 +1,39 @@
+import logging
 from typing import Optional, List, Dict, Any
 from datetime import date, datetime
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Class, TeachingSession, Attendance, ClassStudent
 from app.repositories.base import BaseRepository
 
+logger = logging.getLogger(__name__)
+
 
 class ClassRepository(BaseRepository[Class]):
     """Repository for Class operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "classes", Class)
     
     async def get_by_code(self, code: str) -> Optional[Class]:
         """Get class by code."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("code", code).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("code", code).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting class by code: {e}")
+        except Exception:
+            logger.exception("Error getting class by code")
             return None
     
     async def get_by_name(self, name: str) -> Optional[Class]:
         """Get class by name."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("name", name).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("name", name).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting class by name: {e}")
+        except Exception:
+            logger.exception("Error getting class by name")
             return None
     
     async def get_by_teacher(self, teacher_id: int) -> List[Class]:
@@ -45,130 +48,72 @@ class ClassRepository(BaseRepository[Class]):
         """Get all active classes."""
         return await self.find_by_field("status", "active")
     
-    async def get_classes_with_details(self, page: int = 1, limit: int = 10, filters: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Get classes with joined data and student count."""
+    async def get_classes_with_details(self, cursor: Optional[str] = None, limit: int = 10,
+                                       filters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Get active classes newest first with joined data and student count."""
+        # Active classes only, narrowed by any FK filters
+        result = await self.get_page(cursor, limit, {"status": "active", **(filters or {})})
         try:
-            # Use the fallback method which works with standard Supabase queries
-            return await self._get_classes_with_details_fallback(page, limit, filters)
-            
-        except Exception as e:
-            print(f"Error getting classes with details: {e}")
-            # Ultimate fallback to basic method
-            return await self.get_all(page, limit)
+            result["items"] = await self._add_class_details(result["items"])
+        except Exception:
+            logger.exception("Error getting classes with details")
+            result["items"] = [cls.model_dump() for cls in result["items"]]
+        return result
     
-    async def _get_classes_with_details_fallback(self, page: int, limit: int, filters: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Fallback method using separate queries with comprehensive filtering."""
-        try:
-            # Build query with filters
-            offset = (page - 1) * limit
-            
-            # Start with base query
-            query = self.supabase.table(self.table_name).select("*", count="exact")
-            
-            # Add filters
-            query = query.eq("status", "active")  # Default filter for active classes
-            
-            if filters:
-                if filters.get("teacher_id"):
-                    query = query.eq("teacher_id", filters["teacher_id"])
-                if filters.get("subject_id"):
-                    query = query.eq("subject_id", filters["subject_id"])
-                if filters.get("semester_id"):
-                    query = query.eq("semester_id", filters["semester_id"])
-                if filters.get("faculty_id"):
-                    query = query.eq("faculty_id", filters["faculty_id"])
-                if filters.get("department_id"):
-                    query = query.eq("department_id", filters["department_id"])
-                if filters.get("major_id"):
-                    query = query.eq("major_id", filters["major_id"])
-                if filters.get("cohort_id"):
-                    query = query.eq("cohort_id", filters["cohort_id"])
-                if filters.get("academic_year_id"):
-                    query = query.eq("academic_year_id", filters["academic_year_id"])
-                if filters.get("study_phase_id"):
-                    query = query.eq("study_phase_id", filters["study_phase_id"])
-            
-            # Execute query with pagination
-            response = query.range(offset, offset + limit - 1).execute()
-            
-            if not response.data:
-                return {
-                    "items": [],
-                    "total": 0,
-                    "page": page,
-                    "limit": limit,
-                    "total_pages": 0
-                }
-            
-            # Get total count
-            total = response.count if response.count else 0
-            
-            # Convert to model instances
-            classes = [self.model_class(**item) for item in response.data]
-            
-            # Enhance each class with related data
-            enhanced_classes = []
-            for cls in classes:
-                class_dict = cls.model_dump()
-                
-                # Get related data from other tables
-                if cls.faculty_id:
-                    faculty_response = self.supabase.table("faculties").select("name").eq("id", cls.faculty_id).execute()
-                    class_dict["faculty_name"] = faculty_response.data[0]["name"] if faculty_response.data else None
-                
-                if cls.department_id:
-                    dept_response = self.supabase.table("departments").select("name").eq("id", cls.department_id).execute()
-                    class_dict["department_name"] = dept_response.data[0]["name"] if dept_response.data else None
-                
-                if cls.major_id:
-                    major_response = self.supabase.table("majors").select("name").eq("id", cls.major_id).execute()
-                    class_dict["major_name"] = major_response.data[0]["name"] if major_response.data else None
-                
-                if cls.subject_id:
-                    subject_response = self.supabase.table("subjects").select("name, code").eq("id", cls.subject_id).execute()
-                    if subject_response.data:
-                        class_dict["subject_name"] = subject_response.data[0]["name"]
-                        class_dict["subject_code"] = subject_response.data[0]["code"]
-                
-                if cls.teacher_id:
-                    teacher_response = self.supabase.table("teachers").select("full_name, teacher_code").eq("id", cls.teacher_id).execute()
-                    if teacher_response.data:
-                        class_dict["teacher_name"] = teacher_response.data[0]["full_name"]
-                        class_dict["teacher_code"] = teacher_response.data[0]["teacher_code"]
-                
-                if cls.cohort_id:
-                    cohort_response = self.supabase.table("cohorts").select("name").eq("id", cls.cohort_id).execute()
-                    class_dict["cohort_name"] = cohort_response.data[0]["name"] if cohort_response.data else None
-                
-                if cls.academic_year_id:
-                    ay_response = self.supabase.table("academic_years").select("name").eq("id", cls.academic_year_id).execute()
-                    class_dict["academic_year_name"] = ay_response.data[0]["name"] if ay_response.data else None
-                
-                if cls.semester_id:
-                    sem_response = self.supabase.table("semesters").select("name").eq("id", cls.semester_id).execute()
-                    class_dict["semester_name"] = sem_response.data[0]["name"] if sem_response.data else None
-                
-                if cls.study_phase_id:
-                    sp_response = self.supabase.table("study_phases").select("name").eq("id", cls.study_phase_id).execute()
-                    class_dict["study_phase_name"] = sp_response.data[0]["name"] if sp_response.data else None
-                
-                # Get student count
-                student_count_response = self.supabase.table("class_students").select("id").eq("class_id", cls.id).eq("status", "active").execute()
-                class_dict["student_count"] = len(student_count_response.data) if student_count_response.data else 0
-                
-                enhanced_classes.append(class_dict)
-            
-            return {
-                "items": enhanced_classes,
-                "total": total,
-                "page": page,
-                "limit": limit,
-                "total_pages": (total + limit - 1) // limit
-            }
-            
-        except Exception as e:
-            print(f"Error in fallback method: {e}")
-            return await self.get_all(page, limit)
+    async def _add_class_details(self, classes: List[Class]) -> List[Dict[str, Any]]:
+        """Add related names and the active student count to each class."""
+        enhanced_classes = []
+        for cls in classes:
+            class_dict = cls.model_dump()
+            
+            # Get related data from other tables
+            if cls.faculty_id:
+                faculty_response = await self.supabase.table("faculties").select("name").eq("id", cls.faculty_id).execute()
+                class_dict["faculty_name"] = faculty_response.data[0]["name"] if faculty_response.data else None
+            
+            if cls.department_id:
+                dept_response = await self.supabase.table("departments").select("name").eq("id", cls.department_id).execute()
+                class_dict["department_name"] = dept_response.data[0]["name"] if dept_response.data else None
+            
+            if cls.major_id:
+                major_response = await self.supabase.table("majors").select("name").eq("id", cls.major_id).execute()
+                class_dict["major_name"] = major_response.data[0]["name"] if major_response.data else None
+            
+            if cls.subject_id:
+                subject_response = await self.supabase.table("subjects").select("name, code").eq("id", cls.subject_id).execute()
+                if subject_response.data:
+                    class_dict["subject_name"] = subject_response.data[0]["name"]
+                    class_dict["subject_code"] = subject_response.data[0]["code"]
+            
+            if cls.teacher_id:
+                teacher_response = await self.supabase.table("teachers").select("full_name, teacher_code").eq("id", cls.teacher_id).execute()
+                if teacher_response.data:
+                    class_dict["teacher_name"] = teacher_response.data[0]["full_name"]
+                    class_dict["teacher_code"] = teacher_response.data[0]["teacher_code"]
+            
+            if cls.cohort_id:
+                cohort_response = await self.supabase.table("cohorts").select("name").eq("id", cls.cohort_id).execute()
+                class_dict["cohort_name"] = cohort_response.data[0]["name"] if cohort_response.data else None
+            
+            if cls.academic_year_id:
+                ay_response = await self.supabase.table("academic_years").select("name").eq("id", cls.academic_year_id).execute()
+                class_dict["academic_year_name"] = ay_response.data[0]["name"] if ay_response.data else None
+            
+            if cls.semester_id:
+                sem_response = await self.supabase.table("semesters").select("name").eq("id", cls.semester_id).execute()
+                class_dict["semester_name"] = sem_response.data[0]["name"] if sem_response.data else None
+            
+            if cls.study_phase_id:
+                sp_response = await self.supabase.table("study_phases").select("name").eq("id", cls.study_phase_id).execute()
+                class_dict["study_phase_name"] = sp_response.data[0]["name"] if sp_response.data else None
+            
+            # Get student count
+            student_count_response = await self.supabase.table("class_students").select("id").eq("class_id", cls.id).eq("status", "active").execute()
+            class_dict["student_count"] = len(student_count_response.data) if student_count_response.data else 0
+            
+            enhanced_classes.append(class_dict)
+        
+        return enhanced_classes
     
     async def get_class_by_name(self, name: str) -> Optional[Class]:
         """Get class by name."""
@@ -178,7 +123,7 @@ class ClassRepository(BaseRepository[Class]):
 class TeachingSessionRepository(BaseRepository[TeachingSession]):
     """Repository for Teaching Session operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "teaching_sessions", TeachingSession)
     
     async def get_by_class(self, class_id: int) -> List[TeachingSession]:
@@ -188,28 +133,28 @@ class TeachingSessionRepository(BaseRepository[TeachingSession]):
     async def get_by_date(self, session_date: date) -> List[TeachingSession]:
         """Get teaching sessions by date."""
         try:
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .eq("session_date", session_date.isoformat())
                        .execute())
             
             return [self.model_class(**item) for item in response.data] if response.data else []
-        except Exception as e:
-            print(f"Error getting teaching sessions by date: {e}")
+        except Exception:
+            logger.exception("Error getting teaching sessions by date")
             return []
     
     async def get_by_class_and_date(self, class_id: int, session_date: date) -> List[TeachingSession]:
         """Get teaching sessions by class and date."""
         try:
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .eq("class_id", class_id)
                        .eq("session_date", session_date.isoformat())
                        .execute())
             
             return [self.model_class(**item) for item in response.data] if response.data else []
-        except Exception as e:
-            print(f"Error getting teaching sessions by class and date: {e}")
+        except Exception:
+            logger.exception("Error getting teaching sessions by class and date")
             return []
     
     async def get_open_sessions(self) -> List[TeachingSession]:
@@ -219,7 +164,7 @@ class TeachingSessionRepository(BaseRepository[TeachingSession]):
     async def update_qr_code(self, session_id: int, qr_code: str, expired_at: datetime) -> Optional[TeachingSession]:
         """Update QR code for a session."""
         try:
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .update({
                            "qr_code": qr_code,
                            "qr_expired_at": expired_at.isoformat()
@@ -230,15 +175,34 @@ class TeachingSessionRepository(BaseRepository[TeachingSession]):
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error updating QR code: {e}")
+        except Exception:
+            logger.exception("Error updating QR code")
+            return None
+    
+    async def set_qr_code_if_missing(self, session_id: int, qr_code: str, expired_at: datetime) -> Optional[TeachingSession]:
+        """Set a session's QR code only if it has none; returns the session when it was set."""
+        try:
+            response = await (self.supabase.table(self.table_name)
+                       .update({
+                           "qr_code": qr_code,
+                           "qr_expired_at": expired_at.isoformat()
+                       })
+                       .eq("id", session_id)
+                       .is_("qr_code", "null")
+                       .execute())
+            
+            if response.data:
+                return self.model_class(**response.data[0])
+            return None
+        except Exception:
+            logger.exception("Error setting missing QR code")
             return None
 
 
 class AttendanceRepository(BaseRepository[Attendance]):
     """Repository for Attendance operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "attendances", Attendance)
     
     async def get_by_session(self, session_id: int) -> List[Attendance]:
@@ -248,60 +212,31 @@ class AttendanceRepository(BaseRepository[Attendance]):
     async def get_session_attendance_with_details(self, session_id: int) -> List[Dict[str, Any]]:
         """Get attendance for a session with detailed joined information."""
         try:
-            # Get attendance records for the session
-            attendance_response = (self.supabase.table(self.table_name)
-                                 .select("*")
+            # Get attendance records with their student rows embedded, and the session with
+            # its class, subject and teacher embedded: two queries instead of one per record
+            attendance_response = await (self.supabase.table(self.table_name)
+                                 .select("*, student:students(full_name, student_code, phone, hometown, class_name)")
                                  .eq("session_id", session_id)
                                  .execute())
             
             if not attendance_response.data:
                 return []
             
-            # Get session details
-            session_response = (self.supabase.table("teaching_sessions")
-                              .select("*")
+            session_response = await (self.supabase.table("teaching_sessions")
+                              .select("*, class:classes(id, name, code, "
+                                      "subject:subjects(name, code), teacher:teachers(full_name, teacher_code))")
                               .eq("id", session_id)
                               .execute())
             
             session_data = session_response.data[0] if session_response.data else {}
-            class_id = session_data.get("class_id")
-            
-            # Get class details
-            class_response = (self.supabase.table("classes")
-                            .select("*")
-                            .eq("id", class_id)
-                            .execute()) if class_id else None
-            
-            class_data = class_response.data[0] if class_response and class_response.data else {}
-            
-            # Get subject details
-            subject_data = {}
-            if class_data.get("subject_id"):
-                subject_response = (self.supabase.table("subjects")
-                                  .select("name, code")
-                                  .eq("id", class_data["subject_id"])
-                                  .execute())
-                subject_data = subject_response.data[0] if subject_response.data else {}
-            
-            # Get teacher details
-            teacher_data = {}
-            if class_data.get("teacher_id"):
-                teacher_response = (self.supabase.table("teachers")
-                                  .select("full_name, teacher_code")
-                                  .eq("id", class_data["teacher_id"])
-                                  .execute())
-                teacher_data = teacher_response.data[0] if teacher_response.data else {}
+            class_data = session_data.get("class") or {}
+            subject_data = class_data.get("subject") or {}
+            teacher_data = class_data.get("teacher") or {}
             
             # Process each attendance record
             result = []
             for attendance in attendance_response.data:
-                # Get student details
-                student_response = (self.supabase.table("students")
-                                  .select("full_name, student_code, phone, hometown, class_name")
-                                  .eq("id", attendance["student_id"])
-                                  .execute())
-                
-                student_data = student_response.data[0] if student_response.data else {}
+                student_data = attendance.pop("student", None) or {}
                 
                 # Combine all data
                 detailed_attendance = {
@@ -335,15 +270,15 @@ class AttendanceRepository(BaseRepository[Attendance]):
             
             return result
             
-        except Exception as e:
-            print(f"Error getting session attendance with details: {e}")
+        except Exception:
+            logger.exception("Error getting session attendance with details")
             return []
     
     async def get_session_student_attendance_with_details(self, session_id: int, student_id: int) -> List[Dict[str, Any]]:
         """Get attendance for a specific student in a session with detailed joined information."""
         try:
             # Get attendance records for the specific student in the session
-            attendance_response = (self.supabase.table(self.table_name)
+            attendance_response = await (self.supabase.table(self.table_name)
                                  .select("*")
                                  .eq("session_id", session_id)
                                  .eq("student_id", student_id)
@@ -353,7 +288,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
                 return []
             
             # Get session details
-            session_response = (self.supabase.table("teaching_sessions")
+            session_response = await (self.supabase.table("teaching_sessions")
                               .select("*")
                               .eq("id", session_id)
                               .execute())
@@ -362,7 +297,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             class_id = session_data.get("class_id")
             
             # Get class details
-            class_response = (self.supabase.table("classes")
+            class_response = await (self.supabase.table("classes")
                             .select("*")
                             .eq("id", class_id)
                             .execute()) if class_id else None
@@ -372,7 +307,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get subject details
             subject_data = {}
             if class_data.get("subject_id"):
-                subject_response = (self.supabase.table("subjects")
+                subject_response = await (self.supabase.table("subjects")
                                   .select("name, code")
                                   .eq("id", class_data["subject_id"])
                                   .execute())
@@ -381,14 +316,14 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get teacher details
             teacher_data = {}
             if class_data.get("teacher_id"):
-                teacher_response = (self.supabase.table("teachers")
+                teacher_response = await (self.supabase.table("teachers")
                                   .select("full_name, teacher_code")
                                   .eq("id", class_data["teacher_id"])
                                   .execute())
                 teacher_data = teacher_response.data[0] if teacher_response.data else {}
             
             # Get student details
-            student_response = (self.supabase.table("students")
+            student_response = await (self.supabase.table("students")
                               .select("full_name, student_code, phone, hometown, class_name")
                               .eq("id", student_id)
                               .execute())
@@ -398,7 +333,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get faculty details
             faculty_data = {}
             if class_data.get("faculty_id"):
-                faculty_response = (self.supabase.table("faculties")
+                faculty_response = await (self.supabase.table("faculties")
                                   .select("name")
                                   .eq("id", class_data["faculty_id"])
                                   .execute())
@@ -407,7 +342,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get department details
             department_data = {}
             if class_data.get("department_id"):
-                department_response = (self.supabase.table("departments")
+                department_response = await (self.supabase.table("departments")
                                      .select("name")
                                      .eq("id", class_data["department_id"])
                                      .execute())
@@ -416,7 +351,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get major details
             major_data = {}
             if class_data.get("major_id"):
-                major_response = (self.supabase.table("majors")
+                major_response = await (self.supabase.table("majors")
                                 .select("name")
                                 .eq("id", class_data["major_id"])
                                 .execute())
@@ -425,7 +360,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get cohort details
             cohort_data = {}
             if class_data.get("cohort_id"):
-                cohort_response = (self.supabase.table("cohorts")
+                cohort_response = await (self.supabase.table("cohorts")
                                  .select("name")
                                  .eq("id", class_data["cohort_id"])
                                  .execute())
@@ -434,7 +369,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get academic year details
             academic_year_data = {}
             if class_data.get("academic_year_id"):
-                academic_year_response = (self.supabase.table("academic_years")
+                academic_year_response = await (self.supabase.table("academic_years")
                                         .select("name")
                                         .eq("id", class_data["academic_year_id"])
                                         .execute())
@@ -443,7 +378,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get semester details
             semester_data = {}
             if class_data.get("semester_id"):
-                semester_response = (self.supabase.table("semesters")
+                semester_response = await (self.supabase.table("semesters")
                                    .select("name")
                                    .eq("id", class_data["semester_id"])
                                    .execute())
@@ -452,7 +387,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
             # Get study phase details
             study_phase_data = {}
             if class_data.get("study_phase_id"):
-                study_phase_response = (self.supabase.table("study_phases")
+                study_phase_response = await (self.supabase.table("study_phases")
                                       .select("name")
                                       .eq("id", class_data["study_phase_id"])
                                       .execute())
@@ -501,8 +436,8 @@ class AttendanceRepository(BaseRepository[Attendance]):
             
             return result
             
-        except Exception as e:
-            print(f"Error getting session student attendance with details: {e}")
+        except Exception:
+            logger.exception("Error getting session student attendance with details")
             return []
     
     async def get_by_student(self, student_id: int) -> List[Attendance]:
@@ -512,7 +447,7 @@ class AttendanceRepository(BaseRepository[Attendance]):
     async def get_by_session_and_student(self, session_id: int, student_id: int) -> Optional[Attendance]:
         """Get attendance by session and student."""
         try:
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .eq("session_id", session_id)
                        .eq("student_id", student_id)
@@ -521,10 +456,63 @@ class AttendanceRepository(BaseRepository[Attendance]):
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting attendance by session and student: {e}")
+        except Exception:
+            logger.exception("Error getting attendance by session and student")
             return None
     
+    async def mark_by_qr(self, session_id: int, student_id: int, qr_code: str,
+                         ip_address: str = None, user_agent: str = None) -> Optional[Attendance]:
+        """Validate a QR code and record attendance in one round-trip via the mark_attendance_by_qr function."""
+        try:
+            response = await self.supabase.rpc("mark_attendance_by_qr", {
+                "p_session_id": session_id,
+                "p_student_id": student_id,
+                "p_qr_code": qr_code,
+                "p_ip_address": ip_address,
+                "p_user_agent": user_agent
+            }).execute()
+            
+            if response.data:
+                return self.model_class(**response.data[0])
+            return None
+        except Exception:
+            logger.exception("Error marking attendance by QR")
+            return None
+    
+    async def mark_many_manual(self, session_id: int, statuses: Dict[int, str]) -> List[Attendance]:
+        """Record manual attendance for many students: one lookup, one update per status and one insert."""
+        try:
+            existing = await (self.supabase.table(self.table_name)
+                       .select("id, student_id")
+                       .eq("session_id", session_id)
+                       .in_("student_id", list(statuses))
+                       .execute())
+            existing_ids = {row["student_id"]: row["id"] for row in existing.data or []}
+            
+            # Existing records can only take one of a few statuses, so group their updates by status
+            updates: Dict[str, List[int]] = {}
+            for student_id, attendance_id in existing_ids.items():
+                updates.setdefault(statuses[student_id], []).append(attendance_id)
+            
+            attendances = []
+            for status, attendance_ids in updates.items():
+                response = await (self.supabase.table(self.table_name)
+                           .update({"status": status})
+                           .in_("id", attendance_ids)
+                           .execute())
+                attendances.extend(self.model_class(**item) for item in response.data or [])
+            
+            attendance_time = datetime.utcnow().isoformat()
+            attendances.extend(await self.create_many([
+                {"session_id": session_id, "student_id": student_id, "status": status,
+                 "attendance_time": attendance_time}
+                for student_id, status in statuses.items() if student_id not in existing_ids
+            ]))
+            return attendances
+        except Exception:
+            logger.exception("Error marking attendance in bulk")
+            return []
+    
     async def get_attendance_statistics(self, class_id: int, start_date: date, end_date: date) -> Dict[str, Any]:
         """Get attendance statistics for a class within date range."""
         try:
@@ -555,15 +543,15 @@ class AttendanceRepository(BaseRepository[Attendance]):
                 "present_count": present_count,
                 "attendance_rate": round(attendance_rate, 2)
             }
-        except Exception as e:
-            print(f"Error getting attendance statistics: {e}")
+        except Exception:
+            logger.exception("Error getting attendance statistics")
             return {"total_sessions": 0, "attendance_rate": 0}
 
 
 class ClassStudentRepository(BaseRepository[ClassStudent]):
     """Repository for Class Student operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "class_students", ClassStudent)
     
     async def get_by_class(self, class_id: int) -> List[ClassStudent]:
@@ -577,40 +565,33 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
     async def get_active_enrollments(self, class_id: int) -> List[ClassStudent]:
         """Get active enrollments for a class."""
         try:
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .select("*")
                        .eq("class_id", class_id)
                        .eq("status", "active")
                        .execute())
             
             return [self.model_class(**item) for item in response.data] if response.data else []
-        except Exception as e:
-            print(f"Error getting active enrollments: {e}")
+        except Exception:
+            logger.exception("Error getting active enrollments")
             return []
     
     async def get_class_students_with_details(self, class_id: int, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get class students with detailed student information."""
         try:
-            # Get class students
-            cs_query = self.supabase.table(self.table_name).select("*").eq("class_id", class_id)
+            # Get class students with their student rows embedded by PostgREST in one query
+            cs_query = (self.supabase.table(self.table_name)
+                        .select("*, student:students(full_name, student_code, phone, hometown, class_name)")
+                        .eq("class_id", class_id))
             if active_only:
                 cs_query = cs_query.eq("status", "active")
             
-            cs_response = cs_query.execute()
+            cs_response = await cs_query.execute()
             
-            if not cs_response.data:
-                return []
-            
-            # Get student details for each enrollment
             result = []
-            for enrollment in cs_response.data:
-                student_response = (self.supabase.table("students")
-                                  .select("full_name, student_code, phone, hometown, class_name")
-                                  .eq("id", enrollment["student_id"])
-                                  .execute())
-                
-                if student_response.data:
-                    student = student_response.data[0]
+            for enrollment in cs_response.data or []:
+                student = enrollment.pop("student", None)
+                if student:
                     result.append({
                         **enrollment,
                         "student_name": student["full_name"],
@@ -623,8 +604,8 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
             
             return result
             
-        except Exception as e:
-            print(f"Error getting class students with details: {e}")
+        except Exception:
+            logger.exception("Error getting class students with details")
             return []
     
     async def get_student_classes_with_details(self, student_id: int, active_only: bool = True) -> List[Dict[str, Any]]:
@@ -635,7 +616,7 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
             if active_only:
                 cs_query = cs_query.eq("status", "active")
             
-            cs_response = cs_query.execute()
+            cs_response = await cs_query.execute()
             
             if not cs_response.data:
                 return []
@@ -646,7 +627,7 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
                 class_id = enrollment["class_id"]
                 
                 # Get class details with joins
-                class_response = (self.supabase.table("classes")
+                class_response = await (self.supabase.table("classes")
                                 .select("*")
                                 .eq("id", class_id)
                                 .execute())
@@ -657,28 +638,28 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
                 class_data = class_response.data[0]
                 
                 # Get faculty details
-                faculty_response = (self.supabase.table("faculties")
+                faculty_response = await (self.supabase.table("faculties")
                                   .select("name")
                                   .eq("id", class_data.get("faculty_id"))
                                   .execute())
                 faculty_name = faculty_response.data[0]["name"] if faculty_response.data else None
                 
                 # Get department details
-                department_response = (self.supabase.table("departments")
+                department_response = await (self.supabase.table("departments")
                                      .select("name")
                                      .eq("id", class_data.get("department_id"))
                                      .execute())
                 department_name = department_response.data[0]["name"] if department_response.data else None
                 
                 # Get major details
-                major_response = (self.supabase.table("majors")
+                major_response = await (self.supabase.table("majors")
                                 .select("name")
                                 .eq("id", class_data.get("major_id"))
                                 .execute())
                 major_name = major_response.data[0]["name"] if major_response.data else None
                 
                 # Get subject details
-                subject_response = (self.supabase.table("subjects")
+                subject_response = await (self.supabase.table("subjects")
                                   .select("name, code")
                                   .eq("id", class_data.get("subject_id"))
                                   .execute())
@@ -686,7 +667,7 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
                 subject_code = subject_response.data[0]["code"] if subject_response.data else None
                 
                 # Get teacher details
-                teacher_response = (self.supabase.table("teachers")
+                teacher_response = await (self.supabase.table("teachers")
                                   .select("full_name, teacher_code")
                                   .eq("id", class_data.get("teacher_id"))
                                   .execute())
@@ -694,35 +675,35 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
                 teacher_code = teacher_response.data[0]["teacher_code"] if teacher_response.data else None
                 
                 # Get cohort details
-                cohort_response = (self.supabase.table("cohorts")
+                cohort_response = await (self.supabase.table("cohorts")
                                  .select("name")
                                  .eq("id", class_data.get("cohort_id"))
                                  .execute())
                 cohort_name = cohort_response.data[0]["name"] if cohort_response.data else None
                 
                 # Get academic year details
-                academic_year_response = (self.supabase.table("academic_years")
+                academic_year_response = await (self.supabase.table("academic_years")
                                         .select("name")
                                         .eq("id", class_data.get("academic_year_id"))
                                         .execute())
                 academic_year_name = academic_year_response.data[0]["name"] if academic_year_response.data else None
                 
                 # Get semester details
-                semester_response = (self.supabase.table("semesters")
+                semester_response = await (self.supabase.table("semesters")
                                    .select("name")
                                    .eq("id", class_data.get("semester_id"))
                                    .execute())
                 semester_name = semester_response.data[0]["name"] if semester_response.data else None
                 
                 # Get study phase details
-                study_phase_response = (self.supabase.table("study_phases")
+                study_phase_response = await (self.supabase.table("study_phases")
                                       .select("name")
                                       .eq("id", class_data.get("study_phase_id"))
                                       .execute())
                 study_phase_name = study_phase_response.data[0]["name"] if study_phase_response.data else None
                 
                 # Get student count for this class
-                student_count_response = (self.supabase.table(self.table_name)
+                student_count_response = await (self.supabase.table(self.table_name)
                                         .select("*", count="exact")
                                         .eq("class_id", class_id)
                                         .eq("status", "active")
@@ -752,15 +733,15 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
             
             return result
             
-        except Exception as e:
-            print(f"Error getting student classes with details: {e}")
+        except Exception:
+            logger.exception("Error getting student classes with details")
             return []
     
     async def enroll_student(self, class_id: int, student_id: int) -> Optional[ClassStudent]:
         """Enroll a student in a class."""
         try:
             # Check if already enrolled
-            existing = (self.supabase.table(self.table_name)
+            existing = await (self.supabase.table(self.table_name)
                        .select("*")
                        .eq("class_id", class_id)
                        .eq("student_id", student_id)
@@ -776,20 +757,49 @@ class ClassStudentRepository(BaseRepository[ClassStudent]):
                     "student_id": student_id,
                     "status": "active"
                 })
-        except Exception as e:
-            print(f"Error enrolling student: {e}")
+        except Exception:
+            logger.exception("Error enrolling student")
             return None
     
+    async def enroll_students(self, class_id: int, student_ids: List[int]) -> List[ClassStudent]:
+        """Enroll many students in a class: one lookup, one reactivation and one insert."""
+        try:
+            student_ids = list(dict.fromkeys(student_ids))
+            existing = await (self.supabase.table(self.table_name)
+                       .select("id, student_id")
+                       .eq("class_id", class_id)
+                       .in_("student_id", student_ids)
+                       .execute())
+            existing_ids = {row["student_id"]: row["id"] for row in existing.data or []}
+            
+            enrollments = []
+            if existing_ids:
+                # Reactivate any earlier (possibly inactive) enrollments in one update
+                response = await (self.supabase.table(self.table_name)
+                           .update({"status": "active"})
+                           .in_("id", list(existing_ids.values()))
+                           .execute())
+                enrollments.extend(self.model_class(**item) for item in response.data or [])
+            
+            enrollments.extend(await self.create_many([
+                {"class_id": class_id, "student_id": student_id, "status": "active"}
+                for student_id in student_ids if student_id not in existing_ids
+            ]))
+            return enrollments
+        except Exception:
+            logger.exception("Error enrolling students")
+            return []
+    
     async def unenroll_student(self, class_id: int, student_id: int) -> bool:
         """Unenroll a student from a class."""
         try:
-            response = (self.supabase.table(self.table_name)
+            response = await (self.supabase.table(self.table_name)
                        .update({"status": "inactive"})
                        .eq("class_id", class_id)
                        .eq("student_id", student_id)
                        .execute())
             
             return response.data is not None
-        except Exception as e:
-            print(f"Error unenrolling student: {e}")
+        except Exception:
+            logger.exception("Error unenrolling student")
             return False
@@ -1,14 +1,24 @@
+import logging
 from typing import Optional, List, Dict, Any
-from supabase import Client
-from app.models import Student, Teacher
+from supabase import AsyncClient
+from app.models import Student, Teacher, Admin
 from app.repositories.base import BaseRepository
+from app.core.cache import TTLCache
 from app.schemas.users import TeacherCreate, StudentCreate
 
+logger = logging.getLogger(__name__)
+
+# Identical name searches (type-ahead, repeated page loads) reuse results for a minute
+_search_cache = TTLCache(maxsize=1024, ttl=60)
+
 
 class UserRepository:
     """Repository for common user operations across students and teachers."""
     
-    def __init__(self, supabase: Client):
+    profile_models = {"admin": Admin, "teacher": Teacher, "student": Student}
+    profile_tables = {"admin": "admins", "teacher": "teachers", "student": "students"}
+    
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
         self.student_repo = None  # Will be initialized when needed to avoid circular import
         self.teacher_repo = None  # Will be initialized when needed to avoid circular import
@@ -29,31 +39,82 @@ class UserRepository:
         """Check if email exists in students or teachers table."""
         try:
             # Check students
-            student_response = self.supabase.table("students").select("id").eq("email", email).execute()
+            student_response = await self.supabase.table("students").select("id").eq("email", email).execute()
             if student_response.data:
                 return True
             
             # Check teachers
-            teacher_response = self.supabase.table("teachers").select("id").eq("email", email).execute()
+            teacher_response = await self.supabase.table("teachers").select("id").eq("email", email).execute()
             return bool(teacher_response.data)
-        except Exception as e:
-            print(f"Error checking email existence: {e}")
+        except Exception:
+            logger.exception("Error checking email existence")
             return False
     
+    async def get_profile_by_auth_id(self, auth_id: str, user_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get user type and profile for an auth ID in a single query.
+        
+        When user_type is given (e.g. from the token's app_metadata), only that
+        table is read; a miss falls back to the user_profiles view.
+        """
+        if user_type in self.profile_tables:
+            try:
+                response = await (self.supabase.table(self.profile_tables[user_type])
+                                 .select("*")
+                                 .eq("auth_id", auth_id)
+                                 .maybe_single()
+                                 .execute())
+                if response and response.data:
+                    return {"user_type": user_type, "profile": self.profile_models[user_type](**response.data)}
+            except Exception:
+                logger.exception("Error getting %s profile by auth ID", user_type)
+        
+        try:
+            response = await (self.supabase.table("user_profiles")
+                             .select("user_type, profile")
+                             .eq("auth_id", auth_id)
+                             .order("priority")
+                             .limit(1)
+                             .execute())
+            if not response.data:
+                return None
+            
+            row = response.data[0]
+            model_class = self.profile_models.get(row["user_type"])
+            if not model_class:
+                return None
+            return {"user_type": row["user_type"], "profile": model_class(**row["profile"])}
+        except Exception:
+            logger.exception("Error getting user profile by auth ID")
+            return None
+    
+    async def get_login_summary_by_auth_id(self, auth_id: str) -> Optional[Dict[str, Any]]:
+        """Get user type, profile ID, code and full name for an auth ID without the full row."""
+        try:
+            response = await (self.supabase.table("user_profiles")
+                             .select("user_type, profile_id, code, full_name")
+                             .eq("auth_id", auth_id)
+                             .order("priority")
+                             .limit(1)
+                             .execute())
+            return response.data[0] if response.data else None
+        except Exception:
+            logger.exception("Error getting login summary by auth ID")
+            return None
+    
     async def check_student_code_exists(self, student_code: str) -> bool:
         """Check if student code exists."""
         try:
-            response = self.supabase.table("students").select("id").eq("student_code", student_code).execute()
+            response = await self.supabase.table("students").select("id").eq("student_code", student_code).execute()
             return bool(response.data)
-        except Exception as e:
-            print(f"Error checking student code existence: {e}")
+        except Exception:
+            logger.exception("Error checking student code existence")
             return False
 
 
 class StudentRepository(BaseRepository[Student]):
     """Repository for Student operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "students", Student)
     
     async def _add_emails_to_students(self, students_data: List[Dict]) -> List[Student]:
@@ -71,114 +132,94 @@ class StudentRepository(BaseRepository[Student]):
     async def get_by_id(self, record_id: int) -> Optional[Student]:
         """Get student by ID with email from the email column."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("id", record_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("id", record_id).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting student by ID: {e}")
+        except Exception:
+            logger.exception("Error getting student by ID")
             return None
 
-    async def get_all(self, page: int = 1, limit: int = 10) -> Dict[str, Any]:
-        """Get all students with pagination."""
-        try:
-            offset = (page - 1) * limit
-            
-            # Get total count
-            count_response = self.supabase.table(self.table_name).select("*", count="exact").execute()
-            total = count_response.count if count_response.count else 0
-            
-            # Get paginated student data
-            response = self.supabase.table(self.table_name).select("*").range(offset, offset + limit - 1).execute()
-            
-            items = []
-            if response.data:
-                for item in response.data:
-                    items.append(self.model_class(**item))
-            
-            return {
-                "items": items,
-                "total": total,
-                "page": page,
-                "limit": limit,
-                "total_pages": (total + limit - 1) // limit
-            }
-        except Exception as e:
-            print(f"Error getting all students: {e}")
-            return {"items": [], "total": 0, "page": page, "limit": limit, "total_pages": 0}
-
     async def get_by_student_code(self, student_code: str) -> Optional[Student]:
         """Get student by student code."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("student_code", student_code).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("student_code", student_code).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting student by code: {e}")
+        except Exception:
+            logger.exception("Error getting student by code")
             return None
     
     async def get_by_auth_id(self, auth_id: str) -> Optional[Student]:
         """Get student by auth ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("auth_id", auth_id).execute()
-            if response.data:
-                return self.model_class(**response.data[0])
+            response = await (self.supabase.table(self.table_name)
+                       .select("*")
+                       .eq("auth_id", auth_id)
+                       .maybe_single()
+                       .execute())
+            # maybe_single() yields no response at all when nothing matches
+            if response and response.data:
+                return self.model_class(**response.data)
             return None
-        except Exception as e:
-            print(f"Error getting student by auth ID: {e}")
+        except Exception:
+            logger.exception("Error getting student by auth ID")
             return None
     
     async def get_by_faculty(self, faculty_id: int) -> List[Student]:
         """Get students by faculty ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("faculty_id", faculty_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("faculty_id", faculty_id).execute()
             return await self._add_emails_to_students(response.data or [])
-        except Exception as e:
-            print(f"Error getting students by faculty: {e}")
+        except Exception:
+            logger.exception("Error getting students by faculty")
             return []
     
     async def get_by_major(self, major_id: int) -> List[Student]:
         """Get students by major ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("major_id", major_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("major_id", major_id).execute()
             return await self._add_emails_to_students(response.data or [])
-        except Exception as e:
-            print(f"Error getting students by major: {e}")
+        except Exception:
+            logger.exception("Error getting students by major")
             return []
     
     async def get_by_cohort(self, cohort_id: int) -> List[Student]:
         """Get students by cohort ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("cohort_id", cohort_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("cohort_id", cohort_id).execute()
             return await self._add_emails_to_students(response.data or [])
-        except Exception as e:
-            print(f"Error getting students by cohort: {e}")
+        except Exception:
+            logger.exception("Error getting students by cohort")
             return []
     
     async def get_by_class_name(self, class_name: str) -> List[Student]:
         """Get students by class name."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("class_name", class_name).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("class_name", class_name).execute()
             return await self._add_emails_to_students(response.data or [])
-        except Exception as e:
-            print(f"Error getting students by class name: {e}")
+        except Exception:
+            logger.exception("Error getting students by class name")
             return []
     
-    async def search_by_name(self, name: str) -> List[Student]:
-        """Search students by name."""
-        try:
-            response = self.supabase.table(self.table_name).select("*").ilike("full_name", f"%{name}%").execute()
-            return await self._add_emails_to_students(response.data or [])
-        except Exception as e:
-            print(f"Error searching students by name: {e}")
-            return []
+    async def search_by_name(self, name: str, cursor: Optional[str] = None,
+                             limit: int = 10, filters: Optional[Dict[str, Any]] = None,
+                             fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Search students by name within optional filters, one keyset page at a time."""
+        key = (self.table_name, name.lower(), cursor, limit,
+               tuple(sorted((filters or {}).items())), tuple(fields or ()))
+        result = _search_cache.get(key)
+        if result is None:
+            result = await self.get_page(cursor, limit, filters, fields, search={"full_name": name})
+            _search_cache.set(key, result)
+        return result
 
 
 class TeacherRepository(BaseRepository[Teacher]):
     """Repository for Teacher operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "teachers", Teacher)
     
     async def _add_emails_to_teachers(self, teachers_data: List[Dict]) -> List[Teacher]:
@@ -196,87 +237,67 @@ class TeacherRepository(BaseRepository[Teacher]):
     async def get_by_id(self, record_id: int) -> Optional[Teacher]:
         """Get teacher by ID with email from the email column."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("id", record_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("id", record_id).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting teacher by ID: {e}")
+        except Exception:
+            logger.exception("Error getting teacher by ID")
             return None
 
-    async def get_all(self, page: int = 1, limit: int = 10) -> Dict[str, Any]:
-        """Get all teachers with pagination."""
-        try:
-            offset = (page - 1) * limit
-            
-            # Get total count
-            count_response = self.supabase.table(self.table_name).select("*", count="exact").execute()
-            total = count_response.count if count_response.count else 0
-            
-            # Get paginated teacher data
-            response = self.supabase.table(self.table_name).select("*").range(offset, offset + limit - 1).execute()
-            
-            items = []
-            if response.data:
-                for item in response.data:
-                    items.append(self.model_class(**item))
-            
-            return {
-                "items": items,
-                "total": total,
-                "page": page,
-                "limit": limit,
-                "total_pages": (total + limit - 1) // limit
-            }
-        except Exception as e:
-            print(f"Error getting all teachers: {e}")
-            return {"items": [], "total": 0, "page": page, "limit": limit, "total_pages": 0}
-
     async def get_by_teacher_code(self, teacher_code: str) -> Optional[Teacher]:
         """Get teacher by teacher code."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("teacher_code", teacher_code).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("teacher_code", teacher_code).execute()
             if response.data:
                 return self.model_class(**response.data[0])
             return None
-        except Exception as e:
-            print(f"Error getting teacher by code: {e}")
+        except Exception:
+            logger.exception("Error getting teacher by code")
             return None
     
     async def get_by_auth_id(self, auth_id: str) -> Optional[Teacher]:
         """Get teacher by auth ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("auth_id", auth_id).execute()
-            if response.data:
-                return self.model_class(**response.data[0])
+            response = await (self.supabase.table(self.table_name)
+                       .select("*")
+                       .eq("auth_id", auth_id)
+                       .maybe_single()
+                       .execute())
+            # maybe_single() yields no response at all when nothing matches
+            if response and response.data:
+                return self.model_class(**response.data)
             return None
-        except Exception as e:
-            print(f"Error getting teacher by auth ID: {e}")
+        except Exception:
+            logger.exception("Error getting teacher by auth ID")
             return None
     
     async def get_by_faculty(self, faculty_id: int) -> List[Teacher]:
         """Get teachers by faculty ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("faculty_id", faculty_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("faculty_id", faculty_id).execute()
             return await self._add_emails_to_teachers(response.data or [])
-        except Exception as e:
-            print(f"Error getting teachers by faculty: {e}")
+        except Exception:
+            logger.exception("Error getting teachers by faculty")
             return []
     
     async def get_by_department(self, department_id: int) -> List[Teacher]:
         """Get teachers by department ID."""
         try:
-            response = self.supabase.table(self.table_name).select("*").eq("department_id", department_id).execute()
+            response = await self.supabase.table(self.table_name).select("*").eq("department_id", department_id).execute()
             return await self._add_emails_to_teachers(response.data or [])
-        except Exception as e:
-            print(f"Error getting teachers by department: {e}")
+        except Exception:
+            logger.exception("Error getting teachers by department")
             return []
     
-    async def search_by_name(self, name: str) -> List[Teacher]:
-        """Search teachers by name."""
-        try:
-            response = self.supabase.table(self.table_name).select("*").ilike("full_name", f"%{name}%").execute()
-            return await self._add_emails_to_teachers(response.data or [])
-        except Exception as e:
-            print(f"Error searching teachers by name: {e}")
-            return []
+    async def search_by_name(self, name: str, cursor: Optional[str] = None,
+                             limit: int = 10, filters: Optional[Dict[str, Any]] = None,
+                             fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Search teachers by name within optional filters, one keyset page at a time."""
+        key = (self.table_name, name.lower(), cursor, limit,
+               tuple(sorted((filters or {}).items())), tuple(fields or ()))
+        result = _search_cache.get(key)
+        if result is None:
+            result = await self.get_page(cursor, limit, filters, fields, search={"full_name": name})
+            _search_cache.set(key, result)
+        return result
@@ -3,12 +3,13 @@
 from .auth import (
     LoginRequest, LoginResponse, RegisterRequest, TokenData,
     BaseResponse, ErrorResponse, PaginationParams, PaginatedResponse,
-    AdminProfile, TeacherProfile, StudentProfile, UserMeResponse,
+    CursorPaginatedResponse, AdminProfile, TeacherProfile, StudentProfile, UserMeResponse,
     PasswordResetRequest, PasswordResetResponse,
     VerifyOTPRequest, VerifyOTPResponse,
     UpdatePasswordRequest, UpdatePasswordResponse
 )
 from .academic import (
+    CreatedRecord, CreatedCodedRecord, CreatedSubject,
     AcademicYearCreate, AcademicYearUpdate, AcademicYearResponse,
     FacultyCreate, FacultyUpdate, FacultyResponse,
     DepartmentCreate, DepartmentUpdate, DepartmentResponse,
@@ -16,7 +17,8 @@ from .academic import (
     CohortCreate, CohortUpdate, CohortResponse,
     SubjectCreate, SubjectUpdate, SubjectResponse,
     SemesterCreate, SemesterUpdate, SemesterResponse,
-    StudyPhaseCreate, StudyPhaseUpdate, StudyPhaseResponse
+    StudyPhaseCreate, StudyPhaseUpdate, StudyPhaseResponse,
+    SemesterWithStudyPhasesResponse
 )
 from .users import (
     StudentCreate, StudentUpdate, StudentResponse,
@@ -27,25 +29,26 @@ from .admin import (
 )
 from .classes import (
     ClassCreate, ClassUpdate, ClassResponse,
-    TeachingSessionCreate, TeachingSessionUpdate, TeachingSessionResponse,
+    TeachingSessionCreate, TeachingSessionUpdate, TeachingSessionResponse, CreatedSession,
     AttendanceCreate, AttendanceUpdate, AttendanceResponse, AttendanceDetailResponse,
-    ClassStudentCreate, ClassStudentResponse, ClassStudentDetailResponse,
+    ClassStudentCreate, ClassStudentBulkCreate, ClassStudentResponse, ClassStudentDetailResponse,
     StudentClassDetailResponse, MultipleSessionsAttendanceRequest
 )
 from .excel import (
-    TeacherExcelRow, StudentExcelRow, BulkImportResult, ExcelValidationError
+    TeacherExcelRow, StudentExcelRow, BulkImportResult, BulkImportJob, ExcelValidationError
 )
 
 __all__ = [
     # Auth schemas
     "LoginRequest", "LoginResponse", "RegisterRequest", "TokenData",
     "BaseResponse", "ErrorResponse", "PaginationParams", "PaginatedResponse",
-    "AdminProfile", "TeacherProfile", "StudentProfile", "UserMeResponse",
+    "CursorPaginatedResponse", "AdminProfile", "TeacherProfile", "StudentProfile", "UserMeResponse",
     "PasswordResetRequest", "PasswordResetResponse",
     "VerifyOTPRequest", "VerifyOTPResponse",
     "UpdatePasswordRequest", "UpdatePasswordResponse",
     
     # Academic schemas
+    "CreatedRecord", "CreatedCodedRecord", "CreatedSubject",
     "AcademicYearCreate", "AcademicYearUpdate", "AcademicYearResponse",
     "FacultyCreate", "FacultyUpdate", "FacultyResponse",
     "DepartmentCreate", "DepartmentUpdate", "DepartmentResponse",
@@ -54,6 +57,7 @@ __all__ = [
     "SubjectCreate", "SubjectUpdate", "SubjectResponse",
     "SemesterCreate", "SemesterUpdate", "SemesterResponse",
     "StudyPhaseCreate", "StudyPhaseUpdate", "StudyPhaseResponse",
+    "SemesterWithStudyPhasesResponse",
     
     # User schemas
     "StudentCreate", "StudentUpdate", "StudentResponse",
@@ -64,11 +68,11 @@ __all__ = [
     
     # Class schemas
     "ClassCreate", "ClassUpdate", "ClassResponse",
-    "TeachingSessionCreate", "TeachingSessionUpdate", "TeachingSessionResponse",
+    "TeachingSessionCreate", "TeachingSessionUpdate", "TeachingSessionResponse", "CreatedSession",
     "AttendanceCreate", "AttendanceUpdate", "AttendanceResponse", "AttendanceDetailResponse",
-    "ClassStudentCreate", "ClassStudentResponse", "ClassStudentDetailResponse",
+    "ClassStudentCreate", "ClassStudentBulkCreate", "ClassStudentResponse", "ClassStudentDetailResponse",
     "StudentClassDetailResponse", "MultipleSessionsAttendanceRequest",
     
     # Excel schemas
-    "TeacherExcelRow", "StudentExcelRow", "BulkImportResult", "ExcelValidationError"
+    "TeacherExcelRow", "StudentExcelRow", "BulkImportResult", "BulkImportJob", "ExcelValidationError"
 ]
@@ -1,8 +1,29 @@
+from dataclasses import dataclass
 from datetime import date, time, datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
+# Create result records (slotted, serialized without an intermediate dict)
+@dataclass(slots=True, frozen=True)
+class CreatedRecord:
+    """Summary of a newly created record."""
+    id: int
+    name: str
+
+
+@dataclass(slots=True, frozen=True)
+class CreatedCodedRecord(CreatedRecord):
+    """Summary of a newly created record that has a code."""
+    code: str
+
+
+@dataclass(slots=True, frozen=True)
+class CreatedSubject(CreatedCodedRecord):
+    """Summary of a newly created subject."""
+    credits: int
+
+
 # Academic Year Schemas
 class AcademicYearCreate(BaseModel):
     """Schema for creating academic year."""
@@ -207,3 +228,8 @@ class StudyPhaseResponse(BaseModel):
     end_date: date
     created_at: datetime
     updated_at: datetime
+
+
+class SemesterWithStudyPhasesResponse(SemesterResponse):
+    """Schema for semester response with its study phases embedded."""
+    study_phases: Optional[List[StudyPhaseResponse]] = None
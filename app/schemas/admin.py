@@ -1,13 +1,13 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, SecretStr
 
 
 # Admin Schemas
 class AdminCreate(BaseModel):
     """Schema for creating admin."""
     email: EmailStr
-    password: str = Field(..., min_length=6)
+    password: SecretStr = Field(..., min_length=6)
 
 
 class AdminUpdate(BaseModel):
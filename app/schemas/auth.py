@@ -1,13 +1,15 @@
 from datetime import datetime, date, time
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field
+from typing import Optional, List, Any, Generic, Literal, TypeVar
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+
+T = TypeVar("T")
 
 
 class BaseResponse(BaseModel):
     """Base response model."""
     success: bool = True
     message: str = "Operation successful"
-    data: Optional[dict] = None
+    data: Optional[Any] = None
 
 
 class ErrorResponse(BaseModel):
@@ -25,11 +27,19 @@ class PaginationParams(BaseModel):
 
 class PaginatedResponse(BaseModel):
     """Paginated response model."""
-    items: List[dict]
-    total: int
+    items: List[Any]
+    total: Optional[int] = None
     page: int
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    has_more: bool = False
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """Cursor paginated response model."""
+    items: List[T]
+    limit: int
+    next_cursor: Optional[str] = None
 
 
 # Authentication Schemas
@@ -49,9 +59,14 @@ class LoginResponse(BaseModel):
 class RegisterRequest(BaseModel):
     """Registration request schema."""
     email: EmailStr
-    password: str
-    full_name: str
-    user_type: str  # student, teacher, admin
+    password: str = Field(..., min_length=6, max_length=72)
+    full_name: str = Field(..., min_length=1, max_length=255)
+    user_type: Literal["student", "teacher"]
+
+    @field_validator('user_type', mode='before')
+    @classmethod
+    def normalize_user_type(cls, v):
+        return v.lower() if isinstance(v, str) else v
 
 
 class TokenData(BaseModel):
@@ -62,29 +77,35 @@ class TokenData(BaseModel):
 # Profile Schemas for /me endpoint
 class AdminProfile(BaseModel):
     """Admin profile schema."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     auth_id: str
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
 
 class TeacherProfile(BaseModel):
     """Teacher profile schema."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     faculty_id: Optional[int] = None
     department_id: Optional[int] = None
     teacher_code: str
     full_name: str
     phone: Optional[str] = None
-    birth_date: Optional[str] = None
+    birth_date: Optional[date] = None
     hometown: Optional[str] = None
     auth_id: str
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
 
 class StudentProfile(BaseModel):
     """Student profile schema."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     faculty_id: Optional[int] = None
     major_id: Optional[int] = None
@@ -93,11 +114,11 @@ class StudentProfile(BaseModel):
     student_code: str
     full_name: str
     phone: Optional[str] = None
-    birth_date: Optional[str] = None
+    birth_date: Optional[date] = None
     hometown: Optional[str] = None
     auth_id: str
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
 
 class UserMeResponse(BaseModel):
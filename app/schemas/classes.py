@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import date, time, datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field, field_validator
@@ -54,6 +55,15 @@ class ClassResponse(BaseModel):
 
 
 # Teaching Session Schemas
+@dataclass(slots=True, frozen=True)
+class CreatedSession:
+    """Summary of a newly created teaching session."""
+    id: int
+    session_date: date
+    start_time: time
+    end_time: time
+
+
 class TeachingSessionCreate(BaseModel):
     """Schema for creating teaching session."""
     class_id: int
@@ -175,6 +185,11 @@ class ClassStudentCreate(BaseModel):
     student_id: int
 
 
+class ClassStudentBulkCreate(BaseModel):
+    """Schema for enrolling several students in a class at once."""
+    student_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
 class ClassStudentResponse(BaseModel):
     """Schema for class student response."""
     id: int
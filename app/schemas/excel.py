@@ -31,6 +31,12 @@ class BulkImportResult(BaseModel):
     errors: List[dict]
     created_users: List[dict]
 
+class BulkImportJob(BaseModel):
+    """Status of a background bulk import job"""
+    job_id: str
+    status: str  # pending, completed or failed
+    error: Optional[str] = None
+
 class ExcelValidationError(BaseModel):
     """Validation error for Excel row"""
     row: int
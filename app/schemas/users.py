@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from typing import Optional
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, SecretStr
 
 
 # Student Schemas
@@ -16,7 +16,7 @@ class StudentCreate(BaseModel):
     birth_date: Optional[date] = None
     hometown: Optional[str] = Field(None, max_length=255)
     email: EmailStr
-    password: str = Field(..., min_length=6)
+    password: SecretStr = Field(..., min_length=6)
 
 
 class StudentUpdate(BaseModel):
@@ -61,7 +61,7 @@ class TeacherCreate(BaseModel):
     birth_date: Optional[date] = None
     hometown: Optional[str] = Field(None, max_length=255)
     email: EmailStr
-    password: str = Field(..., min_length=6)
+    password: SecretStr = Field(..., min_length=6)
 
 
 class TeacherUpdate(BaseModel):
@@ -6,7 +6,7 @@ from .academic import (
     SubjectService, AcademicYearService, CohortService,
     SemesterService, StudyPhaseService
 )
-from .users import StudentService, TeacherService
+from .users import UserService, StudentService, TeacherService
 from .admin import AdminService
 from .classes import (
     ClassService, TeachingSessionService, AttendanceService,
@@ -18,7 +18,7 @@ __all__ = [
     "FacultyService", "DepartmentService", "MajorService",
     "SubjectService", "AcademicYearService", "CohortService",
     "SemesterService", "StudyPhaseService",
-    "StudentService", "TeacherService", "AdminService",
+    "UserService", "StudentService", "TeacherService", "AdminService",
     "ClassService", "TeachingSessionService", "AttendanceService",
     "ClassStudentService"
 ]
@@ -1,17 +1,24 @@
 from typing import Optional, List, Dict, Any
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Faculty, Department, Major, Subject, AcademicYear, Cohort, Semester, StudyPhase
 from app.repositories import (
     FacultyRepository, DepartmentRepository, MajorRepository,
     SubjectRepository, AcademicYearRepository, CohortRepository
 )
 from app.services.base import BaseService
+from app.core.cache import TTLCache
+
+# Current semester/study phase change a few times a year; writes below invalidate them
+_current_cache = TTLCache(maxsize=2, ttl=300)
+_MISSING = object()
+# "No current one" is also what a failed lookup returns, so keep it briefly
+_EMPTY_TTL = 30
 
 
 class FacultyService(BaseService[Faculty]):
     """Service for Faculty business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = FacultyRepository(supabase)
         super().__init__(repository)
     
@@ -32,7 +39,7 @@ class FacultyService(BaseService[Faculty]):
 class DepartmentService(BaseService[Department]):
     """Service for Department business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = DepartmentRepository(supabase)
         super().__init__(repository)
     
@@ -57,7 +64,7 @@ class DepartmentService(BaseService[Department]):
 class MajorService(BaseService[Major]):
     """Service for Major business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = MajorRepository(supabase)
         super().__init__(repository)
     
@@ -82,7 +89,7 @@ class MajorService(BaseService[Major]):
 class SubjectService(BaseService[Subject]):
     """Service for Subject business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = SubjectRepository(supabase)
         super().__init__(repository)
     
@@ -111,7 +118,7 @@ class SubjectService(BaseService[Subject]):
 class AcademicYearService(BaseService[AcademicYear]):
     """Service for Academic Year business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = AcademicYearRepository(supabase)
         super().__init__(repository)
     
@@ -133,7 +140,7 @@ class AcademicYearService(BaseService[AcademicYear]):
 class CohortService(BaseService[Cohort]):
     """Service for Cohort business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = CohortRepository(supabase)
         super().__init__(repository)
     
@@ -155,7 +162,7 @@ class CohortService(BaseService[Cohort]):
 class SemesterService(BaseService):
     """Service for Semester operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         from app.repositories import SemesterRepository
         self.repository = SemesterRepository(supabase)
     
@@ -164,8 +171,16 @@ class SemesterService(BaseService):
         return await self.repository.get_by_academic_year(academic_year_id)
     
     async def get_current_semester(self) -> Optional[Semester]:
-        """Get current semester."""
-        return await self.repository.get_current_semester()
+        """Get current semester, cached for a few minutes."""
+        semester = _current_cache.get("semester", _MISSING)
+        if semester is _MISSING:
+            semester = await self.repository.get_current_semester()
+            _current_cache.set("semester", semester, ttl=None if semester else _EMPTY_TTL)
+        return semester
+    
+    async def get_by_ids(self, semester_ids: List[int], include_study_phases: bool = False) -> List[Dict[str, Any]]:
+        """Get semesters by IDs, optionally with their study phases."""
+        return await self.repository.get_by_ids(semester_ids, include_study_phases)
     
     async def create(self, data: Dict[str, Any]) -> Optional[Semester]:
         """Create semester with validation."""
@@ -175,13 +190,27 @@ class SemesterService(BaseService):
         if start_date and end_date and start_date >= end_date:
             raise ValueError("Start date must be before end date")
         
-        return await self.repository.create(data)
+        semester = await self.repository.create(data)
+        _current_cache.pop("semester")
+        return semester
+    
+    async def update(self, record_id: int, data: Dict[str, Any]) -> Optional[Semester]:
+        """Update semester and drop the cached current one."""
+        semester = await super().update(record_id, data)
+        _current_cache.pop("semester")
+        return semester
+    
+    async def delete(self, record_id: int) -> bool:
+        """Delete semester and drop the cached current one."""
+        deleted = await super().delete(record_id)
+        _current_cache.pop("semester")
+        return deleted
 
 
 class StudyPhaseService(BaseService):
     """Service for StudyPhase operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         from app.repositories import StudyPhaseRepository
         self.repository = StudyPhaseRepository(supabase)
     
@@ -190,8 +219,12 @@ class StudyPhaseService(BaseService):
         return await self.repository.get_by_semester(semester_id)
     
     async def get_current_study_phase(self) -> Optional[StudyPhase]:
-        """Get current study phase."""
-        return await self.repository.get_current_study_phase()
+        """Get current study phase, cached for a few minutes."""
+        study_phase = _current_cache.get("study_phase", _MISSING)
+        if study_phase is _MISSING:
+            study_phase = await self.repository.get_current_study_phase()
+            _current_cache.set("study_phase", study_phase, ttl=None if study_phase else _EMPTY_TTL)
+        return study_phase
     
     async def create(self, data: Dict[str, Any]) -> Optional[StudyPhase]:
         """Create study phase with validation."""
@@ -201,4 +234,18 @@ class StudyPhaseService(BaseService):
         if start_date and end_date and start_date >= end_date:
             raise ValueError("Start date must be before end date")
         
-        return await self.repository.create(data)
+        study_phase = await self.repository.create(data)
+        _current_cache.pop("study_phase")
+        return study_phase
+    
+    async def update(self, record_id: int, data: Dict[str, Any]) -> Optional[StudyPhase]:
+        """Update study phase and drop the cached current one."""
+        study_phase = await super().update(record_id, data)
+        _current_cache.pop("study_phase")
+        return study_phase
+    
+    async def delete(self, record_id: int) -> bool:
+        """Delete study phase and drop the cached current one."""
+        deleted = await super().delete(record_id)
+        _current_cache.pop("study_phase")
+        return deleted
@@ -1,14 +1,15 @@
 from typing import Optional, Dict, Any
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Admin
 from app.repositories import AdminRepository
 from app.services.base import BaseService
+from app.schemas import AdminCreate
 
 
 class AdminService(BaseService):
     """Service for Admin operations."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.repository = AdminRepository(supabase)
     
     async def get_by_auth_id(self, auth_id: str) -> Optional[Admin]:
@@ -18,3 +19,24 @@ class AdminService(BaseService):
     async def create(self, data: Dict[str, Any]) -> Optional[Admin]:
         """Create admin."""
         return await self.repository.create(data)
+    
+    async def create_admin_with_auth(self, admin_data: AdminCreate) -> Optional[Admin]:
+        """Create an admin with Supabase authentication."""
+        from app.core.auth import auth_service
+        auth_response = await auth_service.create_user_with_supabase(
+            admin_data.email,
+            admin_data.password.get_secret_value(),
+            user_metadata={"user_type": "admin"}
+        )
+        
+        if not auth_response or not auth_response.get("user"):
+            raise ValueError("Failed to create admin auth user")
+        
+        auth_user = auth_response["user"]
+        admin = await self.repository.create({"auth_id": auth_user.id})
+        if not admin:
+            # Don't leave an orphaned auth user behind
+            await auth_service.delete_user_with_supabase(auth_user.id)
+            raise ValueError("Failed to create admin profile")
+        
+        return admin
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, TypeVar, Generic
-from supabase import Client
+from datetime import datetime
+from typing import Dict, List, Optional, Any, TypeVar, Generic, AsyncIterator
 from app.repositories.base import BaseRepository
 
 T = TypeVar('T')
@@ -21,9 +21,24 @@ class BaseService(ABC, Generic[T]):
         """Get a record by ID."""
         return await self.repository.get_by_id(record_id)
     
-    async def get_all(self, page: int = 1, limit: int = 10) -> Dict[str, Any]:
+    async def get_updated_at(self, record_id: int) -> Optional[datetime]:
+        """Get a record's last update time."""
+        return await self.repository.get_updated_at(record_id)
+    
+    async def get_all(self, page: int = 1, limit: int = 10, include_total: bool = False) -> Dict[str, Any]:
         """Get all records with pagination."""
-        return await self.repository.get_all(page, limit)
+        return await self.repository.get_all(page, limit, include_total)
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 10,
+                       filters: Optional[Dict[str, Any]] = None,
+                       fields: Optional[List[str]] = None,
+                       search: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Get records with cursor-based pagination, optionally only the given fields."""
+        return await self.repository.get_page(cursor, limit, filters, fields, search)
+    
+    def iter_all(self, filters: Optional[Dict[str, Any]] = None) -> AsyncIterator[T]:
+        """Iterate over all matching records in bounded batches."""
+        return self.repository.iter_all(filters)
     
     async def update(self, record_id: int, data: Dict[str, Any]) -> Optional[T]:
         """Update a record with business logic validation."""
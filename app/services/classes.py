@@ -1,7 +1,8 @@
+import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import secrets
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Class, TeachingSession, Attendance, ClassStudent
 from app.repositories import (
     ClassRepository, TeachingSessionRepository, AttendanceRepository,
@@ -10,11 +11,13 @@ from app.repositories import (
 from app.services.base import BaseService
 from app.core.scheduler import session_scheduler
 
+logger = logging.getLogger(__name__)
+
 
 class ClassService(BaseService[Class]):
     """Service for Class business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = ClassRepository(supabase)
         super().__init__(repository)
     
@@ -34,9 +37,10 @@ class ClassService(BaseService[Class]):
         """Get active classes."""
         return await self.repository.get_active_classes()
     
-    async def get_classes_with_details(self, page: int = 1, limit: int = 10, filters: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Get classes with joined data and student count."""
-        return await self.repository.get_classes_with_details(page, limit, filters or {})
+    async def get_classes_with_details(self, cursor: Optional[str] = None, limit: int = 10,
+                                       filters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Get active classes with joined data and student count, one keyset page at a time."""
+        return await self.repository.get_classes_with_details(cursor, limit, filters or {})
     
     async def create(self, data: Dict[str, Any]) -> Optional[Class]:
         """Create class with validation."""
@@ -66,7 +70,7 @@ class ClassService(BaseService[Class]):
 class TeachingSessionService(BaseService[TeachingSession]):
     """Service for Teaching Session business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = TeachingSessionRepository(supabase)
         super().__init__(repository)
     
@@ -85,16 +89,16 @@ class TeachingSessionService(BaseService[TeachingSession]):
                 )
                 
                 if scheduled_task_id:
-                    print(f"Successfully scheduled auto-close for session {session.id}")
+                    logger.debug("Successfully scheduled auto-close for session %s", session.id)
                 else:
-                    print(f"Warning: Failed to schedule auto-close for session {session.id}")
+                    logger.warning("Failed to schedule auto-close for session %s", session.id)
                 
                 return session
             
             return session
             
-        except Exception as e:
-            print(f"Error creating teaching session with scheduler: {e}")
+        except Exception:
+            logger.exception("Error creating teaching session with scheduler")
             # Try to create without scheduler as fallback
             return await self.repository.create(data)
     
@@ -102,15 +106,15 @@ class TeachingSessionService(BaseService[TeachingSession]):
         """Delete a teaching session with cascade."""
         try:
             # First, delete all attendance records for this session
-            attendance_delete_response = (self.repository.supabase.table("attendances")
+            attendance_delete_response = await (self.repository.supabase.table("attendances")
                                         .delete()
                                         .eq("session_id", session_id)
                                         .execute())
             
             # Then delete the teaching session
             return await self.repository.delete(session_id)
-        except Exception as e:
-            print(f"Error deleting teaching session with cascade: {e}")
+        except Exception:
+            logger.exception("Error deleting teaching session with cascade")
             return False
     
     async def get_by_class(self, class_id: int) -> List[TeachingSession]:
@@ -135,10 +139,16 @@ class TeachingSessionService(BaseService[TeachingSession]):
             updated_session = await self.repository.update_qr_code(session_id, qr_code, expired_at)
             
             return qr_code if updated_session else None
-        except Exception as e:
-            print(f"Error generating QR code: {e}")
+        except Exception:
+            logger.exception("Error generating QR code")
             return None
     
+    async def ensure_qr_code(self, session_id: int, expiry_minutes: int = 30) -> Optional[TeachingSession]:
+        """Give a session a QR code if it has none; returns the session only when one was created."""
+        qr_code = f"attendance://{session_id}/{secrets.token_urlsafe(32)}"
+        expired_at = datetime.utcnow() + timedelta(minutes=expiry_minutes)
+        return await self.repository.set_qr_code_if_missing(session_id, qr_code, expired_at)
+    
     async def validate_qr_code(self, session_id: int, qr_code: str) -> bool:
         """Validate QR code for attendance."""
         try:
@@ -155,15 +165,15 @@ class TeachingSessionService(BaseService[TeachingSession]):
                 return False
             
             return True
-        except Exception as e:
-            print(f"Error validating QR code: {e}")
+        except Exception:
+            logger.exception("Error validating QR code")
             return False
 
 
 class AttendanceService(BaseService[Attendance]):
     """Service for Attendance business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = AttendanceRepository(supabase)
         super().__init__(repository)
         self.session_repository = TeachingSessionRepository(supabase)
@@ -186,33 +196,12 @@ class AttendanceService(BaseService[Attendance]):
     
     async def mark_attendance_by_qr(self, session_id: int, student_id: int, qr_code: str, 
                                    ip_address: str = None, user_agent: str = None) -> Optional[Attendance]:
-        """Mark attendance using QR code."""
-        try:
-            # Validate QR code
-            session_service = TeachingSessionService(self.repository.supabase)
-            if not await session_service.validate_qr_code(session_id, qr_code):
-                raise ValueError("Invalid or expired QR code")
-            
-            # Check if already marked attendance
-            existing = await self.repository.get_by_session_and_student(session_id, student_id)
-            if existing:
-                raise ValueError("Attendance already marked for this session")
-            
-            # Mark attendance
-            attendance_data = {
-                "session_id": session_id,
-                "student_id": student_id,
-                "status": "present",
-                "attendance_time": datetime.utcnow().isoformat(),
-                "confidence_score": 1.0,  # QR code attendance has full confidence
-                "ip_address": ip_address,
-                "user_agent": user_agent
-            }
-            
-            return await self.repository.create(attendance_data)
-        except Exception as e:
-            print(f"Error marking attendance by QR: {e}")
-            return None
+        """Mark attendance using QR code.
+        
+        QR validation, the duplicate check and the insert run server-side in one
+        call; None means the code was wrong or expired, or attendance was already marked.
+        """
+        return await self.repository.mark_by_qr(session_id, student_id, qr_code, ip_address, user_agent)
     
     async def mark_attendance_manual(self, session_id: int, student_id: int, status: str) -> Optional[Attendance]:
         """Mark attendance manually (for teachers)."""
@@ -232,10 +221,16 @@ class AttendanceService(BaseService[Attendance]):
             }
             
             return await self.repository.create(attendance_data)
-        except Exception as e:
-            print(f"Error marking attendance manually: {e}")
+        except Exception:
+            logger.exception("Error marking attendance manually")
             return None
     
+    async def mark_attendance_manual_bulk(self, session_id: int, statuses: Dict[int, str]) -> List[Attendance]:
+        """Mark attendance manually for many students (student_id -> status) in batched writes."""
+        if not statuses:
+            return []
+        return await self.repository.mark_many_manual(session_id, statuses)
+    
     async def get_attendance_statistics(self, class_id: int, start_date, end_date) -> Dict[str, Any]:
         """Get attendance statistics for a class."""
         return await self.repository.get_attendance_statistics(class_id, start_date, end_date)
@@ -244,7 +239,7 @@ class AttendanceService(BaseService[Attendance]):
 class ClassStudentService(BaseService[ClassStudent]):
     """Service for Class Student business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = ClassStudentRepository(supabase)
         super().__init__(repository)
     
@@ -272,6 +267,12 @@ class ClassStudentService(BaseService[ClassStudent]):
         """Enroll a student in a class."""
         return await self.repository.enroll_student(class_id, student_id)
     
+    async def enroll_students(self, class_id: int, student_ids: List[int]) -> List[ClassStudent]:
+        """Enroll many students in a class in batched writes."""
+        if not student_ids:
+            return []
+        return await self.repository.enroll_students(class_id, student_ids)
+    
     async def unenroll_student(self, class_id: int, student_id: int) -> bool:
         """Unenroll a student from a class."""
         return await self.repository.unenroll_student(class_id, student_id)
@@ -0,0 +1,168 @@
+"""FastAPI dependency providers for shared service instances."""
+
+from functools import lru_cache
+from typing import Any, Dict, Type, TypeVar
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from supabase import AsyncClient
+from app.core.auth import auth_service
+from app.core.database import get_supabase
+from app.services.academic import (
+    FacultyService, DepartmentService, MajorService,
+    SubjectService, AcademicYearService, CohortService,
+    SemesterService, StudyPhaseService
+)
+from app.services.users import UserService, StudentService, TeacherService
+from app.services.admin import AdminService
+from app.services.classes import (
+    ClassService, TeachingSessionService, AttendanceService, ClassStudentService
+)
+from app.services.excel import ExcelService
+from app.repositories.users import UserRepository
+from app.repositories.academic import AcademicRepository
+from app.repositories.classes import ClassRepository
+
+S = TypeVar("S")
+
+security = HTTPBearer()
+
+
+@lru_cache(maxsize=None)
+def _shared_service(service_class: Type[S], supabase: AsyncClient) -> S:
+    """Build a service once per (class, client) pair."""
+    return service_class(supabase)
+
+
+async def get_faculty_service(supabase: AsyncClient = Depends(get_supabase)) -> FacultyService:
+    """Get the shared faculty service."""
+    return _shared_service(FacultyService, supabase)
+
+
+async def get_department_service(supabase: AsyncClient = Depends(get_supabase)) -> DepartmentService:
+    """Get the shared department service."""
+    return _shared_service(DepartmentService, supabase)
+
+
+async def get_major_service(supabase: AsyncClient = Depends(get_supabase)) -> MajorService:
+    """Get the shared major service."""
+    return _shared_service(MajorService, supabase)
+
+
+async def get_subject_service(supabase: AsyncClient = Depends(get_supabase)) -> SubjectService:
+    """Get the shared subject service."""
+    return _shared_service(SubjectService, supabase)
+
+
+async def get_academic_year_service(supabase: AsyncClient = Depends(get_supabase)) -> AcademicYearService:
+    """Get the shared academic year service."""
+    return _shared_service(AcademicYearService, supabase)
+
+
+async def get_cohort_service(supabase: AsyncClient = Depends(get_supabase)) -> CohortService:
+    """Get the shared cohort service."""
+    return _shared_service(CohortService, supabase)
+
+
+async def get_semester_service(supabase: AsyncClient = Depends(get_supabase)) -> SemesterService:
+    """Get the shared semester service."""
+    return _shared_service(SemesterService, supabase)
+
+
+async def get_study_phase_service(supabase: AsyncClient = Depends(get_supabase)) -> StudyPhaseService:
+    """Get the shared study phase service."""
+    return _shared_service(StudyPhaseService, supabase)
+
+
+async def get_user_service(supabase: AsyncClient = Depends(get_supabase)) -> UserService:
+    """Get the shared user service."""
+    return _shared_service(UserService, supabase)
+
+
+async def get_student_service(supabase: AsyncClient = Depends(get_supabase)) -> StudentService:
+    """Get the shared student service."""
+    return _shared_service(StudentService, supabase)
+
+
+async def get_teacher_service(supabase: AsyncClient = Depends(get_supabase)) -> TeacherService:
+    """Get the shared teacher service."""
+    return _shared_service(TeacherService, supabase)
+
+
+async def get_admin_service(supabase: AsyncClient = Depends(get_supabase)) -> AdminService:
+    """Get the shared admin service."""
+    return _shared_service(AdminService, supabase)
+
+
+async def get_class_service(supabase: AsyncClient = Depends(get_supabase)) -> ClassService:
+    """Get the shared class service."""
+    return _shared_service(ClassService, supabase)
+
+
+async def get_teaching_session_service(supabase: AsyncClient = Depends(get_supabase)) -> TeachingSessionService:
+    """Get the shared teaching session service."""
+    return _shared_service(TeachingSessionService, supabase)
+
+
+async def get_attendance_service(supabase: AsyncClient = Depends(get_supabase)) -> AttendanceService:
+    """Get the shared attendance service."""
+    return _shared_service(AttendanceService, supabase)
+
+
+async def get_class_student_service(supabase: AsyncClient = Depends(get_supabase)) -> ClassStudentService:
+    """Get the shared class student service."""
+    return _shared_service(ClassStudentService, supabase)
+
+
+@lru_cache(maxsize=None)
+def _shared_excel_service(supabase: AsyncClient) -> ExcelService:
+    """Build the Excel service and its repositories once per client."""
+    return ExcelService(UserRepository(supabase), AcademicRepository(supabase), ClassRepository(supabase))
+
+
+async def get_excel_service(supabase: AsyncClient = Depends(get_supabase)) -> ExcelService:
+    """Get the shared Excel service."""
+    return _shared_excel_service(supabase)
+
+
+async def get_current_profile(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_service: UserService = Depends(get_user_service)
+) -> Dict[str, Any]:
+    """Resolve the caller's Supabase user and profile once per request.
+    
+    The result is kept on request.state.profile so middleware and other
+    dependencies in the same request can reuse it. user_type and profile
+    are None when the auth user has no admin, teacher or student row.
+    """
+    current = getattr(request.state, "profile", None)
+    if current is not None:
+        return current
+    
+    user = await auth_service.get_current_user_from_token(credentials.credentials)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+    
+    # Only trust the service-role-written app_metadata as a hint; users can rewrite their user_metadata
+    user_type = (getattr(user, "app_metadata", None) or {}).get("user_type")
+    user_profile = await user_service.get_profile_by_auth_id(user.id, user_type) or {}
+    current = {
+        "user": user,
+        "user_type": user_profile.get("user_type"),
+        "profile": user_profile.get("profile")
+    }
+    request.state.profile = current
+    return current
+
+
+async def get_current_admin(current: Dict[str, Any] = Depends(get_current_profile)) -> Dict[str, Any]:
+    """Require the caller to be an admin."""
+    if current["user_type"] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current
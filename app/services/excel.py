@@ -1,24 +1,93 @@
 """Excel processing service for bulk user imports."""
 
-import pandas as pd
+import asyncio
 import string
 import secrets
 from io import BytesIO
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime, date
-from fastapi import HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import get_column_letter
+from fastapi import HTTPException
 import logging
 
-from ..schemas.excel import TeacherExcelRow, StudentExcelRow, BulkImportResult, ExcelValidationError
+from ..schemas.excel import BulkImportResult
 from ..schemas.users import TeacherCreate, StudentCreate
 from ..repositories.academic import AcademicRepository
 from ..repositories.users import UserRepository
 from ..repositories.classes import ClassRepository
-from ..services.users import StudentService, TeacherService
+from ..services.users import StudentService, TeacherService, BULK_CREATE_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
+
+def _read_rows(path: str) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """Read the first sheet of a workbook as its header and a lazy iterator of one dict per data row.
+    
+    The workbook is opened read-only, so cells are streamed from the sheet XML
+    as the rows are consumed instead of building the whole workbook in memory.
+    It is closed once the rows are exhausted or discarded.
+    """
+    rows = _iter_rows(path)
+    header = next(rows)
+    return header, rows
+
+
+def _iter_rows(path: str) -> Iterator[Any]:
+    """Yield the header of the first sheet, then its data rows as dicts.
+    
+    Trailing empty rows are dropped; earlier ones are kept so row numbers in
+    errors stay accurate.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows: Iterator[tuple] = workbook.active.iter_rows(values_only=True)
+        header = [str(value).strip() if value is not None else "" for value in next(rows, ())]
+        yield header
+        
+        empty_rows = []
+        for values in rows:
+            record = dict(zip(header, values))
+            if all(_cell_text(record, column) is None for column in header):
+                empty_rows.append(record)
+                continue
+            yield from empty_rows
+            empty_rows.clear()
+            yield record
+    finally:
+        workbook.close()
+
+
+def _cell_text(row: Dict[str, Any], column: str) -> Optional[str]:
+    """Get a cell as stripped text, or None when it is empty."""
+    value = row.get(column)
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _write_sheet(sheet_name: str, columns: List[str], rows: List[List[Any]]) -> BytesIO:
+    """Write a single-sheet workbook with columns sized to their longest value."""
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    
+    # Column widths must be set before any row is written in write-only mode
+    for index, column in enumerate(columns):
+        values = [column] + [row[index] for row in rows]
+        max_length = max(len(str(value)) for value in values if value is not None)
+        worksheet.column_dimensions[get_column_letter(index + 1)].width = min(max_length + 2, 50)
+    
+    worksheet.append(columns)
+    for row in rows:
+        worksheet.append(row)
+    
+    output = BytesIO()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
 class ExcelService:
     def __init__(self, user_repo: UserRepository, academic_repo: AcademicRepository, class_repo: ClassRepository):
         self.user_repo = user_repo
@@ -58,32 +127,9 @@ class ExcelService:
             'Bộ môn': ['Khoa học máy tính', 'Quản trị kinh doanh']
         }
         
-        df = pd.DataFrame(sample_data)
-        
-        # Create Excel file in memory
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Giảng viên', index=False)
-            
-            # Get the workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Giảng viên']
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        output.seek(0)
-        return output
+        columns = list(sample_data)
+        rows = [list(values) for values in zip(*sample_data.values())]
+        return _write_sheet('Giảng viên', columns, rows)
 
     def generate_student_sample_excel(self) -> BytesIO:
         """Generate sample Excel file for student import with Vietnamese headers."""
@@ -101,63 +147,131 @@ class ExcelService:
             'Khóa': ['K2020', 'K2021']
         }
         
-        df = pd.DataFrame(sample_data)
+        columns = list(sample_data)
+        rows = [list(values) for values in zip(*sample_data.values())]
+        return _write_sheet('Sinh viên', columns, rows)
+
+    async def _create_teacher_batch(self, batch: List[Tuple[TeacherCreate, int, Dict[str, Any], str]],
+                                    errors: List[Dict[str, Any]], teacher_passwords: List[Dict[str, Any]],
+                                    created_users: List[Dict[str, Any]]) -> None:
+        """Create a batch of validated teacher rows and record each row's outcome."""
+        if not batch:
+            return
+        
+        # Create auth users and teacher rows in batches instead of one round trip pair per row
+        teachers = await self._get_teacher_service().create_teachers_with_auth([entry[0] for entry in batch])
         
-        # Create Excel file in memory
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Sinh viên', index=False)
+        for (_, row_number, teacher_data, random_password), teacher in zip(batch, teachers):
+            if not teacher:
+                errors.append({
+                    "row": row_number,
+                    "field": "general",
+                    "error": "Failed to create teacher",
+                    "value": None
+                })
+                continue
             
-            # Get the workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Sinh viên']
+            # Store user data with password for Excel response
+            teacher_passwords.append({
+                "Họ tên": teacher_data['name'],
+                "Email": teacher_data['email'],
+                "Mật khẩu": random_password,
+                "Số điện thoại": teacher_data.get('phone', ''),
+                "Địa chỉ": teacher_data.get('address', ''),
+                "Ngày sinh": teacher_data.get('date_of_birth', ''),
+                "Quê quán": teacher_data.get('hometown', ''),
+                "Khoa": teacher_data['faculty_name'],
+                "Bộ môn": teacher_data.get('department_name', '')
+            })
             
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+            created_users.append({
+                "id": teacher.id,
+                "full_name": teacher.full_name,
+                "email": teacher.email,
+                "faculty": teacher_data['faculty_name']
+            })
+
+    async def _create_student_batch(self, batch: List[Tuple[StudentCreate, int, Dict[str, Any], str]],
+                                    errors: List[Dict[str, Any]], student_passwords: List[Dict[str, Any]],
+                                    created_users: List[Dict[str, Any]]) -> None:
+        """Create a batch of validated student rows and record each row's outcome."""
+        if not batch:
+            return
         
-        output.seek(0)
-        return output
+        # Create auth users and student rows in batches instead of one round trip pair per row
+        students = await self._get_student_service().create_students_with_auth([entry[0] for entry in batch])
+        
+        for (_, row_number, student_data, random_password), student in zip(batch, students):
+            if not student:
+                errors.append({
+                    "row": row_number,
+                    "field": "general",
+                    "error": "Failed to create student",
+                    "value": None
+                })
+                continue
+            
+            # Store user data with password for Excel response
+            student_passwords.append({
+                "Họ tên": student_data['name'],
+                "Email": student_data['email'],
+                "Mật khẩu": random_password,
+                "Mã sinh viên": student_data['student_code'],
+                "Số điện thoại": student_data.get('phone', ''),
+                "Địa chỉ": student_data.get('address', ''),
+                "Ngày sinh": student_data.get('date_of_birth', ''),
+                "Quê quán": student_data.get('hometown', ''),
+                "Lớp": student_data['class_name'],
+                "Khoa": student_data['faculty_name'],
+                "Ngành": student_data['major_name'],
+                "Khóa": student_data['cohort_name']
+            })
+            
+            created_users.append({
+                "id": student.id,
+                "full_name": student.full_name,
+                "email": student.email,
+                "student_code": student.student_code,
+                "class_name": student.class_name
+            })
 
-    async def process_teacher_excel(self, file: UploadFile) -> BulkImportResult:
-        """Process Excel file for bulk teacher creation."""
+    async def process_teacher_excel(self, path: str) -> BulkImportResult:
+        """Process an uploaded Excel file, saved at path, for bulk teacher creation."""
         try:
             # Read Excel file
-            content = await file.read()
-            df = pd.read_excel(BytesIO(content))
+            columns, rows = _read_rows(path)
             
             # Validate required columns
             required_columns = ['Họ tên', 'Email', 'Khoa']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            missing_columns = [col for col in required_columns if col not in columns]
             if missing_columns:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Missing required columns: {', '.join(missing_columns)}"
                 )
             
-            # Process each row
-            results = []
+            # Resolve names from one query per table instead of one query per row
+            faculty_ids, department_ids = await asyncio.gather(
+                self.academic_repo.get_faculty_ids_by_name(),
+                self.academic_repo.get_department_ids_by_name()
+            )
+            
+            # Validate each row; valid rows are created a batch at a time as the sheet is read
             errors = []
             created_users = []
             teacher_passwords = []  # Store passwords for Excel response
+            batch = []  # (teacher, row number, row data, password) awaiting creation
+            total_rows = 0
             
-            for index, row in df.iterrows():
+            for index, row in enumerate(rows):
+                total_rows += 1
                 try:
                     # Validate and convert data
                     teacher_data = await self._validate_teacher_row(row, index + 2)  # +2 for header row
                     
                     # Check if faculty exists
-                    faculty = await self.academic_repo.get_faculty_by_name(teacher_data['faculty_name'])
-                    if not faculty:
+                    faculty_id = faculty_ids.get(teacher_data['faculty_name'])
+                    if not faculty_id:
                         errors.append({
                             "row": index + 2,
                             "field": "Khoa",
@@ -169,10 +283,8 @@ class ExcelService:
                     # Look up department if provided
                     department_id = None
                     if teacher_data.get('department_name'):
-                        department = await self.academic_repo.get_department_by_name(teacher_data['department_name'])
-                        if department:
-                            department_id = department.id
-                        else:
+                        department_id = department_ids.get(teacher_data['department_name'])
+                        if not department_id:
                             errors.append({
                                 "row": index + 2,
                                 "field": "Bộ môn",
@@ -185,8 +297,7 @@ class ExcelService:
                     random_password = self._generate_random_password()
                     teacher_code = teacher_data['email'].split('@')[0]
                     
-                    # Create teacher
-                    teacher_create = TeacherCreate(
+                    batch.append((TeacherCreate(
                         teacher_code=teacher_code,
                         full_name=teacher_data['name'],
                         email=teacher_data['email'],
@@ -194,49 +305,24 @@ class ExcelService:
                         phone=teacher_data.get('phone'),
                         birth_date=teacher_data.get('date_of_birth'),
                         hometown=teacher_data.get('hometown'),
-                        faculty_id=faculty.id,
+                        faculty_id=faculty_id,
                         department_id=department_id
-                    )
-                    
-                    teacher = await self._get_teacher_service().create_teacher_with_auth(teacher_create)
-                    
-                    if not teacher:
-                        errors.append({
-                            "row": index + 2,
-                            "field": "general",
-                            "error": "Failed to create teacher",
-                            "value": None
-                        })
-                        continue
-                    
-                    # Store user data with password for Excel response
-                    teacher_passwords.append({
-                        "Họ tên": teacher_data['name'],
-                        "Email": teacher_data['email'],
-                        "Mật khẩu": random_password,
-                        "Số điện thoại": teacher_data.get('phone', ''),
-                        "Địa chỉ": teacher_data.get('address', ''),
-                        "Ngày sinh": teacher_data.get('date_of_birth', ''),
-                        "Quê quán": teacher_data.get('hometown', ''),
-                        "Khoa": teacher_data['faculty_name'],
-                        "Bộ môn": teacher_data.get('department_name', '')
-                    })
-                    
-                    created_users.append({
-                        "id": getattr(teacher, 'id', 'unknown'),
-                        "full_name": getattr(teacher, 'full_name', teacher_data['name']),
-                        "email": getattr(teacher, 'email', teacher_data['email']),
-                        "faculty": teacher_data['faculty_name']
-                    })
+                    ), index + 2, teacher_data, random_password))
                     
                 except Exception as e:
-                    logger.error(f"Error processing teacher row {index + 2}: {str(e)}")
+                    logger.error("Error processing teacher row %s: %s", index + 2, e)
                     errors.append({
                         "row": index + 2,
                         "field": "general",
                         "error": str(e),
                         "value": None
                     })
+                
+                if len(batch) >= BULK_CREATE_BATCH_SIZE:
+                    await self._create_teacher_batch(batch, errors, teacher_passwords, created_users)
+                    batch.clear()
+            
+            await self._create_teacher_batch(batch, errors, teacher_passwords, created_users)
             
             # Generate Excel file with passwords for successful imports
             excel_buffer = None
@@ -244,7 +330,7 @@ class ExcelService:
                 excel_buffer = self._generate_excel_with_passwords(teacher_passwords, 'teachers')
             
             return BulkImportResult(
-                total_rows=len(df),
+                total_rows=total_rows,
                 successful=len(created_users),
                 failed=len(errors),
                 errors=errors,
@@ -252,39 +338,47 @@ class ExcelService:
             ), excel_buffer
             
         except Exception as e:
-            logger.error(f"Error processing teacher Excel file: {str(e)}")
+            logger.error("Error processing teacher Excel file: %s", e)
             raise HTTPException(status_code=400, detail=f"Error processing Excel file: {str(e)}")
 
-    async def process_student_excel(self, file: UploadFile) -> BulkImportResult:
-        """Process Excel file for bulk student creation."""
+    async def process_student_excel(self, path: str) -> BulkImportResult:
+        """Process an uploaded Excel file, saved at path, for bulk student creation."""
         try:
             # Read Excel file
-            content = await file.read()
-            df = pd.read_excel(BytesIO(content))
+            columns, rows = _read_rows(path)
             
             # Validate required columns
             required_columns = ['Họ tên', 'Email', 'Mã sinh viên', 'Lớp', 'Khoa', 'Ngành', 'Khóa']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            missing_columns = [col for col in required_columns if col not in columns]
             if missing_columns:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Missing required columns: {', '.join(missing_columns)}"
                 )
             
-            # Process each row
-            results = []
+            # Resolve names from one query per table instead of one query per row
+            faculty_ids, major_ids, cohort_ids = await asyncio.gather(
+                self.academic_repo.get_faculty_ids_by_name(),
+                self.academic_repo.get_major_ids_by_name(),
+                self.academic_repo.get_cohort_ids_by_name()
+            )
+            
+            # Validate each row; valid rows are created a batch at a time as the sheet is read
             errors = []
             created_users = []
             student_passwords = []  # Store passwords for Excel response
+            batch = []  # (student, row number, row data, password) awaiting creation
+            total_rows = 0
             
-            for index, row in df.iterrows():
+            for index, row in enumerate(rows):
+                total_rows += 1
                 try:
                     # Validate and convert data
                     student_data = await self._validate_student_row(row, index + 2)  # +2 for header row
                     
                     # Look up faculty by name
-                    faculty = await self.academic_repo.get_faculty_by_name(student_data['faculty_name'])
-                    if not faculty:
+                    faculty_id = faculty_ids.get(student_data['faculty_name'])
+                    if not faculty_id:
                         errors.append({
                             "row": index + 2,
                             "field": "Khoa",
@@ -294,8 +388,8 @@ class ExcelService:
                         continue
                     
                     # Look up major by name
-                    major = await self.academic_repo.get_major_by_name(student_data['major_name'])
-                    if not major:
+                    major_id = major_ids.get(student_data['major_name'])
+                    if not major_id:
                         errors.append({
                             "row": index + 2,
                             "field": "Ngành",
@@ -305,8 +399,8 @@ class ExcelService:
                         continue
                     
                     # Look up cohort by name
-                    cohort = await self.academic_repo.get_cohort_by_name(student_data['cohort_name'])
-                    if not cohort:
+                    cohort_id = cohort_ids.get(student_data['cohort_name'])
+                    if not cohort_id:
                         errors.append({
                             "row": index + 2,
                             "field": "Khóa",
@@ -318,11 +412,10 @@ class ExcelService:
                     # Generate random password
                     random_password = self._generate_random_password()
                     
-                    # Create student
-                    student_create = StudentCreate(
-                        faculty_id=faculty.id,
-                        major_id=major.id,
-                        cohort_id=cohort.id,
+                    batch.append((StudentCreate(
+                        faculty_id=faculty_id,
+                        major_id=major_id,
+                        cohort_id=cohort_id,
                         full_name=student_data['name'],
                         email=student_data['email'],
                         password=random_password,
@@ -331,42 +424,22 @@ class ExcelService:
                         birth_date=student_data.get('date_of_birth'),
                         hometown=student_data.get('hometown'),
                         class_name=student_data['class_name']
-                    )
-                    
-                    student = await self._get_student_service().create_student_with_auth(student_create)
-                    
-                    # Store user data with password for Excel response
-                    student_passwords.append({
-                        "Họ tên": student_data['name'],
-                        "Email": student_data['email'],
-                        "Mật khẩu": random_password,
-                        "Mã sinh viên": student_data['student_code'],
-                        "Số điện thoại": student_data.get('phone', ''),
-                        "Địa chỉ": student_data.get('address', ''),
-                        "Ngày sinh": student_data.get('date_of_birth', ''),
-                        "Quê quán": student_data.get('hometown', ''),
-                        "Lớp": student_data['class_name'],
-                        "Khoa": student_data['faculty_name'],
-                        "Ngành": student_data['major_name'],
-                        "Khóa": student_data['cohort_name']
-                    })
-                    
-                    created_users.append({
-                        "id": student.id,
-                        "full_name": student.full_name,
-                        "email": student.email,
-                        "student_code": student.student_code,
-                        "class_name": student.class_name
-                    })
+                    ), index + 2, student_data, random_password))
                     
                 except Exception as e:
-                    logger.error(f"Error processing student row {index + 2}: {str(e)}")
+                    logger.error("Error processing student row %s: %s", index + 2, e)
                     errors.append({
                         "row": index + 2,
                         "field": "general",
                         "error": str(e),
                         "value": None
                     })
+                
+                if len(batch) >= BULK_CREATE_BATCH_SIZE:
+                    await self._create_student_batch(batch, errors, student_passwords, created_users)
+                    batch.clear()
+            
+            await self._create_student_batch(batch, errors, student_passwords, created_users)
             
             # Generate Excel file with passwords for successful imports
             excel_buffer = None
@@ -374,7 +447,7 @@ class ExcelService:
                 excel_buffer = self._generate_excel_with_passwords(student_passwords, 'students')
             
             return BulkImportResult(
-                total_rows=len(df),
+                total_rows=total_rows,
                 successful=len(created_users),
                 failed=len(errors),
                 errors=errors,
@@ -382,134 +455,93 @@ class ExcelService:
             ), excel_buffer
             
         except Exception as e:
-            logger.error(f"Error processing student Excel file: {str(e)}")
+            logger.error("Error processing student Excel file: %s", e)
             raise HTTPException(status_code=400, detail=f"Error processing Excel file: {str(e)}")
 
-    async def _validate_teacher_row(self, row: pd.Series, row_number: int) -> Dict[str, Any]:
+    async def _validate_teacher_row(self, row: Dict[str, Any], row_number: int) -> Dict[str, Any]:
         """Validate and convert teacher row data."""
         data = {}
         
         # Required fields
-        if pd.isna(row.get('Họ tên')) or not str(row['Họ tên']).strip():
-            raise ValueError("Name is required")
-        data['name'] = str(row['Họ tên']).strip()
-        
-        if pd.isna(row.get('Email')) or not str(row['Email']).strip():
-            raise ValueError("Email is required")
-        data['email'] = str(row['Email']).strip()
-        
-        if pd.isna(row.get('Khoa')) or not str(row['Khoa']).strip():
-            raise ValueError("Faculty is required")
-        data['faculty_name'] = str(row['Khoa']).strip()
+        data['name'] = self._required_text(row, 'Họ tên', "Name is required")
+        data['email'] = self._required_text(row, 'Email', "Email is required")
+        data['faculty_name'] = self._required_text(row, 'Khoa', "Faculty is required")
         
         # Optional department field
-        if not pd.isna(row.get('Bộ môn')):
-            data['department_name'] = str(row['Bộ môn']).strip()
+        self._set_optional_text(data, 'department_name', row, 'Bộ môn')
         
         # Optional fields
-        if not pd.isna(row.get('Số điện thoại')):
-            data['phone'] = str(row['Số điện thoại']).strip()
-        
-        if not pd.isna(row.get('Địa chỉ')):
-            data['address'] = str(row['Địa chỉ']).strip()
-        
-        if not pd.isna(row.get('Quê quán')):
-            data['hometown'] = str(row['Quê quán']).strip()
+        self._set_optional_text(data, 'phone', row, 'Số điện thoại')
+        self._set_optional_text(data, 'address', row, 'Địa chỉ')
+        self._set_optional_text(data, 'hometown', row, 'Quê quán')
         
         # Date of birth
-        if not pd.isna(row.get('Ngày sinh')):
-            try:
-                if isinstance(row['Ngày sinh'], str):
-                    data['date_of_birth'] = datetime.strptime(row['Ngày sinh'], '%Y-%m-%d').date()
-                else:
-                    data['date_of_birth'] = row['Ngày sinh'].date()
-            except (ValueError, AttributeError):
-                raise ValueError("Invalid date format for date of birth. Use YYYY-MM-DD")
+        self._set_date_of_birth(data, row)
         
         return data
 
-    async def _validate_student_row(self, row: pd.Series, row_number: int) -> Dict[str, Any]:
+    async def _validate_student_row(self, row: Dict[str, Any], row_number: int) -> Dict[str, Any]:
         """Validate and convert student row data."""
         data = {}
         
         # Required fields
-        if pd.isna(row.get('Họ tên')) or not str(row['Họ tên']).strip():
-            raise ValueError("Name is required")
-        data['name'] = str(row['Họ tên']).strip()
-        
-        if pd.isna(row.get('Email')) or not str(row['Email']).strip():
-            raise ValueError("Email is required")
-        data['email'] = str(row['Email']).strip()
-        
-        if pd.isna(row.get('Mã sinh viên')) or not str(row['Mã sinh viên']).strip():
-            raise ValueError("Student code is required")
-        data['student_code'] = str(row['Mã sinh viên']).strip()
-        
-        if pd.isna(row.get('Lớp')) or not str(row['Lớp']).strip():
-            raise ValueError("Class is required")
-        data['class_name'] = str(row['Lớp']).strip()
+        data['name'] = self._required_text(row, 'Họ tên', "Name is required")
+        data['email'] = self._required_text(row, 'Email', "Email is required")
+        data['student_code'] = self._required_text(row, 'Mã sinh viên', "Student code is required")
+        data['class_name'] = self._required_text(row, 'Lớp', "Class is required")
         
         # Required academic fields
-        if pd.isna(row.get('Khoa')) or not str(row['Khoa']).strip():
-            raise ValueError("Faculty is required")
-        data['faculty_name'] = str(row['Khoa']).strip()
-        
-        if pd.isna(row.get('Ngành')) or not str(row['Ngành']).strip():
-            raise ValueError("Major is required")
-        data['major_name'] = str(row['Ngành']).strip()
-        
-        if pd.isna(row.get('Khóa')) or not str(row['Khóa']).strip():
-            raise ValueError("Cohort is required")
-        data['cohort_name'] = str(row['Khóa']).strip()
+        data['faculty_name'] = self._required_text(row, 'Khoa', "Faculty is required")
+        data['major_name'] = self._required_text(row, 'Ngành', "Major is required")
+        data['cohort_name'] = self._required_text(row, 'Khóa', "Cohort is required")
         
         # Optional fields
-        if not pd.isna(row.get('Số điện thoại')):
-            data['phone'] = str(row['Số điện thoại']).strip()
-        
-        if not pd.isna(row.get('Địa chỉ')):
-            data['address'] = str(row['Địa chỉ']).strip()
-        
-        if not pd.isna(row.get('Quê quán')):
-            data['hometown'] = str(row['Quê quán']).strip()
+        self._set_optional_text(data, 'phone', row, 'Số điện thoại')
+        self._set_optional_text(data, 'address', row, 'Địa chỉ')
+        self._set_optional_text(data, 'hometown', row, 'Quê quán')
         
         # Date of birth
-        if not pd.isna(row.get('Ngày sinh')):
-            try:
-                if isinstance(row['Ngày sinh'], str):
-                    data['date_of_birth'] = datetime.strptime(row['Ngày sinh'], '%Y-%m-%d').date()
-                else:
-                    data['date_of_birth'] = row['Ngày sinh'].date()
-            except (ValueError, AttributeError):
-                raise ValueError("Invalid date format for date of birth. Use YYYY-MM-DD")
+        self._set_date_of_birth(data, row)
         
         return data
 
+    @staticmethod
+    def _required_text(row: Dict[str, Any], column: str, message: str) -> str:
+        """Get a required cell as text, raising ValueError when it is empty."""
+        text = _cell_text(row, column)
+        if text is None:
+            raise ValueError(message)
+        return text
+
+    @staticmethod
+    def _set_optional_text(data: Dict[str, Any], key: str, row: Dict[str, Any], column: str) -> None:
+        """Copy an optional cell into data as text when it has a value."""
+        text = _cell_text(row, column)
+        if text is not None:
+            data[key] = text
+
+    @staticmethod
+    def _set_date_of_birth(data: Dict[str, Any], row: Dict[str, Any]) -> None:
+        """Parse the optional date of birth cell, which may be a date cell or YYYY-MM-DD text."""
+        value = row.get('Ngày sinh')
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return
+        try:
+            if isinstance(value, str):
+                data['date_of_birth'] = datetime.strptime(value.strip(), '%Y-%m-%d').date()
+            elif isinstance(value, datetime):
+                data['date_of_birth'] = value.date()
+            elif isinstance(value, date):
+                data['date_of_birth'] = value
+            else:
+                raise ValueError(value)
+        except ValueError:
+            raise ValueError("Invalid date format for date of birth. Use YYYY-MM-DD")
+
     def _generate_excel_with_passwords(self, user_data: List[Dict], user_type: str) -> BytesIO:
         """Generate Excel file with user data including passwords."""
-        df = pd.DataFrame(user_data)
-        
-        # Create Excel file in memory
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            sheet_name = 'Giảng viên' if user_type == 'teachers' else 'Sinh viên'
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
-            
-            # Get the workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets[sheet_name]
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        output.seek(0)
-        return output
+        # Every record has the same keys in the same order, so the first one gives the columns
+        columns = list(user_data[0])
+        rows = [list(record.values()) for record in user_data]
+        sheet_name = 'Giảng viên' if user_type == 'teachers' else 'Sinh viên'
+        return _write_sheet(sheet_name, columns, rows)
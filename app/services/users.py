@@ -1,16 +1,100 @@
-from typing import Optional, List, Dict, Any
-from supabase import Client
+import logging
+import asyncio
+from typing import Optional, List, Dict, Any, Union
+from supabase import AsyncClient
 from app.core.database import get_supabase_admin
 from app.models import Student, Teacher
 from app.repositories import StudentRepository, TeacherRepository
+from app.repositories.users import UserRepository
 from app.services.base import BaseService
+from app.core.cache import TTLCache
 from app.schemas import StudentCreate, TeacherCreate
 
+logger = logging.getLogger(__name__)
+
+# /me and /login resolve the same auth_id repeatedly; profile updates below invalidate it
+_profile_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Point reads by ID, plus code -> ID lookups checked against the record; updates and deletes drop the ID entry
+_record_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Auth users created concurrently, and profile rows inserted together, per bulk batch
+BULK_CREATE_BATCH_SIZE = 100
+
+
+async def _create_many_with_auth(repository, users: List[Union[StudentCreate, TeacherCreate]],
+                                 user_type: str) -> List[Optional[Any]]:
+    """Create auth users concurrently and their profile rows with one insert per batch.
+    
+    Returns one entry per input user, in input order: the created profile, or
+    None when that user's auth account or profile row could not be created.
+    """
+    from app.core.auth import auth_service
+    
+    results = []
+    for start in range(0, len(users), BULK_CREATE_BATCH_SIZE):
+        batch = users[start:start + BULK_CREATE_BATCH_SIZE]
+        auth_responses = await asyncio.gather(*(
+            auth_service.create_user_with_supabase(
+                email=user.email,
+                password=user.password.get_secret_value(),
+                user_metadata={"full_name": user.full_name, "user_type": user_type}
+            )
+            for user in batch
+        ))
+        auth_ids = [auth_response["user"].id if auth_response and auth_response.get("user") else None
+                    for auth_response in auth_responses]
+        
+        rows = []
+        for user, auth_id in zip(batch, auth_ids):
+            if auth_id:
+                row = user.model_dump(exclude={"password"})
+                row["auth_id"] = auth_id
+                rows.append(row)
+        
+        profiles = await repository.create_many(rows)
+        if rows and not profiles:
+            # One bad row (e.g. a duplicate code) fails the whole insert; retry row by row so only it is lost
+            profiles = [profile for profile in await asyncio.gather(*(repository.create(row) for row in rows))
+                        if profile]
+            created_auth_ids = {profile.auth_id for profile in profiles}
+            # Don't leave orphaned auth users behind
+            await asyncio.gather(*(
+                auth_service.delete_user_with_supabase(row["auth_id"])
+                for row in rows if row["auth_id"] not in created_auth_ids
+            ))
+        
+        # Each auth ID belongs to exactly one input row, so it ties profiles back to their inputs
+        profiles_by_auth_id = {profile.auth_id: profile for profile in profiles}
+        results.extend(profiles_by_auth_id.get(auth_id) if auth_id else None for auth_id in auth_ids)
+    
+    return results
+
+
+class UserService:
+    """Service for operations spanning all user types."""
+    
+    def __init__(self, supabase: AsyncClient):
+        self.repository = UserRepository(supabase)
+    
+    async def get_profile_by_auth_id(self, auth_id: str, user_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get user type and profile by auth ID, cached briefly per process."""
+        user_profile = _profile_cache.get(auth_id)
+        if user_profile is None:
+            user_profile = await self.repository.get_profile_by_auth_id(auth_id, user_type)
+            if user_profile:
+                _profile_cache.set(auth_id, user_profile)
+        return user_profile
+    
+    async def get_login_summary_by_auth_id(self, auth_id: str) -> Optional[Dict[str, Any]]:
+        """Get the columns /login returns for an auth ID, without the full profile row."""
+        return await self.repository.get_login_summary_by_auth_id(auth_id)
+
 
 class StudentService(BaseService[Student]):
     """Service for Student business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = StudentRepository(supabase)
         super().__init__(repository)
         self.supabase = supabase
@@ -22,7 +106,7 @@ class StudentService(BaseService[Student]):
             from app.core.auth import auth_service
             auth_response = await auth_service.create_user_with_supabase(
                 email=student_data.email,
-                password=student_data.password,
+                password=student_data.password.get_secret_value(),
                 user_metadata={
                     "full_name": student_data.full_name,
                     "user_type": "student"
@@ -36,15 +120,45 @@ class StudentService(BaseService[Student]):
             student_dict = student_data.model_dump(exclude={"password"})
             student_dict["auth_id"] = auth_response["user"].id
             
-            return await self.repository.create(student_dict)
+            student = await self.repository.create(student_dict)
+            if not student:
+                # Don't leave an orphaned auth user behind
+                await auth_service.delete_user_with_supabase(auth_response["user"].id)
             
-        except Exception as e:
-            print(f"Error creating student with auth: {e}")
+            return student
+            
+        except Exception:
+            logger.exception("Error creating student with auth")
             return None
     
+    async def create_students_with_auth(self, students: List[StudentCreate]) -> List[Optional[Student]]:
+        """Create many students with Supabase authentication in batches, one result per input in order."""
+        return await _create_many_with_auth(self.repository, students, "student")
+    
+    async def get_by_id(self, record_id: int) -> Optional[Student]:
+        """Get student by ID, reusing recent reads."""
+        key = ("student", "id", record_id)
+        student = _record_cache.get(key)
+        if student is None:
+            student = await self.repository.get_by_id(record_id)
+            if student:
+                _record_cache.set(key, student)
+        return student
+    
     async def get_by_student_code(self, student_code: str) -> Optional[Student]:
-        """Get student by student code."""
-        return await self.repository.get_by_student_code(student_code)
+        """Get student by student code, reusing recent reads."""
+        record_id = _record_cache.get(("student", "code", student_code))
+        if record_id is not None:
+            student = await self.get_by_id(record_id)
+            # The code may have changed since it was cached
+            if student and student.student_code == student_code:
+                return student
+        
+        student = await self.repository.get_by_student_code(student_code)
+        if student:
+            _record_cache.set(("student", "id", student.id), student)
+            _record_cache.set(("student", "code", student_code), student.id)
+        return student
     
     async def get_by_auth_id(self, auth_id: str) -> Optional[Student]:
         """Get student by auth ID."""
@@ -66,9 +180,11 @@ class StudentService(BaseService[Student]):
         """Get students by class name."""
         return await self.repository.get_by_class_name(class_name)
     
-    async def search_by_name(self, name: str) -> List[Student]:
-        """Search students by name."""
-        return await self.repository.search_by_name(name)
+    async def search_by_name(self, name: str, cursor: Optional[str] = None,
+                             limit: int = 10, filters: Optional[Dict[str, Any]] = None,
+                             fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Search students by name with filters and cursor pagination."""
+        return await self.repository.search_by_name(name, cursor, limit, filters, fields)
     
     async def create(self, data: Dict[str, Any]) -> Optional[Student]:
         """Create student with validation."""
@@ -78,12 +194,33 @@ class StudentService(BaseService[Student]):
             raise ValueError("Student code already exists")
         
         return await self.repository.create(data)
+    
+    async def update(self, record_id: int, data: Dict[str, Any]) -> Optional[Student]:
+        """Update student and drop their cached record and profile."""
+        student = await super().update(record_id, data)
+        _record_cache.pop(("student", "id", record_id))
+        if student and student.auth_id:
+            _profile_cache.pop(student.auth_id)
+        return student
+    
+    async def delete(self, record_id: int) -> bool:
+        """Delete student and drop their cached record and profile."""
+        # Read the record first: its auth_id keys the profile cache, which would otherwise keep the role alive
+        student = await self.repository.get_by_id(record_id)
+        if not student:
+            return False
+        
+        deleted = await self.repository.delete(record_id)
+        _record_cache.pop(("student", "id", record_id))
+        if student.auth_id:
+            _profile_cache.pop(student.auth_id)
+        return deleted
 
 
 class TeacherService(BaseService[Teacher]):
     """Service for Teacher business logic."""
     
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         repository = TeacherRepository(supabase)
         super().__init__(repository)
         self.supabase = supabase
@@ -93,11 +230,11 @@ class TeacherService(BaseService[Teacher]):
         try:
             # Create user in Supabase Auth
             from app.core.auth import auth_service
-            print(f"Creating auth user for teacher: {teacher_data.email}")
+            logger.debug("Creating auth user for teacher: %s", teacher_data.email)
             
             auth_response = await auth_service.create_user_with_supabase(
                 email=teacher_data.email,
-                password=teacher_data.password,
+                password=teacher_data.password.get_secret_value(),
                 user_metadata={
                     "full_name": teacher_data.full_name,
                     "user_type": "teacher"
@@ -105,34 +242,59 @@ class TeacherService(BaseService[Teacher]):
             )
             
             if not auth_response or not auth_response.get("user"):
-                print("Failed to create auth user")
+                logger.warning("Failed to create auth user")
                 return None
             
-            print(f"Auth user created with ID: {auth_response['user'].id}")
+            logger.debug("Auth user created with ID: %s", auth_response['user'].id)
             
             # Create teacher record
             teacher_dict = teacher_data.model_dump(exclude={"password"})
             teacher_dict["auth_id"] = auth_response["user"].id
             
-            print(f"Creating teacher profile with data: {teacher_dict}")
+            logger.debug("Creating teacher profile with data: %s", teacher_dict)
             teacher = await self.repository.create(teacher_dict)
             
             if teacher:
-                print(f"Teacher profile created successfully with ID: {teacher.id}")
+                logger.debug("Teacher profile created successfully with ID: %s", teacher.id)
             else:
-                print("Failed to create teacher profile")
+                logger.warning("Failed to create teacher profile")
+                # Don't leave an orphaned auth user behind
+                await auth_service.delete_user_with_supabase(auth_response["user"].id)
             
             return teacher
             
-        except Exception as e:
-            print(f"Error creating teacher with auth: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error creating teacher with auth")
             return None
     
+    async def create_teachers_with_auth(self, teachers: List[TeacherCreate]) -> List[Optional[Teacher]]:
+        """Create many teachers with Supabase authentication in batches, one result per input in order."""
+        return await _create_many_with_auth(self.repository, teachers, "teacher")
+    
+    async def get_by_id(self, record_id: int) -> Optional[Teacher]:
+        """Get teacher by ID, reusing recent reads."""
+        key = ("teacher", "id", record_id)
+        teacher = _record_cache.get(key)
+        if teacher is None:
+            teacher = await self.repository.get_by_id(record_id)
+            if teacher:
+                _record_cache.set(key, teacher)
+        return teacher
+    
     async def get_by_teacher_code(self, teacher_code: str) -> Optional[Teacher]:
-        """Get teacher by teacher code."""
-        return await self.repository.get_by_teacher_code(teacher_code)
+        """Get teacher by teacher code, reusing recent reads."""
+        record_id = _record_cache.get(("teacher", "code", teacher_code))
+        if record_id is not None:
+            teacher = await self.get_by_id(record_id)
+            # The code may have changed since it was cached
+            if teacher and teacher.teacher_code == teacher_code:
+                return teacher
+        
+        teacher = await self.repository.get_by_teacher_code(teacher_code)
+        if teacher:
+            _record_cache.set(("teacher", "id", teacher.id), teacher)
+            _record_cache.set(("teacher", "code", teacher_code), teacher.id)
+        return teacher
     
     async def get_by_auth_id(self, auth_id: str) -> Optional[Teacher]:
         """Get teacher by auth ID."""
@@ -146,9 +308,11 @@ class TeacherService(BaseService[Teacher]):
         """Get teachers by department."""
         return await self.repository.get_by_department(department_id)
     
-    async def search_by_name(self, name: str) -> List[Teacher]:
-        """Search teachers by name."""
-        return await self.repository.search_by_name(name)
+    async def search_by_name(self, name: str, cursor: Optional[str] = None,
+                             limit: int = 10, filters: Optional[Dict[str, Any]] = None,
+                             fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Search teachers by name with filters and cursor pagination."""
+        return await self.repository.search_by_name(name, cursor, limit, filters, fields)
     
     async def create(self, data: Dict[str, Any]) -> Optional[Teacher]:
         """Create teacher with validation."""
@@ -158,3 +322,24 @@ class TeacherService(BaseService[Teacher]):
             raise ValueError("Teacher code already exists")
         
         return await self.repository.create(data)
+    
+    async def update(self, record_id: int, data: Dict[str, Any]) -> Optional[Teacher]:
+        """Update teacher and drop their cached record and profile."""
+        teacher = await super().update(record_id, data)
+        _record_cache.pop(("teacher", "id", record_id))
+        if teacher and teacher.auth_id:
+            _profile_cache.pop(teacher.auth_id)
+        return teacher
+    
+    async def delete(self, record_id: int) -> bool:
+        """Delete teacher and drop their cached record and profile."""
+        # Read the record first: its auth_id keys the profile cache, which would otherwise keep the role alive
+        teacher = await self.repository.get_by_id(record_id)
+        if not teacher:
+            return False
+        
+        deleted = await self.repository.delete(record_id)
+        _record_cache.pop(("teacher", "id", record_id))
+        if teacher.auth_id:
+            _profile_cache.pop(teacher.auth_id)
+        return deleted
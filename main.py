@@ -2,19 +2,30 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from pydantic import ValidationError
+import logging
 import uvicorn
 
 from app.core.config import settings
+from app.core.database import supabase_client
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.middleware import MaxBodySizeMiddleware, SelectiveGZipMiddleware
+from app.core.responses import PydanticJSONResponse
 from app.api import v1_router
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    print(f"Starting {settings.app_name} v{settings.app_version}")
-    print(f"Environment: {'Development' if settings.debug else 'Production'}")
+    setup_logging()
+    logger.info("Starting %s v%s", settings.app_name, settings.app_version)
+    logger.info("Environment: %s", "Development" if settings.debug else "Production")
     yield
-    print("Shutting down application")
+    logger.info("Shutting down application")
+    await supabase_client.close()
+    shutdown_logging()
 
 
 # Create FastAPI application
@@ -24,7 +35,8 @@ app = FastAPI(
     description="Student Attendance Management System Backend API",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=PydanticJSONResponse
 )
 
 # Configure CORS
@@ -36,6 +48,17 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Compress larger responses, but not auth ones: they carry tokens (BREACH)
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    exclude_prefixes=["/api/v1/auth"],
+    minimum_size=500,
+    compresslevel=4
+)
+
+# Turn away oversized uploads from their headers, before any of the body is buffered
+app.add_middleware(MaxBodySizeMiddleware, max_size=settings.max_upload_size)
+
 # Include API routers
 app.include_router(v1_router, prefix="/api")
 
@@ -60,10 +83,20 @@ async def health_check():
     }
 
 
+@app.exception_handler(ValueError)
+async def value_error_handler(request, exc):
+    """Map domain validation errors raised by services to 400."""
+    if isinstance(exc, ValidationError):
+        # pydantic errors raised while handling a request are server bugs, not bad input
+        return await global_exception_handler(request, exc)
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler."""
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
     if settings.debug:
         # In development, return detailed error information
         return JSONResponse(
@@ -0,0 +1,31 @@
+-- Single lookup of a user's role and profile by Supabase auth_id.
+-- Used by /auth/login and /auth/me instead of probing admins, teachers
+-- and students one table at a time.
+create or replace view public.user_profiles
+with (security_invoker = true) as
+select a.auth_id,
+       'admin'::text as user_type,
+       1 as priority,
+       a.id as profile_id,
+       null::text as code,
+       null::text as full_name,
+       to_jsonb(a.*) as profile
+from public.admins a
+union all
+select t.auth_id,
+       'teacher'::text,
+       2,
+       t.id,
+       t.teacher_code,
+       t.full_name,
+       to_jsonb(t.*)
+from public.teachers t
+union all
+select s.auth_id,
+       'student'::text,
+       3,
+       s.id,
+       s.student_code,
+       s.full_name,
+       to_jsonb(s.*)
+from public.students s;
@@ -0,0 +1,7 @@
+-- Index auth_id on each profile table so lookups by Supabase user
+-- (get_by_auth_id and the user_profiles view) are index scans.
+-- CONCURRENTLY cannot run inside a transaction block: apply these
+-- statements one at a time, outside BEGIN/COMMIT.
+create unique index concurrently if not exists idx_admins_auth_id on public.admins (auth_id);
+create unique index concurrently if not exists idx_teachers_auth_id on public.teachers (auth_id);
+create unique index concurrently if not exists idx_students_auth_id on public.students (auth_id);
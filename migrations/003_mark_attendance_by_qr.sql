@@ -0,0 +1,29 @@
+-- Validate a session QR code and record the student's attendance in one
+-- statement. Used by AttendanceRepository.mark_by_qr instead of reading the
+-- session, checking for an existing record and inserting in three requests.
+-- Returns the new attendance row, or no rows when the QR code is wrong or
+-- expired or the student's attendance is already marked.
+create or replace function public.mark_attendance_by_qr(
+    p_session_id public.attendances.session_id%type,
+    p_student_id public.attendances.student_id%type,
+    p_qr_code public.teaching_sessions.qr_code%type,
+    p_ip_address public.attendances.ip_address%type default null,
+    p_user_agent public.attendances.user_agent%type default null
+)
+returns setof public.attendances
+language sql
+security invoker
+as $$
+    insert into public.attendances
+        (session_id, student_id, status, attendance_time, confidence_score, ip_address, user_agent)
+    select s.id, p_student_id, 'present', now() at time zone 'utc', 1.0, p_ip_address, p_user_agent
+    from public.teaching_sessions s
+    where s.id = p_session_id
+      and s.qr_code = p_qr_code
+      and (s.qr_expired_at is null or s.qr_expired_at >= now() at time zone 'utc')
+      and not exists (
+          select 1 from public.attendances a
+          where a.session_id = p_session_id and a.student_id = p_student_id
+      )
+    returning *;
+$$;
@@ -0,0 +1,8 @@
+-- Trigram indexes so the substring name search (ILIKE '%q%') used by
+-- /users/students?search= and /users/teachers?search= can use an index
+-- instead of scanning every row.
+-- CONCURRENTLY cannot run inside a transaction block: apply these
+-- statements one at a time, outside BEGIN/COMMIT.
+create extension if not exists pg_trgm;
+create index concurrently if not exists idx_students_full_name_trgm on public.students using gin (full_name gin_trgm_ops);
+create index concurrently if not exists idx_teachers_full_name_trgm on public.teachers using gin (full_name gin_trgm_ops);
@@ -0,0 +1,67 @@
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the monotonic clock TTLCache reads."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_cached_value(clock):
+    """A value is returned until its TTL has passed."""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("key", "value")
+    
+    clock[0] += 29
+    assert cache.get("key") == "value"
+
+
+def test_entries_expire_after_ttl(clock):
+    """An expired entry is dropped and the default returned."""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("key", "value")
+    
+    clock[0] += 30
+    assert cache.get("key", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    """set() can give one entry a shorter lifetime than the cache default."""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2)
+    
+    clock[0] += 10
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    """When full, the entry read or written longest ago is evicted first."""
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_pop_and_clear(clock):
+    """pop() removes and returns one entry; clear() removes them all."""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    
+    cache.clear()
+    assert len(cache) == 0
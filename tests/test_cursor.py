@@ -0,0 +1,42 @@
+import base64
+import json
+import pytest
+from app.repositories.base import decode_cursor, encode_cursor
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def test_cursor_round_trip():
+    """A cursor decodes back to the position it was encoded from."""
+    cursor = encode_cursor("2024-05-01T10:00:00.123456+00:00", 42)
+    assert decode_cursor(cursor) == ("2024-05-01T10:00:00.123456+00:00", 42)
+
+
+def test_cursor_timestamp_is_normalized():
+    """created_at is re-serialized rather than passed through verbatim."""
+    cursor = _raw_cursor({"created_at": "2024-05-01 10:00:00+00:00", "id": "7"})
+    assert decode_cursor(cursor) == ("2024-05-01T10:00:00+00:00", 7)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    _raw_cursor(["2024-05-01T10:00:00+00:00", 1]),
+    _raw_cursor({"id": 1}),
+    _raw_cursor({"created_at": "2024-05-01T10:00:00+00:00"}),
+    _raw_cursor({"created_at": "2024-05-01T10:00:00+00:00", "id": "one"}),
+    _raw_cursor({"created_at": 1714557600, "id": 1}),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    """Anything that is not a timestamp and integer id is an invalid cursor."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_filter_injection_is_rejected():
+    """A created_at that tries to close the quoted filter value is refused."""
+    cursor = _raw_cursor({"created_at": '2024-05-01",id.gt.0,name.eq."x', "id": 1})
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,140 @@
+from datetime import date
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from openpyxl import Workbook
+from app.services.excel import ExcelService, _read_rows
+
+TEACHER_COLUMNS = ['Họ tên', 'Email', 'Khoa', 'Bộ môn', 'Ngày sinh']
+
+
+def _save_workbook(path, columns, rows) -> str:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(columns)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+class FakeAcademicRepository:
+    async def get_faculty_ids_by_name(self):
+        return {"Công nghệ thông tin": 1}
+    
+    async def get_department_ids_by_name(self):
+        return {"Khoa học máy tính": 10}
+
+
+class FakeTeacherService:
+    """Creates every teacher except those whose email is already taken."""
+    
+    def __init__(self, taken_emails=()):
+        self.taken_emails = set(taken_emails)
+    
+    async def create_teachers_with_auth(self, teachers):
+        return [
+            None if teacher.email in self.taken_emails
+            else SimpleNamespace(id=index, full_name=teacher.full_name, email=teacher.email)
+            for index, teacher in enumerate(teachers, start=1)
+        ]
+
+
+def _excel_service(teacher_service=None) -> ExcelService:
+    service = ExcelService(None, FakeAcademicRepository(), None)
+    service.teacher_service = teacher_service or FakeTeacherService()
+    return service
+
+
+def test_read_rows_drops_trailing_empty_rows(tmp_path):
+    """Empty rows between data rows are kept so row numbers stay right; trailing ones are dropped."""
+    path = _save_workbook(tmp_path / "rows.xlsx", ['Họ tên', 'Email'], [
+        ['A', 'a@example.com'],
+        [None, None],
+        ['B', 'b@example.com'],
+        [None, None],
+        ['  ', None],
+    ])
+    
+    header, rows = _read_rows(path)
+    
+    assert header == ['Họ tên', 'Email']
+    assert [row['Họ tên'] for row in rows] == ['A', None, 'B']
+
+
+@pytest.mark.asyncio
+async def test_validate_teacher_row_requires_columns():
+    """A blank required cell is reported with its own message."""
+    row = {'Họ tên': 'A', 'Email': '  ', 'Khoa': 'Công nghệ thông tin'}
+    
+    with pytest.raises(ValueError, match="Email is required"):
+        await _excel_service()._validate_teacher_row(row, 2)
+
+
+@pytest.mark.asyncio
+async def test_validate_teacher_row_strips_text():
+    """Cells are stripped and blank optional cells are left out."""
+    row = {'Họ tên': ' A ', 'Email': 'a@example.com', 'Khoa': 'Công nghệ thông tin', 'Bộ môn': ' '}
+    
+    data = await _excel_service()._validate_teacher_row(row, 2)
+    
+    assert data == {'name': 'A', 'email': 'a@example.com', 'faculty_name': 'Công nghệ thông tin'}
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1990-02-03", date(1990, 2, 3)),
+    (date(1990, 2, 3), date(1990, 2, 3)),
+    (None, None),
+    ("  ", None),
+])
+def test_date_of_birth_parsing(value, expected):
+    """Dates may be date cells or YYYY-MM-DD text; blank cells are skipped."""
+    data = {}
+    ExcelService._set_date_of_birth(data, {'Ngày sinh': value})
+    assert data.get('date_of_birth') == expected
+
+
+def test_invalid_date_of_birth_is_rejected():
+    """Text in another date format is an error rather than a guess."""
+    with pytest.raises(ValueError, match="Invalid date format"):
+        ExcelService._set_date_of_birth({}, {'Ngày sinh': "03/02/1990"})
+
+
+@pytest.mark.asyncio
+async def test_process_teacher_excel_reports_row_errors(tmp_path):
+    """Each failing row is reported with its sheet row number and field."""
+    path = _save_workbook(tmp_path / "teachers.xlsx", TEACHER_COLUMNS, [
+        ['Nguyễn Văn A', 'a@example.com', 'Công nghệ thông tin', 'Khoa học máy tính', '1990-02-03'],
+        ['Nguyễn Văn B', None, 'Công nghệ thông tin', None, None],
+        ['Nguyễn Văn C', 'c@example.com', 'Kinh tế', None, None],
+        ['Nguyễn Văn D', 'd@example.com', 'Công nghệ thông tin', 'Vật lý', None],
+        ['Nguyễn Văn E', 'e@example.com', 'Công nghệ thông tin', None, '03/02/1990'],
+        ['Nguyễn Văn F', 'f@example.com', 'Công nghệ thông tin', None, None],
+    ])
+    service = _excel_service(FakeTeacherService(taken_emails={'f@example.com'}))
+    
+    result, passwords = await service.process_teacher_excel(path)
+    
+    assert result.total_rows == 6
+    assert result.successful == 1
+    assert result.created_users[0]['email'] == 'a@example.com'
+    assert sorted((error['row'], error['field']) for error in result.errors) == [
+        (3, 'general'),
+        (4, 'Khoa'),
+        (5, 'Bộ môn'),
+        (6, 'general'),
+        (7, 'general'),
+    ]
+    assert passwords is not None
+
+
+@pytest.mark.asyncio
+async def test_process_teacher_excel_rejects_missing_columns(tmp_path):
+    """A sheet without the required columns is rejected before any row is read."""
+    path = _save_workbook(tmp_path / "teachers.xlsx", ['Họ tên', 'Email'], [['A', 'a@example.com']])
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await _excel_service().process_teacher_excel(path)
+    
+    assert exc_info.value.status_code == 400
+    assert "Khoa" in exc_info.value.detail
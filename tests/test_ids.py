@@ -0,0 +1,25 @@
+import time
+from app.core.ids import new_ulid
+
+CROCKFORD_BASE32 = set("0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+
+
+def test_ulid_format():
+    """A ULID is 26 Crockford base32 characters."""
+    ulid = new_ulid()
+    assert len(ulid) == 26
+    assert set(ulid) <= CROCKFORD_BASE32
+
+
+def test_ulids_are_unique():
+    """The random part keeps ULIDs from the same millisecond distinct."""
+    assert len({new_ulid() for _ in range(1000)}) == 1000
+
+
+def test_ulids_sort_by_creation_time():
+    """A ULID made in a later millisecond sorts after an earlier one."""
+    first = new_ulid()
+    time.sleep(0.002)
+    second = new_ulid()
+    assert first < second
+    assert first[:10] <= second[:10]
@@ -0,0 +1,65 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.core.middleware import MaxBodySizeMiddleware, SelectiveGZipMiddleware
+
+MAX_SIZE = 100
+
+
+def _body_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MaxBodySizeMiddleware, max_size=MAX_SIZE)
+    
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+    
+    return app
+
+
+def _gzip_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SelectiveGZipMiddleware, exclude_prefixes=["/auth"], minimum_size=10)
+    
+    @app.get("/auth/token")
+    async def token():
+        return {"value": "x" * 100}
+    
+    @app.get("/data")
+    async def data():
+        return {"value": "x" * 100}
+    
+    return app
+
+
+def test_body_within_limit_is_accepted():
+    """Requests up to max_size reach the route."""
+    response = TestClient(_body_app()).post("/echo", content=b"x" * MAX_SIZE)
+    assert response.status_code == 200
+    assert response.json() == {"size": MAX_SIZE}
+
+
+def test_declared_oversized_body_is_rejected():
+    """A Content-Length over max_size gets 413."""
+    response = TestClient(_body_app()).post("/echo", content=b"x" * (MAX_SIZE + 1))
+    assert response.status_code == 413
+
+
+def test_chunked_oversized_body_is_rejected():
+    """A body sent without Content-Length is counted as it arrives."""
+    def chunks():
+        for _ in range(5):
+            yield b"x" * 30
+    
+    response = TestClient(_body_app()).post("/echo", content=chunks())
+    assert response.status_code == 413
+
+
+def test_gzip_skips_excluded_prefix():
+    """Responses under an excluded prefix are never compressed."""
+    client = TestClient(_gzip_app())
+    
+    auth_response = client.get("/auth/token", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in auth_response.headers
+    
+    data_response = client.get("/data", headers={"Accept-Encoding": "gzip"})
+    assert data_response.headers["content-encoding"] == "gzip"
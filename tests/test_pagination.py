@@ -0,0 +1,145 @@
+import re
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.models import Semester
+from app.repositories.academic import SemesterRepository
+from app.services.dependencies import get_student_service, get_teacher_service
+from app.services.users import StudentService, TeacherService
+
+# PostgREST's default max-rows, the most rows any single response may hold
+MAX_ROWS = 1000
+
+
+class FakeQuery:
+    """Just enough of a PostgREST query builder for keyset pages over an in-memory table."""
+    
+    def __init__(self, rows, max_rows):
+        self.rows = rows
+        self.max_rows = max_rows
+        self.filters = {}
+        self.position = None
+        self.row_limit = None
+    
+    def select(self, columns):
+        return self
+    
+    def order(self, column, desc=False):
+        return self
+    
+    def eq(self, field, value):
+        self.filters[field] = value
+        return self
+    
+    def or_(self, condition):
+        created_at, last_id = re.match(r'created_at\.lt\."([^"]+)".*id\.lt\.(\d+)', condition).groups()
+        self.position = (datetime.fromisoformat(created_at), int(last_id))
+        return self
+    
+    def limit(self, row_limit):
+        self.row_limit = row_limit
+        return self
+    
+    async def execute(self):
+        rows = sorted(
+            (row for row in self.rows if all(row[field] == value for field, value in self.filters.items())),
+            key=lambda row: (datetime.fromisoformat(row["created_at"]), row["id"]),
+            reverse=True
+        )
+        if self.position:
+            rows = [row for row in rows
+                    if (datetime.fromisoformat(row["created_at"]), row["id"]) < self.position]
+        return SimpleNamespace(data=rows[:min(self.row_limit, self.max_rows)])
+
+
+class FakeSupabase:
+    """A client whose responses are capped at max_rows, like a Supabase project."""
+    
+    def __init__(self, rows, max_rows=MAX_ROWS):
+        self.rows = rows
+        self.max_rows = max_rows
+    
+    def table(self, table_name):
+        return FakeQuery(self.rows, self.max_rows)
+
+
+def _rows(count, **fields):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        # Pairs of rows share a timestamp so the id tie-breaker is exercised too
+        {"id": index, "created_at": (start + timedelta(seconds=index // 2)).isoformat(), **fields}
+        for index in range(1, count + 1)
+    ]
+
+
+def _semester_rows(count):
+    return [dict(row, name=f"HK{row['id']}", start_date="2024-01-01", end_date="2024-06-01")
+            for row in _rows(count)]
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [0, 1, MAX_ROWS - 1, MAX_ROWS, MAX_ROWS + 1, 2 * MAX_ROWS + 500])
+async def test_iter_all_pages_past_the_row_cap(count):
+    """Every record is yielded once, newest first, however the total lines up with the cap."""
+    repository = SemesterRepository(FakeSupabase(_semester_rows(count)))
+    
+    semesters = await _collect(repository.iter_all())
+    
+    assert all(isinstance(semester, Semester) for semester in semesters)
+    assert [semester.id for semester in semesters] == list(range(count, 0, -1))
+
+
+@pytest.mark.asyncio
+async def test_iter_all_pages_with_a_cap_below_the_batch_size():
+    """A cap smaller than the batch size shortens pages but does not end the iteration."""
+    repository = SemesterRepository(FakeSupabase(_semester_rows(350), max_rows=100))
+    
+    semesters = await _collect(repository.iter_all(batch_size=500))
+    
+    assert len(semesters) == 350
+
+
+@pytest.fixture
+def client():
+    """A test client whose user services read from capped fake tables."""
+    from main import app
+    
+    students = [dict(row, class_name="K65A", student_code=f"SV{row['id']}", full_name=f"Student {row['id']}",
+                     auth_id=f"auth-{row['id']}", faculty_id=1 + row["id"] % 2)
+                for row in _rows(2 * MAX_ROWS + 1)]
+    teachers = [dict(row, teacher_code=f"GV{row['id']}", full_name=f"Teacher {row['id']}",
+                     auth_id=f"auth-{row['id']}", faculty_id=1, department_id=1 + row["id"] % 2)
+                for row in _rows(MAX_ROWS + 1)]
+    app.dependency_overrides[get_student_service] = lambda: StudentService(FakeSupabase(students))
+    app.dependency_overrides[get_teacher_service] = lambda: TeacherService(FakeSupabase(teachers))
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_student_export_streams_past_the_row_cap(client):
+    """The student export is not cut off at the first full page."""
+    response = client.get("/api/v1/users/students/export")
+    
+    assert response.status_code == 200
+    assert len(response.json()) == 2 * MAX_ROWS + 1
+
+
+def test_filtered_student_export_streams_past_the_row_cap(client):
+    """Filters apply to every page, not only the first."""
+    response = client.get("/api/v1/users/students/export", params={"faculty_id": 2})
+    
+    assert {student["faculty_id"] for student in response.json()} == {2}
+    assert len(response.json()) == MAX_ROWS + 1
+
+
+def test_teacher_export_streams_past_the_row_cap(client):
+    """The teacher export is not cut off at the first full page."""
+    response = client.get("/api/v1/users/teachers/export")
+    
+    assert response.status_code == 200
+    assert len(response.json()) == MAX_ROWS + 1
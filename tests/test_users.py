@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+import pytest
+from app.services import users
+from app.services.users import StudentService, TeacherService
+
+
+class FakeRepository:
+    """Holds records by ID and deletes them on request."""
+    
+    def __init__(self, records):
+        self.records = records
+    
+    async def get_by_id(self, record_id):
+        return self.records.get(record_id)
+    
+    async def delete(self, record_id):
+        return self.records.pop(record_id, None) is not None
+
+
+def _service(service_class, records):
+    service = service_class(None)
+    service.repository = FakeRepository(records)
+    return service
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("service_class", [StudentService, TeacherService])
+async def test_delete_drops_cached_profile(service_class):
+    """A deleted user's profile, and with it their role, is not served from the cache."""
+    service = _service(service_class, {7: SimpleNamespace(id=7, auth_id="auth-7")})
+    users._profile_cache.set("auth-7", {"user_type": "student"})
+    
+    assert await service.delete(7)
+    assert users._profile_cache.get("auth-7") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("service_class", [StudentService, TeacherService])
+async def test_delete_missing_record(service_class):
+    """Deleting an unknown ID reports failure without touching other cached profiles."""
+    service = _service(service_class, {})
+    users._profile_cache.set("auth-8", {"user_type": "teacher"})
+    
+    assert not await service.delete(8)
+    assert users._profile_cache.get("auth-8") == {"user_type": "teacher"}
+    users._profile_cache.pop("auth-8")